@@ -0,0 +1,69 @@
+#!/usr/bin/env bash
+# Commit source files together with the data/ generated from them, and push to main.
+#
+# Usage: push_data.sh "<commit message>" <source path>...
+#
+# data/jobs.json, data/seekers.json, data/jobs/ and data/matches/ (and
+# data/job-index.json, when it is listed) are rebuilt from jobs/ and seekers/
+# by every workflow that changes those, so if another run pushed first, a
+# rebase of this commit would conflict on them. Instead, the source changes
+# are replayed on the new main, data/ is rebuilt there, and the push is retried.
+set -euo pipefail
+
+message=$1
+shift
+sources=()
+generated=(data/jobs.json data/seekers.json data/jobs data/matches)
+for path in "$@"; do
+  if [ "$path" = data/job-index.json ]; then
+    generated+=("$path")
+  else
+    sources+=("$path")
+  fi
+done
+
+rebuild() {
+  case " ${generated[*]} " in
+    *" data/job-index.json "*) python3 scripts/job_index.py ;;
+  esac
+  python3 scripts/build_data.py
+  python3 scripts/match_seekers.py
+}
+
+commit() {
+  git add -A -- "${sources[@]}" "${generated[@]}"
+  if git diff --cached --quiet; then
+    return 1
+  fi
+  git commit -q -m "$message"
+}
+
+git config user.name "github-actions[bot]"
+git config user.email "github-actions[bot]@users.noreply.github.com"
+
+if ! commit; then
+  echo "No changes to commit"
+  exit 0
+fi
+for attempt in 1 2 3; do
+  git push origin HEAD:main && exit 0
+  [ "$attempt" = 3 ] && break
+  echo "main moved; replaying the source changes on it and rebuilding data/"
+  patch="${RUNNER_TEMP:-/tmp}/sources.patch"
+  : > "$patch"
+  if [ "${#sources[@]}" -gt 0 ]; then
+    git diff --binary HEAD~1 HEAD -- "${sources[@]}" > "$patch"
+  fi
+  git fetch -q origin main
+  git reset -q --hard origin/main
+  if [ -s "$patch" ]; then
+    git apply --3way --index "$patch"
+  fi
+  rebuild
+  if ! commit; then
+    echo "Nothing left to commit on top of main"
+    exit 0
+  fi
+done
+echo "Could not push after $attempt attempts" >&2
+exit 1
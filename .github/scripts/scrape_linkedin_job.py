@@ -5,100 +5,85 @@ Scrapes job details from LinkedIn job posting URLs
 """
 
 import sys
-import re
 import json
-import requests
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+import asyncio
+from pathlib import Path
+
+# The LinkedIn extractor lives in the scraper engine (scripts/scrape_async.py),
+# so this script and scrape-job-url.py read postings the same way.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from html_extract import make_soup
+from scrape_async import (
+    LINKEDIN_BLOCKS,
+    LINKEDIN_GUEST_API,
+    LINKEDIN_HEADERS,
+    AsyncScraper,
+    linkedin_job_id,
+    parse_linkedin_posting,
+)
 
 
 def extract_linkedin_job_id(url):
     """Extract job ID from LinkedIn URL"""
     # LinkedIn job URLs typically have the format:
     # https://www.linkedin.com/jobs/view/1234567890
-    # https://www.linkedin.com/jobs/view/1234567890/
-    match = re.search(r'/jobs/view/(\d+)', url)
-    if match:
-        return match.group(1)
-    return None
+    # https://www.linkedin.com/jobs/view/senior-engineer-at-acme-1234567890/
+    # https://www.linkedin.com/jobs/search/?currentJobId=1234567890
+    return linkedin_job_id(url)
+
+
+def extract_company_link(html):
+    """LinkedIn company page linked from the posting's top card, without tracking params"""
+    link = make_soup(html, only_classes=LINKEDIN_BLOCKS).find('a', class_='topcard__org-name-link')
+    href = link.get('href', '') if link is not None else ''
+    return href.split('?', 1)[0].strip()
+
+
+async def _scrape(url):
+    # Same fetch as scrape_async.scrape_linkedin, kept here so the fragment's
+    # company link (not part of the job file's front matter) can be read too.
+    async with AsyncScraper() as scraper:
+        r = await scraper.get(f"{LINKEDIN_GUEST_API}/{extract_linkedin_job_id(url)}",
+                              kind="api", headers=LINKEDIN_HEADERS)
+        r.raise_for_status()
+        result = await scraper.parse(parse_linkedin_posting, r.text, url)
+        if result is None:
+            return None
+        return result, extract_company_link(r.text)
 
 
 def scrape_linkedin_job(url):
     """
-    Scrape job details from LinkedIn
+    Scrape job details from LinkedIn's guest job-posting endpoint
     
     Returns a dictionary with job details or None if scraping fails
     """
-    try:
-        # Set up headers to mimic a browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        
-        # Make request to LinkedIn
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract job details
-        job_data = {}
-        
-        # Try to find job title
-        title_elem = soup.find('h1', class_='top-card-layout__title') or \
-                     soup.find('h1', class_='topcard__title') or \
-                     soup.find('h2', class_='topcard__title')
-        if title_elem:
-            job_data['title'] = title_elem.get_text(strip=True)
-        
-        # Try to find company name
-        company_elem = soup.find('a', class_='topcard__org-name-link') or \
-                       soup.find('span', class_='topcard__flavor') or \
-                       soup.find('a', class_='top-card-layout__company-info')
-        if company_elem:
-            job_data['company'] = company_elem.get_text(strip=True)
-        
-        # Try to find location
-        location_elem = soup.find('span', class_='topcard__flavor topcard__flavor--bullet') or \
-                        soup.find('span', class_='top-card-layout__location')
-        if location_elem:
-            job_data['location'] = location_elem.get_text(strip=True)
-        
-        # Try to find job type (Full-time, Part-time, etc.)
-        job_type_elem = soup.find('span', class_='description__job-criteria-text')
-        if job_type_elem:
-            job_data['job_type'] = job_type_elem.get_text(strip=True)
-        
-        # Try to find job description
-        description_elem = soup.find('div', class_='description__text') or \
-                          soup.find('div', class_='show-more-less-html__markup')
-        if description_elem:
-            # Clean up the description
-            job_data['description'] = description_elem.get_text(separator='\n', strip=True)
-        
-        # Try to find company website from LinkedIn company page link
-        company_link = soup.find('a', class_='topcard__org-name-link')
-        if company_link and company_link.get('href'):
-            job_data['company_linkedin'] = company_link.get('href')
-        
-        # If we got at least a title, consider it successful
-        if 'title' in job_data:
-            return job_data
-        
-        return None
-        
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {e}", file=sys.stderr)
+    if extract_linkedin_job_id(url) is None:
+        print("Error: no job ID in URL", file=sys.stderr)
         return None
+    try:
+        result = asyncio.run(_scrape(url))
     except Exception as e:
         print(f"Error parsing job data: {e}", file=sys.stderr)
         return None
+    if result is None:
+        return None
+
+    (fm, description), company_link = result
+    job_data = {
+        'title': fm['title'],
+        'company': fm['organization_name'],
+        'job_type': fm['job_type'],
+    }
+    if company_link:
+        job_data['company_linkedin'] = company_link
+    if fm['location']:
+        job_data['location'] = fm['location']
+    if fm['salary_range']:
+        job_data['salary'] = fm['salary_range']
+    if description:
+        job_data['description'] = description
+    return job_data
 
 
 def format_job_data_as_issue_body(job_data):
@@ -58,6 +58,7 @@ function renderJob(job) {
   const hasUrl = Boolean(job.application_url);
   const description = job.description || "";
   const requirements = job.requirements || "";
+  const skills = (job.skills || "").split(",").map((s) => s.trim()).filter(Boolean);
   const applicationInstructions = job.application_instructions || "";
 
   root.innerHTML = `
@@ -143,6 +144,20 @@ function renderJob(job) {
               }
             </div>
 
+            <!-- Skills -->
+            ${
+              skills.length
+                ? `<div class="flex flex-wrap gap-2 mb-8">
+                     ${skills
+                       .map(
+                         (skill) =>
+                           `<span class="px-3 py-1 rounded-full bg-red-50 dark:bg-red-900/30 text-sm font-medium text-[#e74c3c] dark:text-red-400">${skill}</span>`
+                       )
+                       .join("")}
+                   </div>`
+                : ""
+            }
+
             <!-- Apply Buttons -->
             ${
               canApply
@@ -204,6 +219,7 @@ function renderJob(job) {
               : ""
           }
 
+          <div id="jobMatches"></div>
 
           <!-- Back to Jobs Button -->
           <div class="text-center">
@@ -242,21 +258,15 @@ function initJobDetail() {
     return;
   }
 
-  fetch("data/jobs.json", { cache: "no-cache" })
-    .then((res) => {
-      if (!res.ok) throw new Error("Failed to load jobs.json");
-      return res.json();
-    })
-    .then((data) => {
-      const jobs = Array.isArray(data.jobs) ? data.jobs : [];
-      const job = jobs.find((j) => String(j.id) === String(idParam));
-
+  loadJobRecord(idParam, params.get("v"))
+    .then((job) => {
       if (!job) {
         renderNotFound();
         return;
       }
 
       renderJob(job);
+      loadMatches(job.id).then(renderMatches).catch(() => {});
     })
     .catch((err) => {
       console.error("Error loading job details:", err);
@@ -264,5 +274,82 @@ function initJobDetail() {
     });
 }
 
+// One job's record from data/jobs/detail/ (see scripts/job_artifacts.py).
+// Listing links carry the file's content hash as ?v=; without it, the hash is
+// looked up in the summary. data/jobs.json is the last resort.
+function loadJobRecord(id, hash) {
+  const fetchJson = (url, options) =>
+    fetch(url, options).then((res) => {
+      if (!res.ok) throw new Error(`Failed to load ${url}`);
+      return res.json();
+    });
+
+  const fromDetail = hash
+    ? fetchJson(`data/jobs/detail/${encodeURIComponent(id)}.${hash}.json`)
+    : Promise.reject(new Error("no detail hash"));
+
+  return fromDetail
+    .catch(() =>
+      fetchJson("data/jobs/index.json", { cache: "no-cache" })
+        .then((index) => fetchJson(`data/jobs/${index.summary}`))
+        .then((summary) => {
+          const row = (summary.jobs || []).find((j) => String(j.id) === String(id));
+          return row ? fetchJson(`data/jobs/${row.detail}`) : null;
+        })
+    )
+    .catch(() =>
+      fetchJson("data/jobs.json", { cache: "no-cache" }).then((data) => {
+        const jobs = Array.isArray(data.jobs) ? data.jobs : [];
+        return jobs.find((j) => String(j.id) === String(id)) || null;
+      })
+    );
+}
+
+// Bucket of an id in data/matches/ (FNV-1a over UTF-8, as in scripts/match_seekers.py).
+function matchBucket(id, buckets) {
+  let h = 0x811c9dc5;
+  for (const byte of new TextEncoder().encode(String(id))) {
+    h = Math.imul(h ^ byte, 0x01000193) >>> 0;
+  }
+  return h % buckets;
+}
+
+// Best-matching seeker profiles for one job, as [[seeker id, score, name], ...].
+function loadMatches(id) {
+  return fetch("data/matches/index.json", { cache: "no-cache" })
+    .then((res) => (res.ok ? res.json() : null))
+    .then((index) => {
+      if (!index || !index.buckets) return [];
+      return fetch(`data/matches/${index.jobs[matchBucket(id, index.buckets)]}`)
+        .then((res) => (res.ok ? res.json() : {}))
+        .then((bucket) => bucket[id] || []);
+    });
+}
+
+function renderMatches(matches) {
+  const el = document.getElementById("jobMatches");
+  if (!el || !matches.length) return;
+  const esc = (s) => {
+    const d = document.createElement("div");
+    d.textContent = s;
+    return d.innerHTML;
+  };
+  el.innerHTML = `
+    <div class="bg-white dark:bg-gray-800 rounded-xl shadow-sm border border-gray-200 dark:border-gray-700 p-8 transition-colors duration-200">
+      <h3 class="text-2xl font-bold text-gray-900 dark:text-gray-100 mb-4">Matching Profiles</h3>
+      <ul class="space-y-2">
+        ${matches
+          .map(
+            ([seekerId, score, name]) => `
+          <li class="flex items-center justify-between gap-4">
+            <a href="seekers.html#${encodeURIComponent(seekerId)}" class="text-[#e74c3c] hover:text-red-700 font-medium">${esc(name || seekerId)}</a>
+            <span class="text-sm text-gray-500 dark:text-gray-400">${Math.round(score * 100)}% match</span>
+          </li>`
+          )
+          .join("")}
+      </ul>
+    </div>`;
+}
+
 document.addEventListener("DOMContentLoaded", initJobDetail);
 
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the scraper: its parsing functions on the recorded
+corpus (bench/corpus), and whole scrapes against the stand-in server
+(stand_in.py), so nothing touches the network.
+
+Micro benchmarks call one extraction function over and over on one recorded
+response: html_to_text, the Greenhouse and Lever parsers, BeautifulSoup parsing
+plus main_text on a heavy static page, extract_json_ld, the streaming JSON-LD
+scanner, parse_json_ld, parse_jina_markdown and finish_frontmatter.
+
+End-to-end benchmarks scrape posting URLs of every kind in the corpus
+(Greenhouse, Lever, JSON-LD page, heavy static page, JS-rendered page that
+needs Jina) from a stand-in server with the given latency and error rate:
+  single  one URL at a time, with a new scraper and event loop each (like scrape-job-url.py <url>)
+  batch   --urls distinct URLs through scrape_many at --concurrency
+Rate limits are lifted for the stand-in hosts; per-host limits, retries and
+the page/Jina race run as usual. A URL that fails or is extracted by another
+strategy than the corpus says fails the run.
+
+Each benchmark reports throughput, latency percentiles (the best of --rounds
+runs) and peak traced memory (tracemalloc, measured in a separate pass so it
+does not slow the timed runs). Results are compared with a baseline,
+.cache/bench/baseline.json unless --baseline says otherwise, recorded on the
+same machine with --save. The exit status is 1 when throughput, p95 latency or
+peak memory is worse than the baseline by more than --threshold (25% by
+default); baselines taken with other settings (HTML parser, latency, URL
+count, ...) are not compared.
+
+Usage:
+  bench.py                         run everything and compare with the baseline
+  bench.py --save                  run and record the results as the baseline
+  bench.py --only micro            just the function benchmarks (or --only e2e)
+  bench.py -k html_to_text         benchmarks whose name contains the text
+  bench.py --latency 0.05 --error-rate 0.02 --urls 500 --concurrency 64
+  bench.py --json results.json     also write the results as JSON
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from html import unescape
+from pathlib import Path
+from urllib.parse import urlparse
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import scrape_async  # noqa: E402
+from host_history import HostHistory  # noqa: E402
+from html_extract import PARSER, LdScanner, html_to_text, main_text, make_soup, scan_page  # noqa: E402
+from resilience import Guard  # noqa: E402
+from scrape_async import (  # noqa: E402
+    AsyncScraper,
+    extract_json_ld,
+    finish_frontmatter,
+    parse_greenhouse_job,
+    parse_jina_markdown,
+    parse_json_ld,
+    parse_lever_posting,
+)
+
+CORPUS_DIR = BENCH_DIR / "corpus"
+STAND_IN = BENCH_DIR / "stand_in.py"
+BASELINE_FILE = SCRIPTS_DIR.parent / ".cache" / "bench" / "baseline.json"
+
+THRESHOLD = 0.25          # relative change that counts as a regression
+MEMORY_SLACK_KIB = 64     # peak memory changes smaller than this are noise
+SECONDS = 1.0             # timed length of one micro benchmark round
+MIN_CALLS = 20            # ... but at least this many calls
+ROUNDS = 3
+URLS = 200                # batch size of the batch benchmark
+SINGLE_URLS = 20          # URLs scraped one by one in the single benchmark
+CONCURRENCY = 32
+
+# metric -> True when higher is better
+METRICS = {"ops_per_s": True, "p95_ms": False, "peak_kib": False}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    """Throughput and latency percentiles (ms) for calls that took `latencies` seconds in all."""
+    ordered = sorted(latencies)
+    return {
+        "ops_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "calls": len(ordered),
+    }
+
+
+def peak_kib(fn) -> float:
+    """Peak memory traced by tracemalloc while fn() runs, in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def time_calls(fn, seconds: float) -> dict:
+    """Call fn for about `seconds` (at least MIN_CALLS times)."""
+    latencies = []
+    started = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        fn()
+        now = time.perf_counter()
+        latencies.append(now - t0)
+        if now - started >= seconds and len(latencies) >= MIN_CALLS:
+            return summarize(latencies, now - started)
+
+
+def best_of(runs: list[dict]) -> dict:
+    return max(runs, key=lambda r: r["ops_per_s"])
+
+
+# ---------------------------------------------------------------------------
+# Micro benchmarks
+# ---------------------------------------------------------------------------
+
+def corpus_text(name: str) -> str:
+    return (CORPUS_DIR / name).read_text(encoding="utf-8")
+
+
+def micro_benchmarks() -> dict:
+    """name -> zero-argument callable, each over one recorded response."""
+    greenhouse = json.loads(corpus_text("greenhouse-job.json"))
+    greenhouse_html = unescape(greenhouse["content"])
+    lever = json.loads(corpus_text("lever-posting.json"))
+    heavy = corpus_text("heavy-page.html")
+    ld_page = corpus_text("jsonld-page.html")
+    ld_soup = make_soup(ld_page)
+    ld = extract_json_ld(ld_soup)
+    jina = corpus_text("jina-initech.md")
+    fm, description = parse_greenhouse_job(greenhouse, "Acme Security", greenhouse["absolute_url"])
+
+    return {
+        "html_to_text/greenhouse": lambda: html_to_text(greenhouse_html),
+        "parse_greenhouse_job": lambda: parse_greenhouse_job(greenhouse, "Acme Security",
+                                                             greenhouse["absolute_url"]),
+        "parse_lever_posting": lambda: parse_lever_posting(lever, "nimbus", lever["hostedUrl"]),
+        "make_soup/heavy": lambda: make_soup(heavy),
+        "soup_main_text/heavy": lambda: main_text(scan_page(make_soup(heavy))),
+        "extract_json_ld/page": lambda: extract_json_ld(ld_soup),
+        "ld_scanner/page": lambda: LdScanner().feed(ld_page),
+        "parse_json_ld": lambda: parse_json_ld(ld, "https://careers.globex.example/jobs/1"),
+        "parse_jina_markdown": lambda: parse_jina_markdown(jina, "https://app.initech.example/careers/1"),
+        "finish_frontmatter": lambda: finish_frontmatter(fm, greenhouse["absolute_url"], description),
+    }
+
+
+def run_micro(fn, seconds: float, rounds: int) -> dict:
+    fn()  # warm up (imports, regex compilation)
+    result = best_of([time_calls(fn, seconds) for _ in range(rounds)])
+    result["peak_kib"] = peak_kib(fn)
+    result["config"] = {"parser": PARSER}
+    return result
+
+
+# ---------------------------------------------------------------------------
+# End-to-end benchmarks
+# ---------------------------------------------------------------------------
+
+def corpus_manifest() -> dict:
+    return json.loads(corpus_text("manifest.json"))
+
+
+def posting_urls(count: int, offset: int = 0) -> list[tuple[str, str]]:
+    """[(url, expected strategy)]: `count` distinct URLs cycling through the corpus's posting kinds."""
+    postings = corpus_manifest()["postings"]
+    return [(postings[n % len(postings)]["url"].format(n=offset + n + 1), postings[n % len(postings)]["strategy"])
+            for n in range(count)]
+
+
+class StandInProcess:
+    """stand_in.py in a process of its own, so serving does not compete with the scraper for the GIL."""
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, seed: int):
+        self.args = [sys.executable, str(STAND_IN), "--port", "0", "--latency", str(latency),
+                     "--jitter", str(jitter), "--error-rate", str(error_rate), "--seed", str(seed)]
+        self.proc = None
+        self.url = ""
+
+    def __enter__(self):
+        self.proc = subprocess.Popen(self.args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        line = self.proc.stdout.readline()
+        if not line.startswith("listening on "):
+            self.proc.kill()
+            raise RuntimeError("stand-in server did not start")
+        self.url = line.split()[-1]
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        self.proc.wait(timeout=10)
+
+
+class EndToEnd:
+    def __init__(self, stand_in: str, per_host: int, concurrency: int):
+        self.stand_in = stand_in
+        self.per_host = per_host
+        self.concurrency = concurrency
+        # Requests to the stand-in hosts are not rate limited: the point is the scraper's own cost.
+        hosts = {urlparse(entry["url"]).netloc for entry in corpus_manifest()["responses"]}
+        hosts |= {urlparse(url).netloc for url, _ in posting_urls(len(corpus_manifest()["postings"]))}
+        self.rates = {host: (1e6, 10 ** 6) for host in hosts}
+
+    def scraper(self) -> AsyncScraper:
+        guard = Guard(transient=scrape_async.transient_errors(), rates=self.rates)
+        return AsyncScraper(per_host=self.per_host, history=HostHistory(None), guard=guard,
+                            stand_in=self.stand_in)
+
+    async def scrape_one(self, url: str) -> dict:
+        async with self.scraper() as scraper:
+            return await scraper.scrape_result(url)
+
+    def single(self, urls: list[tuple[str, str]]) -> tuple[dict, int]:
+        latencies, wrong = [], 0
+        started = time.perf_counter()
+        for url, expected in urls:
+            t0 = time.perf_counter()
+            result = asyncio.run(self.scrape_one(url))
+            latencies.append(time.perf_counter() - t0)
+            wrong += result["error"] is not None or result["strategy"] != expected
+        return summarize(latencies, time.perf_counter() - started), wrong
+
+    async def _batch(self, urls: list[tuple[str, str]]) -> tuple[list[dict], float]:
+        expected = dict(urls)
+        results = []
+        async with self.scraper() as scraper:
+            started = time.perf_counter()
+            async for result in scraper.scrape_many(list(expected), self.concurrency):
+                result["expected"] = expected[result["url"]]
+                results.append(result)
+            return results, time.perf_counter() - started
+
+    def batch(self, urls: list[tuple[str, str]]) -> tuple[dict, int]:
+        results, elapsed = asyncio.run(self._batch(urls))
+        wrong = sum(r["error"] is not None or r["strategy"] != r["expected"] for r in results)
+        return summarize([r["elapsed"] for r in results], elapsed), wrong
+
+
+def run_e2e(args, names: list[str]) -> tuple[dict, list[str]]:
+    """Results of the selected end-to-end benchmarks, and a description of each failure."""
+    results, failures = {}, []
+    config = {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+              "per_host": args.per_host, "parser": PARSER}
+    with StandInProcess(args.latency, args.jitter, args.error_rate, args.seed) as server:
+        e2e = EndToEnd(server.url, args.per_host, args.concurrency)
+        asyncio.run(e2e.scrape_one(posting_urls(1)[0][0]))  # warm up (imports, first connection)
+        plans = {
+            "e2e/single": (e2e.single, SINGLE_URLS, {}),
+            "e2e/batch": (e2e.batch, args.urls, {"urls": args.urls, "concurrency": args.concurrency}),
+        }
+        for name in names:
+            run, count, extra = plans[name]
+            runs = []
+            for i in range(args.rounds):
+                summary, wrong = run(posting_urls(count, offset=i * count))
+                if wrong:
+                    failures.append(f"{name}: {wrong} of {count} URLs failed or used the wrong strategy")
+                runs.append(summary)
+            result = best_of(runs)
+            result["peak_kib"] = peak_kib(lambda: run(posting_urls(count, offset=args.rounds * count)))
+            result["config"] = {**config, **extra}
+            results[name] = result
+    return results, failures
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+def load_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("benchmarks", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path: Path, results: dict) -> None:
+    """Merge results into the baseline file (benchmarks not run keep their old entries)."""
+    merged = {**load_baseline(path), **results}
+    data = {"python": platform.python_version(), "machine": platform.machine(),
+            "benchmarks": dict(sorted(merged.items()))}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def regressions(name: str, result: dict, base: dict | None, threshold: float) -> tuple[list[str], str]:
+    """(regressions, note) for one benchmark against its baseline entry."""
+    if base is None:
+        return [], "no baseline"
+    if base.get("config") != result["config"]:
+        return [], "baseline has other settings"
+    found, changes = [], []
+    for metric, higher_is_better in METRICS.items():
+        old, new = base.get(metric), result[metric]
+        if not old:
+            continue
+        change = (new - old) / old
+        changes.append(f"{metric} {change:+.0%}")
+        worse = -change if higher_is_better else change
+        if metric == "peak_kib" and new - old < MEMORY_SLACK_KIB:
+            continue
+        if worse > threshold:
+            found.append(f"{name}: {metric} {old:g} -> {new:g} ({change:+.0%})")
+    return found, ", ".join(changes)
+
+
+def report(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print one line per benchmark; return the regressions found."""
+    print(f"{'benchmark':<26} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9}  vs baseline")
+    found = []
+    for name, r in results.items():
+        regressed, note = regressions(name, r, baseline.get(name), threshold)
+        found += regressed
+        print(f"{name:<26} {r['ops_per_s']:>10.1f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+              f"{r['peak_kib']:>9.1f}  {'REGRESSED ' if regressed else ''}{note}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper offline against the recorded corpus")
+    parser.add_argument("--only", choices=["micro", "e2e"], help="run one group of benchmarks")
+    parser.add_argument("-k", dest="pattern", default="", help="run benchmarks whose name contains this")
+    parser.add_argument("--seconds", type=float, default=SECONDS,
+                        help=f"timed seconds per micro benchmark round (default {SECONDS:g})")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"rounds per benchmark, best kept (default {ROUNDS})")
+    parser.add_argument("--urls", type=int, default=URLS, help=f"URLs in the batch benchmark (default {URLS})")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help=f"batch benchmark concurrency (default {CONCURRENCY})")
+    parser.add_argument("--per-host", type=int, default=scrape_async.DEFAULT_PER_HOST,
+                        help=f"max simultaneous requests per host (default {scrape_async.DEFAULT_PER_HOST})")
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in response latency in seconds (default 0.02)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="stand-in extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stand-in responses that are 503s")
+    parser.add_argument("--seed", type=int, default=1, help="stand-in random seed (default 1)")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="baseline file (default .cache/bench/baseline.json)")
+    parser.add_argument("--save", action="store_true", help="record these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"relative slowdown or growth that fails the run (default {THRESHOLD:g})")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+    args = parser.parse_args()
+    args.rounds = max(1, args.rounds)
+
+    e2e = [name for name in ("e2e/single", "e2e/batch") if args.pattern in name]
+    results, failures = {}, []
+    # The extractors log every posting to stderr; keep the report readable.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        if args.only != "e2e":
+            micro = {name: fn for name, fn in micro_benchmarks().items() if args.pattern in name}
+            for name, fn in micro.items():
+                results[name] = run_micro(fn, args.seconds, args.rounds)
+        if args.only != "micro" and e2e:
+            found, failures = run_e2e(args, e2e)
+            results.update(found)
+
+    baseline_path = Path(args.baseline)
+    found = report(results, load_baseline(baseline_path), args.threshold)
+    for line in failures + found:
+        print(line, file=sys.stderr)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=1) + "\n", encoding="utf-8")
+    if args.save:
+        save_baseline(baseline_path, results)
+        print(f"Baseline saved to {baseline_path}", file=sys.stderr)
+    sys.exit(1 if failures or (found and not args.save) else 0)
+
+
+if __name__ == "__main__":
+    main()
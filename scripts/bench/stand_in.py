@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Stand-in HTTP server for the scraper: answers from the recorded corpus in
+bench/corpus instead of the real ATS APIs, career sites and r.jina.ai.
+
+A scraper pointed at it (AsyncScraper(stand_in=...) or scrape-job-url.py
+--stand-in) sends https://<host>/<path> as <stand-in>/<host>/<path>; see
+scrape_async.stand_in_url. corpus/manifest.json maps URL patterns to response
+files, "*" standing for one path segment, so a batch of distinct posting URLs
+(no two fetches shared) can be served from a handful of recordings. Anything
+not in the manifest gets a 404.
+
+Every response waits --latency seconds plus up to --jitter more, and a
+--error-rate fraction of requests are answered with --error-status (503 by
+default, which the scraper retries), so slow and flaky hosts can be replayed
+deterministically with --seed.
+
+Usage:
+  stand_in.py [--port 8700] [--latency 0.05] [--jitter 0.02] [--error-rate 0.01] [--seed 1]
+
+It prints "listening on <url>" once it is ready, then serves until interrupted.
+bench.py starts one of its own.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import signal
+import sys
+from pathlib import Path
+from urllib.parse import unquote
+
+from aiohttp import web
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+DEFAULT_PORT = 8700
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".html": "text/html",
+    ".md": "text/plain",
+    ".xml": "application/xml",
+}
+
+
+def load_routes(corpus_dir: Path = CORPUS_DIR) -> list[tuple[re.Pattern, bytes, str]]:
+    """[(pattern, body, content type)] from the corpus manifest, in manifest order."""
+    manifest = json.loads((corpus_dir / "manifest.json").read_text(encoding="utf-8"))
+    routes = []
+    for entry in manifest["responses"]:
+        target = re.sub(r"^https?://", "", entry["url"])
+        pattern = re.compile(re.escape(target).replace(r"\*", r"[^/?]+"))
+        path = corpus_dir / entry["file"]
+        routes.append((pattern, path.read_bytes(), CONTENT_TYPES.get(path.suffix, "application/octet-stream")))
+    return routes
+
+
+class StandIn:
+    """The server: the corpus routes plus the latency and error settings."""
+
+    def __init__(self, corpus_dir: Path = CORPUS_DIR, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: int | None = None):
+        self.routes = load_routes(corpus_dir)
+        self.latency = max(0.0, latency)
+        self.jitter = max(0.0, jitter)
+        self.error_rate = min(1.0, max(0.0, error_rate))
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "missing": 0}
+        self._runner: web.AppRunner | None = None
+
+    def match(self, target: str):
+        for pattern, body, content_type in self.routes:
+            if pattern.fullmatch(target):
+                return body, content_type
+        return None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        # raw_path keeps the original host's URL as sent (r.jina.ai/https://…).
+        target = unquote(request.raw_path.lstrip("/").split("?", 1)[0])
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        failed = self.random.random() < self.error_rate
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            self.stats["errors"] += 1
+            return web.Response(status=self.error_status, text="stand-in error\n")
+        found = self.match(target)
+        if found is None:
+            self.stats["missing"] += 1
+            return web.Response(status=404, text=f"not in the corpus: {target}\n")
+        body, content_type = found
+        return web.Response(body=body, content_type=content_type, charset="utf-8")
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> str:
+        """Start serving; returns the base URL (port 0 picks a free port)."""
+        app = web.Application()
+        app.router.add_route("GET", "/{target:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(server: StandIn, host: str, port: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"listening on {await server.start(host, port)}", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await server.stop()
+        print(f"[stand-in] {json.dumps(server.stats)}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the recorded scraper corpus in place of the real hosts")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"port to listen on, 0 for any free port (default {DEFAULT_PORT})")
+    parser.add_argument("--corpus", default=str(CORPUS_DIR), help="corpus directory (default bench/corpus)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every response (default 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail (default 0)")
+    parser.add_argument("--error-status", type=int, default=503, help="status of a failed request (default 503)")
+    parser.add_argument("--seed", type=int, help="seed for latency jitter and errors")
+    args = parser.parse_args()
+
+    server = StandIn(Path(args.corpus), args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    asyncio.run(_serve(server, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
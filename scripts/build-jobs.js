@@ -20,6 +20,7 @@ function mdToJob(filePath) {
     title: get("title", "Untitled"),
     description: (body || get("description") || "").trim(),
     requirements: get("requirements") || null,
+    skills: get("skills") || null,
     location: get("location") || null,
     job_type: get("job_type", "full-time"),
     salary_range: get("salary_range") || null,
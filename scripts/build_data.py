@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Incremental Python counterpart of build-jobs.js: builds data/jobs.json from
+jobs/*.md and data/seekers.json from seekers/*.md, with the same records and
+the same JSON layout.
+
+A manifest in .cache/build/manifest.json remembers, per source file, its
+mtime/size, a content digest and where its serialized record sits in the
+previous output. A rebuild stats every file but only re-parses files whose
+content changed; unchanged records are copied byte-for-byte from the previous
+output while the new file is streamed to disk, so memory stays at one record
+and nothing is rewritten when no source changed.
+
+For jobs it also maintains the paginated, content-hashed files under data/jobs/
+(see job_artifacts.py). Each job's summary row is kept in the manifest, so only
+changed jobs get a new detail file.
+
+Usage:
+  build_data.py            build both files
+  build_data.py --full     ignore the manifest and re-parse everything
+
+scrape-job-url.py calls build_all() in-process with --build-data.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import frontmatter
+import job_artifacts
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / "data"
+MANIFEST_FILE = ROOT_DIR / ".cache" / "build" / "manifest.json"
+RECORD_VERSION = 2  # bump when md_to_job/md_to_seeker change, so every file is re-parsed once
+_INT_PREFIX = re.compile(r"\s*([+-]?\d+)")
+
+
+def _now_iso() -> str:
+    """new Date().toISOString()"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _getter(fm: dict):
+    def get(key, default=None):
+        value = fm.get(key)
+        return value if value is not None and value != "" else default
+    return get
+
+
+def md_to_job(stem: str, fm: dict, body: str) -> dict:
+    get = _getter(fm)
+    m = _INT_PREFIX.match(str(get("views_count", "")))
+    return {
+        "id": stem,
+        "organization_name": get("organization_name", "Unknown organization"),
+        "organization_logo": get("organization_logo") or None,
+        "title": get("title", "Untitled"),
+        "description": (body or get("description") or "").strip(),
+        "requirements": get("requirements") or None,
+        "skills": get("skills") or None,
+        "location": get("location") or None,
+        "job_type": get("job_type", "full-time"),
+        "salary_range": get("salary_range") or None,
+        "expires_at": get("expires_at") or None,
+        "application_email": get("application_email") or None,
+        "application_url": get("application_url") or None,
+        "application_instructions": get("application_instructions") or None,
+        "created_at": get("created_at") or _now_iso(),
+        "views_count": int(m.group(1)) if m else 0,
+    }
+
+
+def md_to_seeker(stem: str, fm: dict, body: str) -> dict:
+    get = _getter(fm)
+    return {
+        "id": stem,
+        "name": get("name", "Anonymous"),
+        "headline": get("headline", ""),
+        "location": get("location", ""),
+        "skills": get("skills", ""),
+        "experience_summary": get("experience_summary", ""),
+        "profile_url": get("profile_url", ""),
+        "availability": get("availability", ""),
+        "created_at": get("created_at") or _now_iso(),
+        "about": (body or "").strip(),
+    }
+
+
+# name -> (source dir, output file, top-level key, record builder)
+COLLECTIONS = {
+    "jobs": (ROOT_DIR / "jobs", DATA_DIR / "jobs.json", "jobs", md_to_job),
+    "seekers": (ROOT_DIR / "seekers", DATA_DIR / "seekers.json", "seekers", md_to_seeker),
+}
+
+# name -> (metadata version, record_meta(record, previous metadata) kept in the manifest,
+#          publish(all metadata), which diffs against what is published)
+ARTIFACTS = {
+    "jobs": (job_artifacts.META_VERSION, job_artifacts.record_meta, job_artifacts.publish),
+}
+
+
+def source_files(src_dir: Path) -> list[os.DirEntry]:
+    if not src_dir.is_dir():
+        return []
+    entries = [e for e in os.scandir(src_dir) if e.name.endswith(".md") and e.name != "README.md"]
+    return sorted(entries, key=lambda e: e.name)
+
+
+def serialize_record(record: dict) -> bytes:
+    """A record as JSON.stringify(out, null, 2) lays it out inside the top-level array."""
+    text = json.dumps(record, indent=2, ensure_ascii=False)
+    return ("    " + text.replace("\n", "\n    ")).encode("utf-8")
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def _output_matches(stamp: dict | None, path: Path) -> bool:
+    """True if path is still the output described by stamp (size, mtime_ns, digest)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if not stamp or stamp.get("size") != st.st_size:
+        return False
+    if stamp.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    # A fresh checkout or cache restore changes mtimes but not content.
+    h = hashlib.blake2b(digest_size=12)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    if h.hexdigest() != stamp.get("digest"):
+        return False
+    stamp["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written and tracks the position."""
+
+    def __init__(self, f, h):
+        self._f, self._h, self._pos = f, h, 0
+
+    def write(self, data: bytes) -> None:
+        self._f.write(data)
+        self._h.update(data)
+        self._pos += len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict) -> None:
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_FILE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def build_collection(name: str, manifest: dict, full: bool = False) -> dict:
+    """Rebuild one data file; returns {"parsed": n, "reused": n, "written": bool}."""
+    src_dir, out_file, key, to_record = COLLECTIONS[name]
+    meta_version, record_meta, publish = ARTIFACTS.get(name, (None, None, None))
+    prev = manifest.get(name) or {}
+    prev_files = prev.get("files") or {}
+    # Offsets into the previous output are only valid if nobody else rewrote it.
+    reusable = (not full and prev.get("record_version") == RECORD_VERSION
+                and _output_matches(prev.get("output"), out_file))
+
+    entries = source_files(src_dir)
+    # (name, stat key, digest, ("copy", offset, length) | ("new", bytes), artifact metadata)
+    plan = []
+    parsed = 0
+    for entry in entries:
+        st = entry.stat()
+        stat_key = [st.st_size, st.st_mtime_ns]
+        known = prev_files.get(entry.name) if reusable else None
+        if known and record_meta and known.get("meta_version") != meta_version:
+            known = None  # metadata was built by an older version
+        if known and known["stat"] == stat_key:
+            plan.append((entry.name, stat_key, known["digest"],
+                         ("copy", known["offset"], known["length"]), known.get("meta")))
+            continue
+        data = Path(entry.path).read_bytes()
+        digest = _digest(data)
+        if known and known["digest"] == digest:
+            plan.append((entry.name, stat_key, digest,
+                         ("copy", known["offset"], known["length"]), known.get("meta")))
+            continue
+        fm, body = frontmatter.parse(data.decode("utf-8"))
+        record = to_record(Path(entry.name).stem, fm, body)
+        previous = (prev_files.get(entry.name) or {}).get("meta")
+        meta = record_meta(record, previous) if record_meta else None
+        plan.append((entry.name, stat_key, digest, ("new", serialize_record(record)), meta))
+        parsed += 1
+
+    unchanged = reusable and parsed == 0 and [p[0] for p in plan] == sorted(prev_files)
+    if publish and not (unchanged and job_artifacts.is_published()):
+        publish([p[4] for p in plan])
+    if unchanged:
+        # Still record fresh stats (e.g. after a checkout touched every mtime).
+        for fname, stat_key, *_ in plan:
+            prev_files[fname]["stat"] = stat_key
+        return {"parsed": 0, "reused": len(plan), "written": False}
+
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    files = {}
+    prev_out = open(out_file, "rb") if reusable and any(p[3][0] == "copy" for p in plan) else None
+    fd, tmp = tempfile.mkstemp(dir=out_file.parent, prefix=f".{out_file.name}.")
+    h = hashlib.blake2b(digest_size=12)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            out = _HashingWriter(f, h)
+            if plan:
+                out.write(f'{{\n  "{key}": [\n'.encode())
+            else:
+                out.write(f'{{\n  "{key}": [],\n'.encode())
+            pos = out.tell()
+            for i, (fname, stat_key, digest, (kind, *rest), meta) in enumerate(plan):
+                if kind == "copy":
+                    prev_out.seek(rest[0])
+                    chunk = prev_out.read(rest[1])
+                else:
+                    chunk = rest[0]
+                if i:
+                    out.write(b",\n")
+                    pos += 2
+                out.write(chunk)
+                files[fname] = {"stat": stat_key, "digest": digest, "offset": pos, "length": len(chunk)}
+                if meta is not None:
+                    files[fname].update(meta=meta, meta_version=meta_version)
+                pos += len(chunk)
+            if plan:
+                out.write(b"\n  ],\n")
+            out.write(f'  "count": {len(plan)},\n  "generated_at": "{_now_iso()}"\n}}'.encode())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, out_file)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    finally:
+        if prev_out:
+            prev_out.close()
+
+    st = out_file.stat()
+    manifest[name] = {
+        "record_version": RECORD_VERSION,
+        "files": files,
+        "output": {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": h.hexdigest()},
+    }
+    return {"parsed": parsed, "reused": len(plan) - parsed, "written": True}
+
+
+def build_all(full: bool = False) -> dict:
+    manifest = {} if full else load_manifest()
+    stats = {name: build_collection(name, manifest, full) for name in COLLECTIONS}
+    save_manifest(manifest)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build data/jobs.json and data/seekers.json")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and re-parse everything")
+    args = parser.parse_args()
+    for name, s in build_all(args.full).items():
+        state = "written" if s["written"] else "unchanged"
+        print(f"{name}: {s['parsed']} parsed, {s['reused']} reused, {state}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
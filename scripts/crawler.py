@@ -0,0 +1,396 @@
+"""
+Careers-site crawler: finds job postings from sitemaps and careers pages.
+
+Seeds are careers pages (https://acme.com/careers) or sitemaps
+(https://acme.com/sitemap.xml, .xml.gz or a plain-text list of URLs). From them:
+  - sitemaps and sitemap indexes are read for URLs that look like postings: a
+    careers-like path segment (CAREERS_PATH) or any URL an ATS API extractor
+    handles;
+  - careers pages are read for links to such URLs on the same site or on an
+    ATS, which are followed up to max_depth links from the seed;
+  - every candidate goes to the scraper's extractors, and only a structured
+    posting (an ATS API answer or a JSON-LD JobPosting) counts as found. The
+    static heuristics and Jina are never used on crawled pages, which are as
+    likely to be listings as postings.
+
+Politeness: robots.txt is honoured for every crawled host (read once per run,
+cached for a day) together with its Crawl-delay, or CRAWL_DELAY seconds between
+requests to one host when it sets none; hosts asking for more than
+MAX_CRAWL_DELAY are skipped. ATS API requests are paced by the resilience
+guard's rate limits instead. Hosts are crawled concurrently, and every fetch
+goes through the scraper's response cache, so an unchanged page costs a
+conditional request.
+
+The frontier is a bounded queue, deduplicated within the run. The persistent
+seen-set is data/crawl-state.json: for every posting URL, the sitemap lastmod
+it was last fetched at and when. A recrawl skips postings whose lastmod has not
+changed, and postings without a lastmod that were checked in the last
+RECHECK_AFTER seconds. Listing pages are always re-read; that is where new
+postings appear.
+
+Used by scrape-job-url.py --crawl, which writes what is found:
+  crawler = Crawler(scraper)
+  async for found in crawler.crawl(["https://acme.com/careers"]):
+      ...   # {"url", "strategy", "frontmatter", "description", "lastmod"}
+  crawler.state.save()
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+
+from html_extract import sniff_encoding
+from scrape_async import AsyncScraper, finish_frontmatter, json_ld_posting, match_api
+
+STATE_FILE = Path(__file__).resolve().parent.parent / "data" / "crawl-state.json"
+
+USER_AGENT = "OWASP-BLT-Jobs-Bot"  # the token robots.txt rules are matched against
+CRAWL_DELAY = 1.0                  # seconds between requests to one host without a Crawl-delay
+MAX_CRAWL_DELAY = 30.0             # hosts asking for a longer delay are not crawled
+ROBOTS_TTL = 24 * 3600
+
+DEFAULT_WORKERS = 8
+MAX_PAGES = 200          # fetches per seed per run
+MAX_DEPTH = 2            # links followed from a seed page
+MAX_SITEMAP_DEPTH = 3    # nested sitemap indexes followed
+MAX_FRONTIER = 10000     # URLs waiting at once; further ones are dropped for this run
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024  # sitemaps.org limit (uncompressed)
+
+RECHECK_AFTER = 7 * 24 * 3600   # postings without a lastmod are re-read after this long
+MAX_STATE_URLS = 100000         # least recently checked URLs are forgotten beyond this
+
+CAREERS_PATH = re.compile(
+    r"/(?:jobs?|careers?|positions?|openings?|vacanc(?:y|ies)|opportunit(?:y|ies)|join-us|work-with-us)(?:/|$)",
+    re.I,
+)
+
+
+# ---------------------------------------------------------------------------
+# Seen-set
+# ---------------------------------------------------------------------------
+
+class CrawlState:
+    """{url: {"lastmod", "checked"}} for every posting URL, saved to data/crawl-state.json."""
+
+    def __init__(self, path: Path | None = STATE_FILE):
+        self.path = path
+        self._urls: dict[str, dict] = {}
+        self._dirty = False
+        if path is not None:
+            try:
+                self._urls = json.loads(Path(path).read_text(encoding="utf-8")).get("urls", {})
+            except (OSError, ValueError, AttributeError):
+                self._urls = {}
+
+    def due(self, url: str, lastmod: str = "") -> bool:
+        """Whether url needs fetching: never seen, lastmod changed, or unchecked for RECHECK_AFTER."""
+        entry = self._urls.get(url)
+        if entry is None:
+            return True
+        if lastmod:
+            return entry.get("lastmod") != lastmod
+        return time.time() - entry.get("checked", 0) >= RECHECK_AFTER
+
+    def mark(self, url: str, lastmod: str = "") -> None:
+        self._urls[url] = {"lastmod": lastmod, "checked": int(time.time())}
+        self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        urls = self._urls
+        if len(urls) > MAX_STATE_URLS:
+            keep = sorted(urls, key=lambda u: urls[u].get("checked", 0), reverse=True)[:MAX_STATE_URLS]
+            urls = self._urls = {u: urls[u] for u in keep}
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".crawl-state.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"urls": dict(sorted(urls.items()))}, f, indent=1)
+                f.write("\n")
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._dirty = False
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def page_text(r) -> str:
+    """The decoded body of a fetched page.
+
+    requests falls back to ISO-8859-1 for text/* without a charset; like
+    scrape_async.stream_page, only a declared charset is trusted and the rest
+    are sniffed.
+    """
+    declared = "charset" in r.headers.get("content-type", "").lower()
+    return r.content.decode((r.encoding if declared else None) or sniff_encoding(r.content[:4096]), "replace")
+
+
+class _Links(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.hrefs.append(href)
+
+
+def page_links(html: str, base: str) -> list[str]:
+    """Absolute http(s) URLs of the page's <a href> links, without fragments, in page order."""
+    parser = _Links()
+    parser.feed(html)
+    parser.close()
+    links, seen = [], set()
+    for href in parser.hrefs:
+        url = urldefrag(urljoin(base, href.strip())).url
+        if url.startswith(("http://", "https://")) and url not in seen:
+            seen.add(url)
+            links.append(url)
+    return links
+
+
+def parse_sitemap(data: bytes) -> tuple[list[tuple[str, str]], list[str]]:
+    """([(url, lastmod)], [child sitemap URL]) from a sitemap, sitemap index or text sitemap."""
+    if data[:2] == b"\x1f\x8b":
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as f:
+            data = f.read(MAX_SITEMAP_BYTES)
+    if data.lstrip(b"\xef\xbb\xbf \t\r\n")[:1] != b"<":
+        lines = data.decode("utf-8", "replace").splitlines()
+        return [(line.strip(), "") for line in lines if line.strip().startswith(("http://", "https://"))], []
+
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        print(f"[crawl] sitemap parse error: {e}", file=sys.stderr)
+        return [], []
+    urls, sitemaps = [], []
+    index = root.tag.rsplit("}", 1)[-1] == "sitemapindex"
+    for entry in root:
+        fields = {child.tag.rsplit("}", 1)[-1]: (child.text or "").strip() for child in entry}
+        if not fields.get("loc"):
+            continue
+        if index:
+            sitemaps.append(fields["loc"])
+        else:
+            urls.append((fields["loc"], fields.get("lastmod", "")))
+    return urls, sitemaps
+
+
+def looks_like_sitemap(url: str) -> bool:
+    path = urlparse(url).path.lower()
+    return path.endswith((".xml", ".xml.gz")) or "sitemap" in path
+
+
+def _site(url: str) -> str:
+    return urlparse(url).netloc.lower().removeprefix("www.")
+
+
+def is_candidate(url: str) -> bool:
+    """A URL an ATS extractor handles, or one with a careers-like path segment."""
+    return match_api(url)[0] is not None or bool(CAREERS_PATH.search(urlparse(url).path))
+
+
+# ---------------------------------------------------------------------------
+# Crawler
+# ---------------------------------------------------------------------------
+
+class Crawler:
+    """Crawls seeds through an AsyncScraper; crawl() yields the postings found."""
+
+    def __init__(self, scraper: AsyncScraper, state: CrawlState | None = None,
+                 workers: int = DEFAULT_WORKERS, max_pages: int = MAX_PAGES, max_depth: int = MAX_DEPTH):
+        self.scraper = scraper
+        self.state = state if state is not None else CrawlState(None)
+        self.workers = max(1, workers)
+        self.max_pages = max(1, max_pages)
+        self.max_depth = max(0, max_depth)
+        self.stats = {"fetched": 0, "postings": 0, "unchanged": 0, "disallowed": 0, "dropped": 0}
+        self._queued: set[str] = set()
+        self._fetches: dict[int, int] = {}            # seed -> fetches so far
+        self._robots: dict[str, asyncio.Future] = {}  # origin -> RobotFileParser or None
+        self._host_locks: dict[str, asyncio.Lock] = {}
+        self._next_fetch: dict[str, float] = {}
+
+    # -- frontier ------------------------------------------------------------
+
+    def _push(self, todo: asyncio.Queue, kind: str, url: str, depth: int, lastmod: str, seed: int) -> None:
+        if url in self._queued:
+            return
+        if todo.qsize() >= MAX_FRONTIER:
+            self.stats["dropped"] += 1
+            return
+        self._queued.add(url)
+        todo.put_nowait((kind, url, depth, lastmod, seed))
+
+    async def crawl(self, seeds):
+        """Crawl from seeds (careers pages or sitemaps); yield each posting as it is found:
+          {"url", "strategy", "frontmatter", "description", "lastmod"}
+        """
+        todo: asyncio.Queue = asyncio.Queue()
+        found: asyncio.Queue = asyncio.Queue()
+        for i, seed in enumerate(seeds):
+            self._push(todo, "sitemap" if looks_like_sitemap(seed) else "page", seed, 0, "", i)
+
+        async def work():
+            while True:
+                kind, url, depth, lastmod, seed = await todo.get()
+                try:
+                    if kind == "sitemap":
+                        await self._sitemap(todo, url, depth, seed)
+                    else:
+                        await self._page(todo, found, url, depth, lastmod, seed)
+                except Exception as e:
+                    print(f"[crawl] {url}: {e.__class__.__name__}: {e}", file=sys.stderr)
+                finally:
+                    todo.task_done()
+
+        async def finish():
+            await todo.join()
+            await found.put(None)
+
+        tasks = [asyncio.create_task(work()) for _ in range(self.workers)]
+        tasks.append(asyncio.create_task(finish()))
+        try:
+            while (posting := await found.get()) is not None:
+                yield posting
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -- politeness ----------------------------------------------------------
+
+    async def _robots_for(self, url: str) -> RobotFileParser | None:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        robots = self._robots.get(origin)
+        if robots is None:
+            robots = self._robots[origin] = asyncio.ensure_future(self._load_robots(origin))
+        return await robots
+
+    async def _load_robots(self, origin: str) -> RobotFileParser | None:
+        """The host's rules; None (crawl nothing) when robots.txt is unreachable (RFC 9309 §2.3.1)."""
+        robots = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            r = await self.scraper.get(f"{origin}/robots.txt", kind="page", ttl=ROBOTS_TTL)
+        except Exception as e:
+            print(f"[crawl] {origin}/robots.txt: {e}; not crawling the host", file=sys.stderr)
+            return None
+        if r.status_code >= 500:
+            print(f"[crawl] {origin}/robots.txt: HTTP {r.status_code}; not crawling the host", file=sys.stderr)
+            return None
+        if r.status_code >= 400:
+            robots.allow_all = True
+        else:
+            robots.parse(r.text.splitlines())
+        return robots
+
+    async def _fetch(self, url: str, seed: int):
+        """GET a crawled page within robots.txt, the host's crawl delay and the seed's page budget.
+
+        Returns the response, or None when the page may not or need not be fetched.
+        """
+        if self._fetches.get(seed, 0) >= self.max_pages:
+            self.stats["dropped"] += 1
+            return None
+        robots = await self._robots_for(url)
+        if robots is None or not robots.can_fetch(USER_AGENT, url):
+            self.stats["disallowed"] += 1
+            return None
+        delay = robots.crawl_delay(USER_AGENT)
+        delay = CRAWL_DELAY if delay is None else float(delay)
+        if delay > MAX_CRAWL_DELAY:
+            self.stats["disallowed"] += 1
+            return None
+
+        host = urlparse(url).netloc
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self._next_fetch.get(host, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_fetch[host] = time.monotonic() + delay
+        self._fetches[seed] = self._fetches.get(seed, 0) + 1
+        self.stats["fetched"] += 1
+        r = await self.scraper.get(url, kind="page")
+        if not r.ok:
+            print(f"[crawl] {url}: HTTP {r.status_code}", file=sys.stderr)
+            return None
+        return r
+
+    # -- visiting ------------------------------------------------------------
+
+    async def _sitemap(self, todo: asyncio.Queue, url: str, depth: int, seed: int) -> None:
+        r = await self._fetch(url, seed)
+        if r is None:
+            return
+        urls, sitemaps = await self.scraper.parse(parse_sitemap, r.content)
+        if depth < MAX_SITEMAP_DEPTH:
+            for child in sitemaps:
+                self._push(todo, "sitemap", child, depth + 1, "", seed)
+        for loc, lastmod in urls:
+            if not is_candidate(loc):
+                continue
+            if not self.state.due(loc, lastmod):
+                self.stats["unchanged"] += 1
+                continue
+            # Sitemap entries are leaves: read for a posting, their links not followed.
+            self._push(todo, "page", loc, self.max_depth, lastmod, seed)
+
+    async def _page(self, todo: asyncio.Queue, found: asyncio.Queue, url: str, depth: int,
+                    lastmod: str, seed: int) -> None:
+        route, m = match_api(url)
+        if route is not None:
+            if depth and not self.state.due(url, lastmod):
+                self.stats["unchanged"] += 1
+                return
+            result = await route.fn(self.scraper, url, m)
+            if result is not None:
+                await self._found(found, url, route.name, result, lastmod)
+            self.state.mark(url, lastmod)
+            return
+
+        if depth and not self.state.due(url, lastmod):
+            self.stats["unchanged"] += 1
+            return
+        r = await self._fetch(url, seed)
+        if r is None:
+            return
+        html = page_text(r)
+        result = await self.scraper.parse(json_ld_posting, url, html)
+        if result is not None:
+            await self._found(found, url, "json-ld", result, lastmod)
+            self.state.mark(url, lastmod)
+            return
+        if depth >= self.max_depth:
+            return
+        site = _site(url)
+        for link in await self.scraper.parse(page_links, html, url):
+            if match_api(link)[0] is not None or (_site(link) == site and CAREERS_PATH.search(urlparse(link).path)):
+                self._push(todo, "page", link, depth + 1, "", seed)
+
+    async def _found(self, found: asyncio.Queue, url: str, strategy: str, result, lastmod: str) -> None:
+        fm_partial, description = result
+        fm = await self.scraper.parse(finish_frontmatter, fm_partial, url, description)
+        self.stats["postings"] += 1
+        await found.put({"url": url, "strategy": strategy, "frontmatter": fm,
+                         "description": description, "lastmod": lastmod})
@@ -0,0 +1,57 @@
+"""
+Read and write the frontmatter format used by jobs/*.md and seekers/*.md.
+
+Every writer in this repo (scrape-job-url.py, issue-form-to-job.js,
+issue-form-to-seeker.js) emits one `key: "value"` line per field, with
+backslashes and double quotes escaped and newlines folded to spaces. parse()
+also accepts single-quoted and bare scalars so hand-edited files still load.
+"""
+
+from pathlib import Path
+
+
+def _unquote(raw: str) -> str:
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        out, i, s = [], 0, raw[1:-1]
+        while i < len(s):
+            if s[i] == "\\" and i + 1 < len(s):
+                nxt = s[i + 1]
+                out.append({"n": "\n", "t": "\t"}.get(nxt, nxt))
+                i += 2
+            else:
+                out.append(s[i])
+                i += 1
+        return "".join(out)
+    if len(raw) >= 2 and raw[0] == raw[-1] == "'":
+        return raw[1:-1].replace("''", "'")
+    return raw
+
+
+def parse(text: str) -> tuple[dict, str]:
+    """Split a document into (frontmatter dict, body). Values are strings."""
+    if not text.startswith("---"):
+        return {}, text
+    lines = text.split("\n")
+    fm = {}
+    for i in range(1, len(lines)):
+        line = lines[i]
+        if line.rstrip() == "---":
+            return fm, "\n".join(lines[i + 1:])
+        key, sep, value = line.partition(":")
+        if sep and key.strip() and not key.startswith((" ", "#")):
+            fm[key.strip()] = _unquote(value)
+    return {}, text  # unterminated frontmatter: treat the whole file as body
+
+
+def read(path: Path) -> tuple[dict, str]:
+    return parse(Path(path).read_text(encoding="utf-8"))
+
+
+def dump(fm: dict, body: str) -> str:
+    lines = ["---"]
+    for k, v in fm.items():
+        s = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+        lines.append(f'{k}: "{s}"')
+    lines += ["---", "", body]
+    return "\n".join(lines)
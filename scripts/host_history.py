@@ -0,0 +1,102 @@
+"""
+Per-host latency and success history for the scraper's fetch strategies.
+
+For every host, each strategy ("page" for the static fetch, "jina" for the
+Jina Reader fallback) keeps an exponentially weighted mean latency of its
+successful attempts and an exponentially weighted success rate. The dispatcher
+in scrape-job-url.py uses them to decide which strategy to start first for a URL
+and how long to give it before hedging with the other one.
+
+The history is saved to .cache/http/host-history.json, next to the response
+cache, so CI runs that restore the cache keep what earlier runs learned.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+HISTORY_FILE = Path(__file__).resolve().parent.parent / ".cache" / "http" / "host-history.json"
+
+ALPHA = 0.3             # weight of the newest sample in the moving averages
+MIN_SAMPLES = 3         # below this, a host has no opinion and the defaults apply
+MAX_HOSTS = 5000        # least recently seen hosts are dropped beyond this
+JS_RENDERED_RATE = 0.2  # static success rate under which Jina goes first
+HEDGE_FACTOR = 2.0      # hedge once the static fetch takes this many times its usual latency
+
+
+class HostHistory:
+    """Thread-safe {host: {strategy: {"n", "ok", "latency"}}, "seen": t} with EWMA updates."""
+
+    def __init__(self, path: Path | None = HISTORY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict] = {}
+        self._dirty = False
+        if path is not None:
+            try:
+                self._hosts = json.loads(Path(path).read_text(encoding="utf-8")).get("hosts", {})
+            except (OSError, ValueError, AttributeError):
+                self._hosts = {}
+
+    def record(self, host: str, strategy: str, ok: bool, elapsed: float) -> None:
+        with self._lock:
+            entry = self._hosts.setdefault(host, {})
+            stats = entry.setdefault(strategy, {"n": 0, "ok": 1.0, "latency": None})
+            stats["n"] += 1
+            stats["ok"] = round((1 - ALPHA) * stats["ok"] + ALPHA * (1.0 if ok else 0.0), 4)
+            if ok:
+                prev = stats["latency"]
+                stats["latency"] = round(elapsed if prev is None else (1 - ALPHA) * prev + ALPHA * elapsed, 3)
+            entry["seen"] = int(time.time())
+            self._dirty = True
+
+    def stats(self, host: str, strategy: str) -> dict | None:
+        with self._lock:
+            stats = (self._hosts.get(host) or {}).get(strategy)
+            return dict(stats) if stats and stats["n"] >= MIN_SAMPLES else None
+
+    def first_strategy(self, host: str) -> str:
+        """"jina" for hosts whose static pages keep failing (JS-rendered), else "page"."""
+        page = self.stats(host, "page")
+        if page is not None and page["ok"] < JS_RENDERED_RATE:
+            jina = self.stats(host, "jina")
+            if jina is None or jina["ok"] >= page["ok"]:
+                return "jina"
+        return "page"
+
+    def hedge_delay(self, host: str, strategy: str, default: float, floor: float = 0.5) -> float:
+        """Seconds to let `strategy` run alone before starting the other one.
+
+        A host with a known latency gets HEDGE_FACTOR times that, so fast hosts
+        finish long before a hedge is sent; unknown hosts get the default.
+        """
+        stats = self.stats(host, strategy)
+        if stats is None or stats["latency"] is None:
+            return default
+        return max(floor, min(default, HEDGE_FACTOR * stats["latency"]))
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            hosts = self._hosts
+            if len(hosts) > MAX_HOSTS:
+                keep = sorted(hosts, key=lambda h: hosts[h].get("seen", 0), reverse=True)[:MAX_HOSTS]
+                hosts = self._hosts = {h: hosts[h] for h in keep}
+            data = json.dumps({"hosts": hosts}, sort_keys=True)
+            self._dirty = False
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".host-history.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,310 @@
+"""
+HTML extraction engine for scrape-job-url.py.
+
+scan_page() walks a parsed document once and records everything the page
+extractors need: whether there is enough visible text to bother with heuristics,
+the og:/<title>/<h1> title candidates, og:site_name, the JSON-LD blocks and the
+first element matching each content-container selector. Text is built with a
+character budget, so a 5 MB page costs no more than the characters we keep.
+
+The parser backend is lxml when it is installed (C-backed, several times faster
+on large pages) and the standard library html.parser otherwise.
+
+LdScanner finds complete application/ld+json blocks in a document that is still
+arriving, so a streamed fetch can stop as soon as a JobPosting has been seen.
+
+html_to_text() converts the HTML fragments that ATS APIs and JSON-LD carry with
+the standard library's HTMLParser, without building a tree, so API-only runs
+never import BeautifulSoup (bs4 is imported on the first make_soup()).
+"""
+
+import re
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"
+
+MAX_CHARS = 15000
+MIN_BODY_CHARS = 400       # less visible text than this: page is likely JS-rendered
+MIN_CONTAINER_CHARS = 300  # a content container must hold more than this to be used
+
+_NOISE_TAGS = ["nav", "header", "footer", "script", "style", "noscript"]
+_CONTAINER_TAGS = {"main", "article"}
+
+_LD_OPEN = re.compile(r"<script\b[^>]*application/ld\+json[^>]*>", re.I)
+_SCRIPT_CLOSE = re.compile(r"</script", re.I)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w.:-]+)""", re.I)
+
+
+def _has_class(tag, name: str) -> bool:
+    return name in (tag.get("class") or ())
+
+
+def _class_contains(tag, part: str) -> bool:
+    return part in " ".join(tag.get("class") or ())
+
+
+# Content containers in priority order; each pairs the CSS selector it stands
+# for with an equivalent predicate so all of them are checked in one walk.
+CONTENT_SELECTORS = [
+    (".job-description", lambda t: _has_class(t, "job-description")),
+    ("#job-description", lambda t: t.get("id") == "job-description"),
+    ("[class*='job-desc']", lambda t: _class_contains(t, "job-desc")),
+    ("[id*='job-desc']", lambda t: "job-desc" in (t.get("id") or "")),
+    (".posting-content", lambda t: _has_class(t, "posting-content")),
+    ("#posting-content", lambda t: t.get("id") == "posting-content"),
+    (".content-intro", lambda t: _has_class(t, "content-intro")),
+    (".jobsearch-jobDescriptionText", lambda t: _has_class(t, "jobsearch-jobDescriptionText")),
+    ("[role='main']", lambda t: t.get("role") == "main"),
+    ("main", lambda t: t.name == "main"),
+    ("article", lambda t: t.name == "article"),
+    (".content", lambda t: _has_class(t, "content")),
+    ("#content", lambda t: t.get("id") == "content"),
+]
+
+
+def make_soup(html, parser: str | None = None, only_classes=None) -> "BeautifulSoup":
+    """Parse html; with only_classes, keep just the elements carrying one of those classes.
+
+    The restricted parse (a SoupStrainer) builds the matching subtrees only, so
+    pulling a few known blocks out of a page skips building the rest of it.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    parse_only = None
+    if only_classes:
+        wanted = frozenset(only_classes)
+        # Matched on the split attribute: while parsing, bs4 may hand the
+        # strainer the raw class string rather than a list of classes.
+        parse_only = SoupStrainer(class_=lambda value: bool(value) and not wanted.isdisjoint(
+            value.split() if isinstance(value, str) else value))
+    return BeautifulSoup(html, parser or PARSER, parse_only=parse_only)
+
+
+def bounded_text(el, max_chars: int = MAX_CHARS, separator: str = "\n") -> str:
+    """el.get_text(separator, strip=True)[:max_chars], without building the rest."""
+    return _join_bounded(el.stripped_strings, max_chars, separator)
+
+
+def _join_bounded(strings, max_chars: int, separator: str) -> str:
+    parts, size = [], 0
+    strings = iter(strings)
+    for s in strings:
+        parts.append(s)
+        size += len(s) + len(separator)
+        if size >= max_chars:
+            # The separator before the next string may still fit under the cap.
+            if next(strings, None) is not None:
+                parts.append("")
+            break
+    return separator.join(parts)[:max_chars]
+
+
+class _StrippedStrings(HTMLParser):
+    """The strings BeautifulSoup's stripped_strings yields for a document, without the tree.
+
+    Text is split where tags and comments are, as it is between a tree's
+    string nodes; text inside script, style, template, rt and rp is left
+    out, and entities are resolved the way bs4's html.parser builder does.
+    (CDATA sections, which never appear in job descriptions, may come out in a
+    different order.)
+    """
+
+    _HIDDEN = {"script", "style", "template", "rt", "rp"}
+    _VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link",
+             "menuitem", "meta", "param", "source", "track", "wbr", "basefont", "bgsound",
+             "command", "frame", "image", "isindex", "nextid", "spacer"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.strings: list[str] = []
+        self._open: list[str] = []
+        self._hidden = 0   # open tags whose text is hidden
+        self._text: list[str] = []
+
+    def _flush(self) -> None:
+        if self._text:
+            s = "".join(self._text).strip()
+            self._text = []
+            if s and not self._hidden:
+                self.strings.append(s)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag not in self._VOID:
+            self._open.append(tag)
+            self._hidden += tag in self._HIDDEN
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in self._open:
+            while True:
+                name = self._open.pop()
+                self._hidden -= name in self._HIDDEN
+                if name == tag:
+                    break
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_entityref(self, name):
+        self._text.append(html5.get(name + ";", "&" + name))
+
+    def handle_charref(self, name):
+        self._text.append(unescape(f"&#{name};"))
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.startswith("CDATA[") and data[6:].strip():
+            self.strings.append(data[6:].strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def html_to_text(html: str, max_chars: int = MAX_CHARS) -> str:
+    """Strip HTML tags and return plain text (same text as bounded_text(make_soup(html)))."""
+    if not html:
+        return ""
+    parser = _StrippedStrings()
+    parser.feed(html)
+    parser.close()
+    return _join_bounded(parser.strings, max_chars, "\n")
+
+
+class Page:
+    """The result of one walk over a parsed document."""
+
+    def __init__(self, soup: "BeautifulSoup"):
+        self.soup = soup
+        self.text_chars = 0          # visible text length, counted up to MIN_BODY_CHARS
+        self.og_title = ""
+        self.og_site_name = ""
+        self.title = ""
+        self.h1 = None
+        self.ld_json: list[str] = []
+        self.containers = [None] * len(CONTENT_SELECTORS)
+
+    @property
+    def has_enough_text(self) -> bool:
+        return self.text_chars >= MIN_BODY_CHARS
+
+
+def scan_page(soup: "BeautifulSoup") -> Page:
+    from bs4 import CData, NavigableString
+
+    text_types = (NavigableString, CData)
+    page = Page(soup)
+    pending = set(range(len(CONTENT_SELECTORS)))
+    for node in soup.descendants:
+        if type(node) in text_types:
+            if page.text_chars < MIN_BODY_CHARS:
+                page.text_chars += len(node.strip())
+            continue
+        name = getattr(node, "name", None)
+        if name is None:
+            continue
+        if name == "meta":
+            prop = node.get("property")
+            if prop == "og:title" and not page.og_title and node.get("content"):
+                page.og_title = node["content"].strip()
+            elif prop == "og:site_name" and not page.og_site_name and node.get("content"):
+                page.og_site_name = node["content"].strip()
+        elif name == "title" and not page.title:
+            page.title = node.get_text(strip=True)
+        elif name == "h1" and page.h1 is None:
+            page.h1 = node
+        elif name == "script" and node.get("type") == "application/ld+json":
+            page.ld_json.append(node.string or "")
+        # Every selector needs an attribute except the bare main/article ones.
+        if pending and (node.attrs or name in _CONTAINER_TAGS):
+            for i in list(pending):
+                if CONTENT_SELECTORS[i][1](node):
+                    page.containers[i] = node
+                    pending.discard(i)
+    return page
+
+
+def main_text(page: Page, max_chars: int = MAX_CHARS) -> str:
+    """Pull the most content-rich section from a scanned page."""
+    for el in page.containers:
+        if el is not None and len(bounded_text(el, MIN_CONTAINER_CHARS + 1)) > MIN_CONTAINER_CHARS:
+            return bounded_text(el, max_chars)
+    # Last resort: strip nav/header/footer noise then dump body
+    for tag in page.soup(_NOISE_TAGS):
+        tag.decompose()
+    return bounded_text(page.soup, max_chars)
+
+
+def sniff_encoding(head: bytes, default: str = "utf-8") -> str:
+    """Return the <meta charset> declared in the first bytes of a document, or default."""
+    m = _META_CHARSET.search(head)
+    return m.group(1).decode("ascii") if m else default
+
+
+class LdScanner:
+    """Incrementally pull complete JSON-LD blocks out of HTML as it is decoded.
+
+    feed() takes the next piece of text and returns the bodies of any <script
+    type="application/ld+json"> elements that closed in it; .text is
+    everything fed so far. Only the new chunk and a short carry-over from the
+    previous one are searched, and an open block's body is collected in
+    pieces, so the work is linear in the text however it is chunked.
+    """
+
+    _OPEN_CARRY = 256                        # an opening tag may straddle chunks
+    _CLOSE_CARRY = len("</script") - 1       # so may a closing one
+
+    def __init__(self):
+        self._parts: list[str] = []     # everything fed, joined on demand
+        self._carry = ""                # unsearched end of the previous chunk
+        self._block: list[str] | None = None  # pieces of an open block's body, if any
+
+    @property
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def feed(self, chunk: str) -> list[str]:
+        self._parts.append(chunk)
+        buf = self._carry + chunk
+        pos = 0
+        blocks = []
+        while True:
+            if self._block is None:
+                m = _LD_OPEN.search(buf, pos)
+                if not m:
+                    self._carry = buf[max(pos, len(buf) - self._OPEN_CARRY):]
+                    return blocks
+                self._block = []
+                pos = m.end()
+            close = _SCRIPT_CLOSE.search(buf, pos)
+            if not close:
+                keep = max(pos, len(buf) - self._CLOSE_CARRY)
+                self._block.append(buf[pos:keep])
+                self._carry = buf[keep:]
+                return blocks
+            self._block.append(buf[pos:close.start()])
+            blocks.append("".join(self._block))
+            self._block = None
+            pos = close.end()
@@ -0,0 +1,291 @@
+"""
+On-disk HTTP response cache used by the scraper (scrape_async.py).
+
+Each entry is two files under the cache directory, named by the SHA-256 of the
+normalized request:
+  <key>.json   metadata (url, status, validators, stored_at, ttl)
+  <key>.gz     gzip-compressed response body
+
+Modes:
+  "default"  fresh entries are served from disk; stale ones are revalidated with
+             If-None-Match / If-Modified-Since and refreshed on 304
+  "refresh"  always revalidate, even when the entry is still fresh
+  "offline"  never touch the network; serve whatever is on disk regardless of
+             age and raise CacheMiss for anything else (deterministic replay)
+
+The cache is bounded by total body size; least recently used entries (by body
+file mtime, bumped on every hit) are evicted first. Entries also expire: one
+not stored or revalidated within MAX_AGE_TTLS times its ttl (and at least
+MIN_MAX_AGE) is deleted by a sweep that runs when something is stored, at most
+every SWEEP_INTERVAL. Stale entries are kept that long rather than dropped at
+their ttl because their validators still turn a refetch into a 304, and
+because offline replay serves them regardless of age; offline mode never
+sweeps.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_TTL = 6 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+MAX_AGE_TTLS = 8                # an entry expires after this many ttls without a revalidation
+MIN_MAX_AGE = 7 * 24 * 3600     # but never sooner (ttl 0 entries are revalidated on every use)
+SWEEP_INTERVAL = 3600           # seconds between two expiry sweeps in one process
+MODES = ("default", "refresh", "offline")
+
+# Query parameters that only track where a click came from; they never change
+# the posting that is served, so they are dropped from cache keys. Only named
+# click trackers (ATS referral tags, LinkedIn's trk/refId, ad and mail click
+# IDs, utm_*) are listed: generic names such as "source" or "ref" can select
+# different content on a career site or API.
+TRACKING_PARAMS = {
+    "gh_src", "lever-source", "lever-origin", "trk", "trackingid", "refid",
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid",
+}
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "retry-after")
+
+
+class CacheMiss(requests.ConnectionError):
+    """Raised in offline mode when a URL has no stored response."""
+
+
+def canonical_url(url: str) -> str:
+    """Lowercase scheme/host, drop fragment, default port and tracking params, sort the query."""
+    parsed = urlparse(url.strip())
+    scheme = (parsed.scheme or "https").lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and (scheme, parsed.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parsed.port}"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parsed.path or "/"
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
+
+def _release(resp) -> None:
+    """Hand the connection behind a response that won't be read back to its pool."""
+    release = getattr(resp, "release", None) or getattr(resp, "close", None)
+    if release is not None:
+        release()
+
+
+def _to_response(url: str, meta: dict, body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = meta.get("status", 200)
+    resp.headers = CaseInsensitiveDict(meta.get("headers") or {})
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp._content = body
+    resp._content_consumed = True  # so iter_content() replays _content
+    resp.from_cache = True
+    return resp
+
+
+class HttpCache:
+    def __init__(self, directory, mode: str = "default", max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: float = DEFAULT_TTL):
+        if mode not in MODES:
+            raise ValueError(f"unknown cache mode: {mode!r} (expected one of {', '.join(MODES)})")
+        self.dir = Path(directory)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._total = None  # total body bytes on disk, computed lazily
+        self._next_sweep = 0.0  # time.monotonic() of the next expiry sweep
+
+    # -- keys and files ------------------------------------------------------
+
+    def key(self, url: str, headers: dict | None = None) -> str:
+        vary = sorted((k.lower(), str(v)) for k, v in (headers or {}).items())
+        raw = canonical_url(url) + "\n" + json.dumps(vary)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.dir / f"{key}.json", self.dir / f"{key}.gz"
+
+    def _load(self, key: str):
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = gzip.decompress(body_path.read_bytes())
+        except (OSError, ValueError, EOFError):
+            return None, None
+        try:
+            os.utime(body_path)  # LRU: mark as recently used
+        except OSError:
+            pass
+        return meta, body
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _store(self, key: str, url: str, resp, body: bytes, ttl: float) -> dict:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "url": url,
+            "status": resp.status_code,
+            "headers": {k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers},
+            "stored_at": time.time(),
+            "ttl": ttl,
+        }
+        meta_path, body_path = self._paths(key)
+        compressed = gzip.compress(body, compresslevel=6)
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+        self._write_atomic(body_path, compressed)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            if self._total is not None:
+                self._total += len(compressed) - old_size
+        self._evict()
+        return meta
+
+    def _touch_meta(self, key: str, meta: dict) -> None:
+        meta["stored_at"] = time.time()
+        self._write_atomic(self._paths(key)[0], json.dumps(meta).encode("utf-8"))
+
+    def _expire(self) -> None:
+        """Delete entries older than max(MAX_AGE_TTLS * ttl, MIN_MAX_AGE). Called with the lock held."""
+        now = time.time()
+        for meta_path in self.dir.glob("*.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                max_age = max(MAX_AGE_TTLS * float(meta.get("ttl") or 0), MIN_MAX_AGE)
+                if now - float(meta["stored_at"]) < max_age:
+                    continue
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # unreadable metadata: the entry can't be served either
+            body_path = meta_path.with_suffix(".gz")
+            try:
+                size = body_path.stat().st_size
+            except OSError:
+                size = 0
+            body_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            if self._total is not None:
+                self._total -= size
+
+    def _evict(self) -> None:
+        with self._lock:
+            bodies = None
+            if self._total is None:
+                bodies = list(self.dir.glob("*.gz"))
+                self._total = sum(p.stat().st_size for p in bodies)
+            if self.mode != "offline" and time.monotonic() >= self._next_sweep:
+                self._expire()
+                self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+                bodies = None
+            if self._total <= self.max_bytes:
+                return
+            if bodies is None:
+                bodies = list(self.dir.glob("*.gz"))
+            entries = []
+            for p in bodies:
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+            entries.sort()
+            # Evict down to 90% so a full cache doesn't rescan on every store.
+            target = int(self.max_bytes * 0.9)
+            for _, size, p in entries:
+                if self._total <= target:
+                    break
+                p.unlink(missing_ok=True)
+                p.with_suffix(".json").unlink(missing_ok=True)
+                self._total -= size
+
+    # -- public API ----------------------------------------------------------
+
+    def _lookup(self, url: str, headers: dict | None, ttl: float):
+        """(key, meta, body, cached response to serve or None, validators for revalidation)."""
+        key = self.key(url, headers)
+        meta, body = self._load(key)
+
+        if self.mode == "offline":
+            if meta is None:
+                raise CacheMiss(f"not in cache (offline mode): {url}")
+            return key, meta, body, _to_response(url, meta, body), {}
+
+        if meta is not None and self.mode == "default" and time.time() - meta["stored_at"] < ttl:
+            return key, meta, body, _to_response(url, meta, body), {}
+
+        validators = {}
+        if meta is not None:
+            cached_headers = CaseInsensitiveDict(meta.get("headers") or {})
+            if cached_headers.get("etag"):
+                validators["If-None-Match"] = cached_headers["etag"]
+            if cached_headers.get("last-modified"):
+                validators["If-Modified-Since"] = cached_headers["last-modified"]
+        return key, meta, body, None, validators
+
+    def _finish(self, key: str, url: str, meta, body, resp, ttl: float, store: bool):
+        if resp.status_code == 304 and meta is not None:
+            meta["ttl"] = ttl
+            self._touch_meta(key, meta)
+            return _to_response(url, meta, body)
+        if resp.status_code == 200 and store:
+            self._store(key, url, resp, resp.content, ttl)
+        return resp
+
+    def get(self, url: str, fetch, headers: dict | None = None, ttl: float | None = None,
+            store: bool = True):
+        """Return a response for url, from disk when possible.
+
+        fetch(extra_headers) performs the real GET; extra_headers carries the
+        conditional validators when a stale entry is being revalidated. Only 200
+        responses are stored; anything else is passed through untouched.
+
+        With store=False a fresh network response is returned unread (e.g. still
+        streaming) and the caller decides whether to put() its body afterwards.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        key, meta, body, hit, validators = self._lookup(url, headers, ttl)
+        if hit is not None:
+            return hit
+        resp = fetch(validators)
+        if resp.status_code == 304 and meta is not None:
+            _release(resp)  # the cached copy is served instead
+        return self._finish(key, url, meta, body, resp, ttl, store)
+
+    async def get_async(self, url: str, fetch, headers: dict | None = None, ttl: float | None = None,
+                        store: bool = True):
+        """get() for a coroutine function fetch; disk reads and writes run in a worker thread."""
+        ttl = self.default_ttl if ttl is None else ttl
+        key, meta, body, hit, validators = await asyncio.to_thread(self._lookup, url, headers, ttl)
+        if hit is not None:
+            return hit
+        resp = await fetch(validators)
+        if resp.status_code == 304 and meta is not None:
+            _release(resp)  # here, not in the worker thread: aiohttp responses belong to the loop
+        return await asyncio.to_thread(self._finish, key, url, meta, body, resp, ttl, store)
+
+    def put(self, url: str, resp, body: bytes, headers: dict | None = None,
+            ttl: float | None = None) -> None:
+        """Store a complete body read from resp (a 200 fetched with store=False)."""
+        if resp.status_code == 200 and not getattr(resp, "from_cache", False):
+            self._store(self.key(url, headers), url, resp, body,
+                        self.default_ttl if ttl is None else ttl)
@@ -0,0 +1,199 @@
+"""
+Static artifacts for the job pages, written next to data/jobs.json by
+build_data.py:
+
+  data/jobs/index.json                   entry point: count, page size and the
+                                         current file names (the only file that
+                                         is not content-hashed; fetch with no-cache)
+  data/jobs/summary.<hash>.json          every job's id, title, organization,
+                                         location, type and created_at
+  data/jobs/page-<n>.<hash>.json         the same rows in fixed-size pages
+  data/jobs/detail/<id>.<hash>.json      the full record of one job, for job.html
+  data/jobs/search.<hash>.json, search/  inverted index (see search_index.py)
+  data/jobs/facets.<hash>.json           facet counts and postings
+
+Summary rows carry the normalized job_type, location and organization_name
+(see job_facets.py), the derived workplace and country facets, and a stable
+document number ("doc") that the search index and facet tables refer to.
+
+Pages are ordered oldest first, so a new posting only changes the last page;
+the listing reads pages from the end. Every hashed file is immutable, so it can
+be cached forever; a file is only written if a file with that name does not
+exist yet, and files no longer referenced are removed once index.json points
+at their replacements.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import job_facets
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+ARTIFACTS_DIR = ROOT_DIR / "data" / "jobs"
+DETAIL_DIR = "detail"
+PAGE_SIZE = 100
+META_VERSION = 2    # bump when summary rows change shape, so every job is re-summarized
+FORMAT_VERSION = 2  # bump when any published file changes shape, so everything is republished
+
+
+def compact_json(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def content_name(stem: str, data: bytes) -> str:
+    return f"{stem}.{hashlib.blake2b(data, digest_size=6).hexdigest()}.json"
+
+
+def write_once(path: Path, data: bytes) -> None:
+    """Write a content-addressed file unless it is already there."""
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def record_meta(record: dict, previous: dict | None = None, out_dir: Path = ARTIFACTS_DIR) -> dict:
+    """Write the detail file for one job record; return its summary row.
+
+    previous is the row this job had in the last build; its document number
+    is a hint only, publish() settles it against the published summary.
+    """
+    data = compact_json(record)
+    name = content_name(record["id"], data)
+    write_once(out_dir / DETAIL_DIR / name, data)
+    location = record.get("location") or ""
+    return {
+        "id": record["id"],
+        "title": record.get("title"),
+        "organization_name": job_facets.organization(record.get("organization_name")),
+        "location": job_facets.location(location) or None,
+        "job_type": job_facets.job_type(record.get("job_type")),
+        "workplace": job_facets.workplace(location) or None,
+        "country": job_facets.country(location) or None,
+        "created_at": record.get("created_at"),
+        "detail": f"{DETAIL_DIR}/{name}",
+        "doc": (previous or {}).get("doc"),
+    }
+
+
+def is_published(out_dir: Path = ARTIFACTS_DIR) -> bool:
+    """True if index.json exists and was written by this version of the code."""
+    try:
+        index = json.loads((out_dir / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return index.get("format") == FORMAT_VERSION
+
+
+def published_rows(out_dir: Path = ARTIFACTS_DIR, index: dict | None = None) -> dict[str, dict] | None:
+    """{id: summary row} as currently published, or None if there is no readable summary."""
+    if index is None:
+        try:
+            index = json.loads((out_dir / "index.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+    if not index.get("summary") or index.get("format") != FORMAT_VERSION:
+        return None
+    try:
+        summary = json.loads((out_dir / index["summary"]).read_text(encoding="utf-8"))
+        return {row["id"]: row for row in summary["jobs"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def publish(rows: list[dict], out_dir: Path = ARTIFACTS_DIR, page_size: int = PAGE_SIZE) -> bool:
+    """Write summary, pages, search index, facets and index.json for rows.
+
+    Document numbers and the search index changes are taken from the summary
+    that is currently published, not from the build manifest: the published
+    files are committed, the manifest is only a local cache, and the search
+    shards must be patched against the numbers they were built with. Without
+    a published summary, numbers are handed out afresh and the index is
+    rebuilt in full. Returns True if index.json changed.
+    """
+    # Imported here: search_index uses the helpers above.
+    import search_index
+
+    index_path = out_dir / "index.json"
+    try:
+        previous = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+
+    published = published_rows(out_dir, previous)
+    changes = None
+    if published is not None:
+        for row in rows:
+            row["doc"] = (published.get(row["id"]) or {}).get("doc")
+        current = {row["id"] for row in rows}
+        changes = [(published.get(row["id"]), row) for row in rows
+                   if published.get(row["id"]) != row]
+        changes += [(old, None) for job_id, old in published.items() if job_id not in current]
+    else:
+        for row in rows:
+            row["doc"] = None
+
+    next_doc = max((r["doc"] for r in rows if r.get("doc") is not None), default=-1) + 1
+    for row in rows:
+        if row.get("doc") is None:
+            row["doc"] = next_doc
+            next_doc += 1
+
+    rows = sorted(rows, key=lambda r: (r.get("created_at") or "", r["id"]))
+    keep = set()
+
+    summary = compact_json({"jobs": rows})
+    summary_name = content_name("summary", summary)
+    write_once(out_dir / summary_name, summary)
+    keep.add(summary_name)
+
+    pages = []
+    for n, start in enumerate(range(0, len(rows), page_size)):
+        data = compact_json({"page": n, "jobs": rows[start:start + page_size]})
+        name = content_name(f"page-{n:04d}", data)
+        write_once(out_dir / name, data)
+        pages.append(name)
+        keep.add(name)
+    keep.update(r["detail"] for r in rows)
+
+    search_name, search_files = search_index.update(out_dir, rows, changes, previous.get("search"))
+    keep |= search_files
+    facets_name = search_index.publish_facets(out_dir, rows)
+    keep.add(facets_name)
+
+    index = json.dumps({
+        "format": FORMAT_VERSION,
+        "count": len(rows),
+        "page_size": page_size,
+        "order": "oldest-first",
+        "summary": summary_name,
+        "pages": pages,
+        "search": search_name,
+        "facets": facets_name,
+    }, indent=2).encode("utf-8") + b"\n"
+    changed = json.dumps(previous, indent=2).encode("utf-8") + b"\n" != index
+    if changed:
+        index_path.unlink(missing_ok=True)
+        write_once(index_path, index)
+
+    # Old generations go only after index.json stops referring to them.
+    for sub in ("", DETAIL_DIR, search_index.SEARCH_DIR):
+        folder = out_dir / sub
+        if not folder.is_dir():
+            continue
+        for entry in os.scandir(folder):
+            rel = f"{sub}/{entry.name}" if sub else entry.name
+            if entry.name.endswith(".json") and rel != "index.json" and rel not in keep:
+                os.unlink(entry.path)
+    return changed
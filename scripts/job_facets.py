@@ -0,0 +1,155 @@
+"""
+Canonical facet values for job listings.
+
+Job files get their job_type, location and organization_name from many places:
+issue forms ("Full-time"), Lever categories ("Full Time"), JSON-LD
+employmentType ("FULL_TIME", ["FULL_TIME", "CONTRACTOR"]) and free-text page
+scrapes. The listing filters on these, so they are mapped onto a small fixed
+vocabulary here, both when the scraper writes a file and when the search index
+is built.
+"""
+
+import re
+import unicodedata
+
+JOB_TYPES = ("full-time", "part-time", "contract", "internship", "temporary", "volunteer")
+DEFAULT_JOB_TYPE = "full-time"
+
+# Lowercased raw value with runs of space/_/- collapsed to "-" -> canonical type.
+_JOB_TYPE_ALIASES = {
+    "full-time": "full-time", "fulltime": "full-time", "full": "full-time", "permanent": "full-time",
+    "regular": "full-time", "ft": "full-time", "employee": "full-time",
+    "part-time": "part-time", "parttime": "part-time", "part": "part-time", "pt": "part-time",
+    "contract": "contract", "contractor": "contract", "freelance": "contract", "freelancer": "contract",
+    "consultant": "contract", "fixed-term": "contract", "contract-to-hire": "contract",
+    "internship": "internship", "intern": "internship", "trainee": "internship", "apprenticeship": "internship",
+    "temporary": "temporary", "temp": "temporary", "seasonal": "temporary", "per-diem": "temporary",
+    "volunteer": "volunteer",
+}
+
+WORKPLACES = ("remote", "hybrid", "on-site")
+
+_COUNTRY_ALIASES = {
+    "us": "United States", "usa": "United States", "u.s.": "United States", "u.s.a.": "United States",
+    "united states of america": "United States", "united states": "United States",
+    "uk": "United Kingdom", "gb": "United Kingdom", "u.k.": "United Kingdom", "great britain": "United Kingdom",
+    "england": "United Kingdom", "scotland": "United Kingdom", "wales": "United Kingdom",
+    "united kingdom": "United Kingdom",
+    "deutschland": "Germany", "fr": "France",
+    "nl": "Netherlands", "the netherlands": "Netherlands", "es": "Spain", "ie": "Ireland",
+    "au": "Australia", "br": "Brazil", "sg": "Singapore", "jp": "Japan", "pl": "Poland",
+    "pt": "Portugal", "se": "Sweden", "ch": "Switzerland", "mx": "Mexico",
+    "ae": "United Arab Emirates", "uae": "United Arab Emirates",
+}
+# After a comma, a two-letter code is far more often a US state than a country
+# ("San Francisco, CA", "Chicago, IL"), so these are read as states; CA, DE, IN
+# and IL are deliberately not country aliases.
+_US_STATES = {
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "dc", "fl", "ga", "hi", "id", "il", "in", "ia",
+    "ks", "ky", "la", "me", "md", "ma", "mi", "mn", "ms", "mo", "mt", "ne", "nv", "nh", "nj", "nm",
+    "ny", "nc", "nd", "oh", "ok", "or", "pa", "ri", "sc", "sd", "tn", "tx", "ut", "vt", "va", "wa",
+    "wv", "wi", "wy",
+}
+_KNOWN_COUNTRIES = set(_COUNTRY_ALIASES.values()) | {
+    "Argentina", "Austria", "Belgium", "Canada", "Chile", "China", "Colombia", "Czech Republic", "Denmark",
+    "Egypt", "Estonia", "Finland", "Germany", "Greece", "Hong Kong", "Hungary", "India", "Indonesia",
+    "Israel", "Italy", "Kenya",
+    "Lithuania", "Malaysia", "New Zealand", "Nigeria", "Norway", "Pakistan", "Philippines", "Romania",
+    "South Africa", "South Korea", "Taiwan", "Thailand", "Turkey", "Ukraine", "Vietnam",
+}
+_COUNTRY_BY_LOWER = {c.lower(): c for c in _KNOWN_COUNTRIES}
+
+_REMOTE = re.compile(r"\b(remote|anywhere|work from home|wfh|distributed|telecommute)\b", re.I)
+_HYBRID = re.compile(r"\bhybrid\b", re.I)
+_WORKPLACE_WORDS = re.compile(
+    r"[\(\[]?\b(remote|anywhere|work from home|wfh|distributed|telecommute|hybrid|on-?site|in-?office)\b[\)\]]?",
+    re.I,
+)
+_ORG_SUFFIX = re.compile(
+    r"[\s,]+(inc|inc\.|incorporated|llc|l\.l\.c\.|ltd|ltd\.|limited|gmbh|corp|corp\.|corporation"
+    r"|co\.|plc|s\.a\.|sa|ag|bv|b\.v\.|pty ltd|pvt\.? ltd\.?)$",
+    re.I,
+)
+_SPACE = re.compile(r"\s+")
+
+
+def _clean(value) -> str:
+    return _SPACE.sub(" ", unicodedata.normalize("NFKC", str(value or ""))).strip()
+
+
+def job_type(raw) -> str:
+    """Canonical job type for a raw value (a string or a JSON-LD list); the first recognised one wins."""
+    values = raw if isinstance(raw, (list, tuple)) else re.split(r"[,/;|]| or ", str(raw or ""))
+    for value in values:
+        key = re.sub(r"[\s_-]+", "-", _clean(value).lower()).strip("-")
+        if key in _JOB_TYPE_ALIASES:
+            return _JOB_TYPE_ALIASES[key]
+        for word in key.split("-"):
+            if word in _JOB_TYPE_ALIASES and word not in ("full", "part"):
+                return _JOB_TYPE_ALIASES[word]
+    return DEFAULT_JOB_TYPE
+
+
+def workplace(raw) -> str:
+    """remote, hybrid or on-site, from the free-text location."""
+    text = _clean(raw)
+    if _HYBRID.search(text):
+        return "hybrid"
+    if _REMOTE.search(text):
+        return "remote"
+    return "on-site" if text else ""
+
+
+def _place(text: str) -> str:
+    """A location with the remote/hybrid/on-site wording taken out."""
+    return _SPACE.sub(" ", _WORKPLACE_WORDS.sub(" ", text)).strip(" ,-–/|:")
+
+
+def country(raw) -> str:
+    """Country named at the end of a location ("Pune, Maharashtra, India" -> "India"), or "".
+
+    A US state code ("Austin, TX") counts as the United States.
+    """
+    for part in reversed([p.strip(" .()-–") for p in re.split(r"[,;|/]", _place(_clean(raw)))]):
+        lowered = part.lower()
+        if lowered in _US_STATES:
+            return "United States"
+        if lowered in _COUNTRY_ALIASES:
+            return _COUNTRY_ALIASES[lowered]
+        if lowered in _COUNTRY_BY_LOWER:
+            return _COUNTRY_BY_LOWER[lowered]
+    return ""
+
+
+def location(raw) -> str:
+    """Display form of a location: whitespace and repeated parts collapsed, country spelled out.
+
+    Only a trailing part that names a country is spelled out ("Berlin, DE" is
+    not: DE is read as Delaware); a state code is left as written.
+    """
+    text = _clean(raw)
+    if not text:
+        return ""
+    parts, seen = [], set()
+    for part in _place(text).split(","):
+        part = part.strip(" -–")
+        if part.startswith("(") and part.endswith(")"):
+            part = part[1:-1].strip()
+        key = part.lower()
+        if part and key not in seen:
+            seen.add(key)
+            parts.append(part)
+    if parts and parts[-1].lower() not in _US_STATES and country(parts[-1]):
+        parts[-1] = country(parts[-1])
+    place = ", ".join(parts)
+    kind = workplace(text)
+    if kind in ("remote", "hybrid"):
+        return f"{kind.capitalize()} ({place})" if place else kind.capitalize()
+    return place or text
+
+
+def organization(raw) -> str:
+    """Organization name without legal suffixes or stray whitespace ("Acme, Inc." -> "Acme")."""
+    name = _clean(raw)
+    stripped = _ORG_SUFFIX.sub("", name).strip(" ,")
+    return stripped or name
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Duplicate detection for jobs/*.md.
+
+Two checks, both backed by data/job-index.json:
+  - posting_key(): a canonical key for an application URL (tracking params
+    stripped, host/scheme normalized, ATS posting IDs extracted), so a posting
+    that is already listed is recognised before anything is fetched.
+  - simhash(): a 64-bit SimHash over word 3-shingles of the description, so
+    the same posting re-listed under a different URL is caught after extraction.
+    Fingerprints are banded (4 x 16 bits), so finding every entry within
+    Hamming distance 3 is a few dict lookups, not a scan of the corpus.
+
+The index is kept in step with jobs/ by sync(): only files that are new or whose
+mtime changed are read, and of those only files whose content digest changed
+are re-parsed (a fresh checkout touches every mtime but no content). Entries for
+deleted files are dropped. The committed index holds only content (key, aliases,
+simhash, digest); the mtimes behind the fast path live in .cache/job-index/,
+which is not committed, so rerunning on a fresh clone leaves the index as is.
+
+Usage:
+  job_index.py --rebuild     re-read every job file and rewrite the index
+  job_index.py --report      list postings that share a URL key or near-identical text
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import frontmatter
+from http_cache import canonical_url
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+JOBS_DIR = ROOT_DIR / "jobs"
+INDEX_FILE = ROOT_DIR / "data" / "job-index.json"
+STAT_FILE = ROOT_DIR / ".cache" / "job-index" / "mtimes.json"
+
+NEAR_DUPLICATE_DISTANCE = 3
+MIN_FINGERPRINT_TOKENS = 40  # shorter texts (e.g. "See full listing at: …") are not fingerprinted
+_BANDS = 4
+_BAND_BITS = 64 // _BANDS
+
+_WORD = re.compile(r"\w+")
+_GREENHOUSE_HOST = re.compile(r"(^|\.)greenhouse\.io$")
+_GREENHOUSE_PATH = re.compile(r"/[^/]+/jobs/(\d+)")
+_LEVER_PATH = re.compile(r"/[^/]+/([0-9a-f-]{36})", re.I)
+_LINKEDIN_PATH = re.compile(r"/(?:comm/)?jobs/view/(?:[^/]*-)?(\d+)")
+_WORKABLE_PATH = re.compile(r"/[^/]+/j/([0-9A-Za-z]+)")
+
+
+# ---------------------------------------------------------------------------
+# Keys and fingerprints
+# ---------------------------------------------------------------------------
+
+def posting_key(url: str) -> str:
+    """Canonical identity of the posting behind an application URL."""
+    parsed = urlparse(canonical_url(url))
+    host = parsed.netloc.removeprefix("www.")
+    query = parse_qs(parsed.query)
+
+    if "gh_jid" in query:  # Greenhouse embed on a company careers page
+        return f"greenhouse:{query['gh_jid'][0]}"
+    if _GREENHOUSE_HOST.search(host):
+        m = _GREENHOUSE_PATH.match(parsed.path)
+        if m:
+            return f"greenhouse:{m.group(1)}"
+        if "token" in query:  # /embed/job_app?for=<company>&token=<id>
+            return f"greenhouse:{query['token'][0]}"
+    if host == "jobs.lever.co":
+        m = _LEVER_PATH.match(parsed.path)
+        if m:
+            return f"lever:{m.group(1).lower()}"
+    if host.endswith("linkedin.com"):
+        m = _LINKEDIN_PATH.match(parsed.path)
+        if m:
+            return f"linkedin:{m.group(1)}"
+        if "currentJobId" in query:
+            return f"linkedin:{query['currentJobId'][0]}"
+    if host.endswith("indeed.com") and "jk" in query:
+        return f"indeed:{query['jk'][0]}"
+    if host == "apply.workable.com":
+        m = _WORKABLE_PATH.match(parsed.path)
+        if m:
+            return f"workable:{m.group(1)}"
+
+    path = parsed.path.rstrip("/") or "/"
+    return f"https://{host}{path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def simhash(text: str) -> int | None:
+    """64-bit SimHash of the text's word 3-shingles, or None if the text is too short."""
+    words = _WORD.findall(text.lower())
+    if len(words) < MIN_FINGERPRINT_TOKENS:
+        return None
+    weights = [0] * 64
+    for i in range(len(words) - 2):
+        shingle = " ".join(words[i:i + 3]).encode("utf-8")
+        h = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def _bands(fp: int):
+    mask = (1 << _BAND_BITS) - 1
+    for b in range(_BANDS):
+        yield b, (fp >> (b * _BAND_BITS)) & mask
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def _read_json(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class JobIndex:
+    def __init__(self, path: Path = INDEX_FILE, jobs_dir: Path = JOBS_DIR, stat_path: Path = STAT_FILE):
+        self.path = Path(path)
+        self.jobs_dir = Path(jobs_dir)
+        self.stat_path = Path(stat_path)
+        self._lock = threading.RLock()
+        self._files: dict[str, dict] = {}      # file name -> {"key", "aliases", "simhash", "digest"}
+        self._mtimes: dict[str, int] = {}      # file name -> mtime when its digest was last checked
+        self._by_key: dict[str, str] = {}      # posting key -> file name
+        self._by_band: dict[tuple, set] = {}   # (band, value) -> file names
+        self._dirty = False
+        self._stat_dirty = False
+
+    # -- persistence ---------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: Path = INDEX_FILE, jobs_dir: Path = JOBS_DIR, stat_path: Path = STAT_FILE) -> "JobIndex":
+        index = cls(path, jobs_dir, stat_path)
+        data = _read_json(index.path)
+        for name, entry in (data.get("files") or {}).items():
+            entry.pop("mtime", None)  # written by older versions
+            index._link(name, entry)
+        index._mtimes = {name: mtime for name, mtime in _read_json(index.stat_path).items()
+                         if name in index._files}
+        index.sync()
+        return index
+
+    def save(self) -> None:
+        with self._lock:
+            if self._dirty:
+                _write_json(self.path, {"files": dict(sorted(self._files.items()))})
+                self._dirty = False
+            if self._stat_dirty:
+                _write_json(self.stat_path, self._mtimes)
+                self._stat_dirty = False
+
+    def sync(self) -> None:
+        """Pick up job files added, changed or removed since the index was written."""
+        with self._lock:
+            seen = set()
+            for entry in os.scandir(self.jobs_dir) if self.jobs_dir.is_dir() else ():
+                name = entry.name
+                if not name.endswith(".md") or name == "README.md":
+                    continue
+                seen.add(name)
+                mtime = int(entry.stat().st_mtime)
+                known = self._files.get(name)
+                if known is not None and self._mtimes.get(name) == mtime:
+                    continue
+                data = Path(entry.path).read_bytes()
+                digest = _digest(data)
+                if known is not None and known.get("digest") == digest:
+                    self._mtimes[name] = mtime
+                    self._stat_dirty = True
+                    continue
+                fm, body = frontmatter.parse(data.decode("utf-8", errors="replace"))
+                self.add(Path(entry.path), fm.get("application_url", ""), body,
+                         aliases=known.get("aliases", []) if known else [], digest=digest)
+            for name in set(self._files) - seen:
+                self.remove(name)
+
+    # -- bookkeeping ---------------------------------------------------------
+
+    def _link(self, name: str, entry: dict) -> None:
+        entry.setdefault("aliases", [])
+        self._files[name] = entry
+        for key in [entry.get("key")] + entry.get("aliases", []):
+            if key:
+                self._by_key.setdefault(key, name)
+        if entry.get("simhash"):
+            fp = int(entry["simhash"], 16)
+            for band in _bands(fp):
+                self._by_band.setdefault(band, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            if self._mtimes.pop(name, None) is not None:
+                self._stat_dirty = True
+            entry = self._files.pop(name, None)
+            if entry is None:
+                return
+            for key in [entry.get("key")] + entry.get("aliases", []):
+                if key and self._by_key.get(key) == name:
+                    del self._by_key[key]
+            if entry.get("simhash"):
+                for band in _bands(int(entry["simhash"], 16)):
+                    self._by_band.get(band, set()).discard(name)
+            self._dirty = True
+
+    def add(self, path: Path, application_url: str, description: str, aliases=(),
+            digest: str | None = None) -> None:
+        """Record (or re-record) a job file under its URL key and text fingerprint."""
+        path = Path(path)
+        with self._lock:
+            self.remove(path.name)
+            fp = simhash(description)
+            try:
+                mtime = int(path.stat().st_mtime)
+                digest = digest or _digest(path.read_bytes())
+            except OSError:
+                mtime, digest = 0, ""
+            self._link(path.name, {
+                "key": posting_key(application_url) if application_url else "",
+                "aliases": list(aliases),
+                "simhash": f"{fp:016x}" if fp is not None else "",
+                "digest": digest,
+            })
+            if mtime:
+                self._mtimes[path.name] = mtime
+                self._stat_dirty = True
+            self._dirty = True
+
+    def add_alias(self, name: str, url: str) -> None:
+        """Point another URL at an existing job file (a merged near-duplicate)."""
+        key = posting_key(url)
+        with self._lock:
+            entry = self._files.get(name)
+            if entry is None or key == entry["key"] or key in entry["aliases"]:
+                return
+            entry["aliases"].append(key)
+            self._by_key.setdefault(key, name)
+            self._dirty = True
+
+    # -- lookups -------------------------------------------------------------
+
+    def lookup_url(self, url: str) -> Path | None:
+        """Job file already listing this posting, if any."""
+        name = self._by_key.get(posting_key(url))
+        return self.jobs_dir / name if name else None
+
+    def near_duplicates(self, description: str, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        """[(path, distance)] of indexed jobs whose text is within max_distance bits."""
+        fp = simhash(description)
+        if fp is None:
+            return []
+        candidates = set()
+        for band in _bands(fp):
+            candidates |= self._by_band.get(band, set())
+        found = []
+        for name in candidates:
+            distance = bin(fp ^ int(self._files[name]["simhash"], 16)).count("1")
+            if distance <= max_distance:
+                found.append((self.jobs_dir / name, distance))
+        return sorted(found, key=lambda item: item[1])
+
+    def duplicate_groups(self) -> list[list[str]]:
+        """Groups of file names that share a URL key or near-identical text."""
+        parent = {name: name for name in self._files}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        by_key: dict[str, str] = {}
+        for name, entry in self._files.items():
+            if entry["key"]:
+                other = by_key.setdefault(entry["key"], name)
+                parent[find(name)] = find(other)
+        for members in self._by_band.values():
+            members = sorted(members)
+            for i, a in enumerate(members):
+                fa = int(self._files[a]["simhash"], 16)
+                for b in members[i + 1:]:
+                    if bin(fa ^ int(self._files[b]["simhash"], 16)).count("1") <= NEAR_DUPLICATE_DISTANCE:
+                        parent[find(a)] = find(b)
+        groups: dict[str, list[str]] = {}
+        for name in self._files:
+            groups.setdefault(find(name), []).append(name)
+        return sorted(sorted(g) for g in groups.values() if len(g) > 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain data/job-index.json")
+    parser.add_argument("--rebuild", action="store_true", help="re-read every job file")
+    parser.add_argument("--report", action="store_true", help="list duplicate postings")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        INDEX_FILE.unlink(missing_ok=True)
+    index = JobIndex.load()
+    index.save()
+    if args.report:
+        groups = index.duplicate_groups()
+        for group in groups:
+            print("  ".join(group))
+        sys.exit(1 if groups else 0)
+
+
+if __name__ == "__main__":
+    main()
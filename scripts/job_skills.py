@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Skill and requirement extraction for job postings and seeker profiles.
+
+The dictionary in skills.txt (languages, frameworks, cloud, security terms,
+certifications, ...) is compiled once into an Aho-Corasick automaton over word
+tokens, so a document is tokenized with one regex and scanned in a single pass
+however many terms the dictionary holds. Overlapping matches resolve to the
+longest term ("Spring Boot" over "Spring", "SOC 2" over "SOC"), and a skill
+whose name is part of another skill found in the same text is left out
+("OWASP" next to "OWASP Top 10"). Skills marked "?" in the dictionary (DNS,
+Oracle Cloud, ...) are too generic to stand alone: they are kept only when
+the text also names an unmarked skill of the same category.
+
+For a job, annotate() fills two frontmatter fields:
+  skills        canonical names, most mentioned first ("Python, AWS, OWASP Top 10")
+  requirements  the same terms grouped by category
+                ("Languages: Python; Cloud & DevOps: AWS; Security: OWASP Top 10")
+Existing values are kept unless overwrite is set, so hand-written requirements
+from the issue form are never replaced.
+
+scrape-job-url.py runs this on every scraped posting. Run it directly to
+backfill files that are already in the repo:
+
+Usage:
+  job_skills.py                    fill empty skills/requirements in jobs/*.md
+  job_skills.py --seekers          also fill empty skills in seekers/*.md
+  job_skills.py --overwrite        recompute the fields even when already set
+  job_skills.py FILE ...           only these files
+  job_skills.py --dry-run          report what would change, write nothing
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+
+import frontmatter
+from search_index import fold
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+JOBS_DIR = ROOT_DIR / "jobs"
+SEEKERS_DIR = ROOT_DIR / "seekers"
+DICTIONARY_FILE = Path(__file__).resolve().parent / "skills.txt"
+
+MAX_SKILLS = 25
+SEEKER_FIELDS = ("headline", "skills", "experience_summary", "availability")
+
+# A word, optionally with a leading dot (.NET), trailing +/# (C++, C#) and
+# inner dots (Node.js, ASP.NET). Other punctuation separates words.
+_TOKEN = re.compile(r"\.?[^\W_][\w+#]*(?:\.[^\W_][\w+#]*)*")
+
+
+class _Folded(dict):
+    """token -> folded token, computed once per distinct token."""
+
+    def __missing__(self, token):
+        value = self[token] = fold(token)
+        return value
+
+
+_folded = _Folded()
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text or "")
+
+
+# ---------------------------------------------------------------------------
+# Automaton
+# ---------------------------------------------------------------------------
+
+class SkillMatcher:
+    """Aho-Corasick automaton over folded word tokens."""
+
+    def __init__(self, entries):
+        """entries: (category, canonical name, [terms], needs context); a term starting with "=" is case-sensitive."""
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[int]] = [[]]
+        # pattern id -> (skill id, length in tokens, exact tokens or None)
+        self.patterns: list[tuple[int, int, tuple | None]] = []
+        self.skills: list[tuple[str, str]] = []  # skill id -> (category, canonical name)
+        self.categories: list[str] = []          # in dictionary order
+        self.needs_context: set[int] = set()
+        self._name_tokens: list[tuple[str, ...]] = []
+        for category, name, terms, needs_context in entries:
+            skill = len(self.skills)
+            self.skills.append((category, name))
+            self._name_tokens.append(tuple(_folded[t] for t in tokenize(name)))
+            if needs_context:
+                self.needs_context.add(skill)
+            if category not in self.categories:
+                self.categories.append(category)
+            for term in terms:
+                exact = term.startswith("=")
+                tokens = tokenize(term[1:] if exact else term)
+                if tokens:
+                    self._add(tokens, skill, tuple(tokens) if exact else None)
+        self._link()
+
+    def _add(self, tokens: list[str], skill: int, exact) -> None:
+        state = 0
+        for token in tokens:
+            token = _folded[token]
+            nxt = self.goto[state].get(token)
+            if nxt is None:
+                nxt = self.goto[state][token] = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(len(self.patterns))
+        self.patterns.append((skill, len(tokens), exact))
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each state's output includes its suffixes' outputs."""
+        queue = deque(self.goto[0].values())  # depth 1 keeps fail = root
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and token not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(token, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text: str) -> list[tuple[int, int, int]]:
+        """Non-overlapping (start token, end token, skill id) matches, longest first at each overlap."""
+        tokens = tokenize(text)
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        found = []
+        state = 0
+        for end, token in enumerate(map(_folded.__getitem__, tokens)):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pid in out[state]:
+                skill, length, exact = patterns[pid]
+                start = end - length + 1
+                if exact is None or tuple(tokens[start:end + 1]) == exact:
+                    found.append((start, end, skill))
+        # Leftmost-longest: at each start keep the longest term, then skip what it covers.
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        chosen, last_end = [], -1
+        for start, end, skill in found:
+            if start > last_end:
+                chosen.append((start, end, skill))
+                last_end = end
+        return chosen
+
+    def extract(self, text: str, limit: int = MAX_SKILLS) -> list[tuple[str, str]]:
+        """(category, name) of the skills in text, most mentioned first, then by first mention."""
+        counts: dict[int, list] = {}
+        for start, _, skill in self.scan(text):
+            if skill in counts:
+                counts[skill][0] += 1
+            else:
+                counts[skill] = [1, start]
+        for skill in [s for s in counts if self._redundant(s, counts)]:
+            del counts[skill]
+        ranked = sorted(counts, key=lambda s: (-counts[s][0], counts[s][1]))
+        return [self.skills[s] for s in ranked[:limit]]
+
+    def _redundant(self, skill: int, found) -> bool:
+        """True if skill is part of a longer found skill's name, or lacks the context it needs."""
+        name = self._name_tokens[skill]
+        n = len(name)
+        for other in found:
+            longer = self._name_tokens[other]
+            if len(longer) > n and any(longer[i:i + n] == name for i in range(len(longer) - n + 1)):
+                return True
+        if skill not in self.needs_context:
+            return False
+        category = self.skills[skill][0]
+        return not any(self.skills[o][0] == category and o not in self.needs_context for o in found)
+
+
+def load_dictionary(path: Path = DICTIONARY_FILE) -> list[tuple[str, str, list[str], bool]]:
+    entries, category = [], ""
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            category = line[1:-1].strip()
+            continue
+        terms = [t.strip() for t in line.split("|") if t.strip()]
+        needs_context = terms[0].startswith("?")
+        if needs_context:
+            terms[0] = terms[0][1:]
+        name = terms[0].lstrip("!=")
+        if terms[0].startswith("!"):
+            terms = terms[1:]
+        entries.append((category, name, terms, needs_context))
+    return entries
+
+
+_matcher: SkillMatcher | None = None
+
+
+def get_matcher() -> SkillMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_dictionary())
+    return _matcher
+
+
+# ---------------------------------------------------------------------------
+# Frontmatter fields
+# ---------------------------------------------------------------------------
+
+def skills_field(found: list[tuple[str, str]]) -> str:
+    return ", ".join(name for _, name in found)
+
+
+def requirements_field(found: list[tuple[str, str]]) -> str:
+    by_category: dict[str, list[str]] = {}
+    for category, name in found:
+        by_category.setdefault(category, []).append(name)
+    order = get_matcher().categories
+    groups = sorted(by_category.items(), key=lambda kv: order.index(kv[0]) if kv[0] in order else len(order))
+    return "; ".join(f"{category}: {', '.join(names)}" for category, names in groups)
+
+
+def annotate(fm: dict, description: str, overwrite: bool = False) -> bool:
+    """Fill fm["skills"] and fm["requirements"] from a job's text; True if fm changed."""
+    text = "\n".join([fm.get("title") or "", description or ""])
+    # The employer is named all over its own postings; it is not a skill.
+    org = fold(str(fm.get("organization_name") or ""))
+    found = [(c, name) for c, name in get_matcher().extract(text) if fold(name) != org]
+    changed = False
+    for field, value in (("skills", skills_field(found)), ("requirements", requirements_field(found))):
+        if (overwrite or not str(fm.get(field) or "").strip()) and str(fm.get(field) or "") != value:
+            fm[field] = value
+            changed = True
+    return changed
+
+
+def annotate_seeker(fm: dict, about: str, overwrite: bool = False) -> bool:
+    """Fill an empty fm["skills"] from the rest of a seeker's profile; True if fm changed."""
+    if str(fm.get("skills") or "").strip() and not overwrite:
+        return False
+    text = "\n".join([*(str(fm.get(f) or "") for f in SEEKER_FIELDS), about or ""])
+    value = skills_field(get_matcher().extract(text))
+    if not value or value == fm.get("skills"):
+        return False
+    fm["skills"] = value
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Batch backfill
+# ---------------------------------------------------------------------------
+
+def _with_field_after(fm: dict, field: str, after: str) -> dict:
+    """fm with field placed right after `after` if it is new (keeps files tidy)."""
+    if field in fm or after not in fm:
+        return fm
+    out = {}
+    for k, v in fm.items():
+        out[k] = v
+        if k == after:
+            out[field] = ""
+    return out
+
+
+def _write(path: Path, fm: dict, body: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(frontmatter.dump(fm, body))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def process_file(path: Path, seeker: bool = False, overwrite: bool = False, dry_run: bool = False) -> dict | None:
+    """Annotate one file in place; returns the new field values if it changed."""
+    fm, body = frontmatter.read(path)
+    if not fm:
+        return None
+    if seeker:
+        changed = annotate_seeker(fm, body, overwrite)
+        fields = ("skills",)
+    else:
+        fm = _with_field_after(fm, "skills", "requirements")
+        changed = annotate(fm, body, overwrite)
+        fields = ("skills", "requirements")
+    if not changed:
+        return None
+    if not dry_run:
+        _write(path, fm, body.lstrip("\n"))
+    return {f: fm.get(f) for f in fields}
+
+
+def _files(directory: Path) -> list[Path]:
+    return sorted(p for p in directory.glob("*.md") if p.name != "README.md")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill skills and requirements from job and profile text")
+    parser.add_argument("files", nargs="*", help="job or seeker files (default: every file in jobs/)")
+    parser.add_argument("--seekers", action="store_true", help="also fill empty skills in seekers/*.md")
+    parser.add_argument("--overwrite", action="store_true", help="recompute fields that already have a value")
+    parser.add_argument("--dry-run", action="store_true", help="print changes without writing files")
+    args = parser.parse_args()
+
+    targets = [(Path(f), Path(f).resolve().parent == SEEKERS_DIR) for f in args.files]
+    if not targets:
+        targets = [(p, False) for p in _files(JOBS_DIR)]
+        if args.seekers:
+            targets += [(p, True) for p in _files(SEEKERS_DIR)]
+
+    changed = 0
+    for path, seeker in targets:
+        result = process_file(path, seeker, args.overwrite, args.dry_run)
+        if result is not None:
+            changed += 1
+            print(json.dumps({"path": str(path), **result}, ensure_ascii=False))
+    verb = "would change" if args.dry_run else "changed"
+    print(f"{len(targets)} files scanned, {changed} {verb}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Link-health checks for listed postings: finds closed postings and postings
+whose content changed since they were scraped.
+
+Each jobs/*.md file's application_url is checked in the cheapest way that
+answers "still open, and still the same?":
+  - postings on an ATS with a per-posting API (Greenhouse, Lever, Workable,
+    SmartRecruiters, Recruitee, LinkedIn's guest API) are checked there. A
+    404 or 410 from the API means the requisition is closed;
+  - Ashby only serves whole boards, fetched once per company per run; a
+    posting missing from its board is closed;
+  - any other posting is checked with a GET of the page itself. A 404 or 410
+    there only counts once it has been seen GONE_CONFIRMATIONS times in a row
+    (rechecked after RECHECK_GONE), since career sites fail in odd ways.
+
+Every check is a conditional GET through the scraper's response cache (ttl 0:
+always revalidated), so an unchanged posting whose host sends validators costs
+a 304 with no body. Otherwise the answer is reduced to a digest and compared
+with the one recorded at the last check: for an API the JSON it returned, for
+a page the posting extracted from it (title, location, salary, description),
+never the page's raw text, whose counters, widgets and tokens differ on every
+load. Pages are streamed with the scraper's size cap and stop at the first
+JSON-LD JobPosting. Only postings whose digest changed are re-extracted.
+Requests go through the scraper, so its per-host limits, rate limits, retries
+and circuit breakers all apply.
+
+The schedule is adaptive and kept in data/link-health.json, per job file: the
+digest, when it was last checked, when it is next due and how many checks in
+a row found it unchanged. A posting is rechecked after MIN_INTERVAL, doubling
+with every unchanged check up to MAX_INTERVAL, and never later than
+AGE_FRACTION of its age allows, so new postings are watched closely and old,
+stable ones rarely. A change resets the interval; errors back off from
+RETRY_INTERVAL. Closed postings are not checked again. The first check of a
+posting only records its digest.
+
+Used by scrape-job-url.py --check-links, which writes the results:
+  checker = LinkChecker(scraper, LinkState())
+  async for result in checker.check_many(checker.due(postings)):
+      ...   # {"file", "url", "status", "frontmatter", "description", "error"}
+  checker.state.save()
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from scrape_async import (
+    ASHBY_BOARD_API,
+    LINKEDIN_GUEST_API,
+    LINKEDIN_HEADERS,
+    SMARTRECRUITERS_API,
+    WORKABLE_API,
+    AsyncScraper,
+    _content_version,
+    _result_from_ld_block,
+    greenhouse_api_base,
+    jina_placeholder,
+    linkedin_job_id,
+    match_api,
+    parse_linkedin_posting,
+    run_page_extractors,
+    stream_page,
+)
+
+STATE_FILE = Path(__file__).resolve().parent.parent / "data" / "link-health.json"
+
+DEFAULT_WORKERS = 32
+
+MIN_INTERVAL = 24 * 3600          # first recheck, and after a change
+MAX_INTERVAL = 14 * 24 * 3600     # longest gap between two checks of an open posting
+AGE_FRACTION = 0.25               # never wait longer than this share of the posting's age
+RETRY_INTERVAL = 6 * 3600         # after a failed check; doubles with every failure in a row
+RECHECK_GONE = 6 * 3600           # a page answering 404/410 is asked again after this long
+GONE_CONFIRMATIONS = 2            # 404/410 page answers in a row before it counts as closed
+JITTER = 0.1                      # +-10% on every interval, so checks don't bunch up
+
+GONE_STATUSES = frozenset({404, 410})
+
+
+def now_iso(now: float | None = None) -> str:
+    """created_at-style UTC timestamp; expires_at of a posting found closed."""
+    now = time.time() if now is None else now
+    return datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_time(value: str) -> float | None:
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def _posting_digest(posting: tuple[dict, str] | None) -> str:
+    """Digest of the fields an extracted (frontmatter, description) posting is listed with."""
+    fm, description = posting or ({}, "")
+    fields = [fm.get(k) or "" for k in ("title", "location", "salary_range")] + [description or ""]
+    return _digest("\0".join(fields).encode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Schedule
+# ---------------------------------------------------------------------------
+
+def next_interval(streak: int, age: float) -> float:
+    """Seconds until the next check of an open posting seen unchanged `streak` times in a row."""
+    interval = min(MAX_INTERVAL, MIN_INTERVAL * 2 ** min(streak, 16), max(MIN_INTERVAL, age * AGE_FRACTION))
+    return interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+class LinkState:
+    """{file name: {"url", "digest", "checked", "next", "streak", "gone", "failures", "status"}},
+    saved to data/link-health.json."""
+
+    def __init__(self, path: Path | None = STATE_FILE):
+        self.path = path
+        self._files: dict[str, dict] = {}
+        self._dirty = False
+        if path is not None:
+            try:
+                self._files = json.loads(Path(path).read_text(encoding="utf-8")).get("files", {})
+            except (OSError, ValueError, AttributeError):
+                self._files = {}
+
+    def get(self, name: str, url: str) -> dict | None:
+        """The entry for a job file, or None if it was never checked at this URL."""
+        entry = self._files.get(name)
+        return entry if entry is not None and entry.get("url") == url else None
+
+    def due_at(self, name: str, url: str) -> float:
+        """When the posting is next due (0: never checked); inf once it is closed."""
+        entry = self.get(name, url)
+        if entry is None:
+            return 0.0
+        if entry.get("status") == "closed":
+            return float("inf")
+        return entry.get("next", 0)
+
+    def record(self, name: str, url: str, status: str, now: float, created: float | None,
+               digest: str | None = None) -> None:
+        """Update a posting's entry after a check and schedule the next one."""
+        entry = self.get(name, url) or {"url": url, "digest": None, "streak": 0, "gone": 0, "failures": 0}
+        entry["checked"] = int(now)
+        entry["status"] = status
+        if status != "error":
+            entry["failures"] = 0
+        if status != "missing":
+            entry["gone"] = 0
+        if digest is not None:
+            entry["digest"] = digest
+
+        age = now - created if created is not None else 0.0
+        if status == "closed":
+            entry["next"] = None
+        elif status == "missing":
+            entry["gone"] += 1
+            entry["next"] = int(now + RECHECK_GONE)
+        elif status == "error":
+            entry["failures"] += 1
+            entry["next"] = int(now + min(MAX_INTERVAL, RETRY_INTERVAL * 2 ** (entry["failures"] - 1)))
+        else:
+            entry["streak"] = entry["streak"] + 1 if status == "unchanged" else 0
+            entry["next"] = int(now + next_interval(entry["streak"], age))
+        self._files[name] = entry
+        self._dirty = True
+
+    def gone_count(self, name: str, url: str) -> int:
+        entry = self.get(name, url)
+        return entry.get("gone", 0) if entry else 0
+
+    def prune(self, names) -> None:
+        """Forget job files that are gone or no longer open."""
+        keep = set(names)
+        stale = [name for name in self._files if name not in keep]
+        for name in stale:
+            del self._files[name]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".link-health.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"files": dict(sorted(self._files.items()))}, f, indent=1)
+                f.write("\n")
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._dirty = False
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+def check_target(url: str) -> tuple[str, str, dict | None]:
+    """(how, what, headers) to check a posting: ("api", API URL), ("ashby", board key) or ("page", url)."""
+    route, m = match_api(url)
+    name = route.name if route is not None else None
+    host = urlparse(url).netloc.lower()
+    if name == "greenhouse":
+        return "api", f"{greenhouse_api_base(host)}/{m['company']}/jobs/{m['job_id']}", None
+    if name == "lever":
+        return "api", f"https://api.lever.co/v0/postings/{m['company']}/{m['posting_id']}", None
+    if name == "workable":
+        return "api", f"{WORKABLE_API}/v3/accounts/{m['company']}/jobs/{m['job_id']}", None
+    if name == "smartrecruiters":
+        return "api", f"{SMARTRECRUITERS_API}/{m['company']}/postings/{m['job_id']}", None
+    if name == "recruitee":
+        return "api", f"https://{host.split('.')[0]}.recruitee.com/api/offers/{m['slug']}", None
+    if name == "ashby":
+        return "ashby", f"{m['company']}\n{m['job_id'].lower()}", None
+    if name == "linkedin" and linkedin_job_id(url):
+        return "api", f"{LINKEDIN_GUEST_API}/{linkedin_job_id(url)}", LINKEDIN_HEADERS
+    return "page", url, None
+
+
+class LinkChecker:
+    """Checks postings with one scraper and schedules them in a LinkState."""
+
+    def __init__(self, scraper: AsyncScraper, state: LinkState | None = None, workers: int = DEFAULT_WORKERS):
+        self.scraper = scraper
+        self.state = state if state is not None else LinkState()
+        self.workers = max(1, workers)
+        self.stats = {"checked": 0, "unchanged": 0, "new": 0, "changed": 0, "missing": 0, "closed": 0, "error": 0}
+        self._boards: dict[str, asyncio.Future] = {}
+
+    def due(self, postings, now: float | None = None, limit: int | None = None, everything: bool = False) -> list:
+        """The postings [(file name, url, created_at)] to check now, most overdue first, at most limit.
+
+        everything=True ignores the schedule (closed postings still stay
+        closed). Files no longer among postings (deleted or expired) are
+        forgotten.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for name, url, created in postings:
+            at = self.state.due_at(name, url)
+            if at != float("inf") and (everything or at <= now):
+                due.append((at, name, url, created))
+        self.state.prune(name for name, _, _ in postings)
+        due.sort(key=lambda d: (d[0], d[1]))
+        return [d[1:] for d in due[:limit]]
+
+    async def _ashby_jobs(self, company: str) -> dict:
+        """{job id: job} on a company's Ashby board, fetched once per run."""
+        board = self._boards.get(company)
+        if board is None:
+            async def fetch():
+                r = await self.scraper.get(f"{ASHBY_BOARD_API}/{company}?includeCompensation=true",
+                                           kind="api", ttl=0)
+                r.raise_for_status()
+                jobs = (await self.scraper.parse(r.json)).get("jobs") or []
+                return {str(job.get("id", "")).lower(): job for job in jobs}
+
+            board = self._boards[company] = asyncio.ensure_future(fetch())
+        return await asyncio.shield(board)
+
+    async def _probe(self, name: str, url: str) -> tuple[str, str | None]:
+        """(status, digest): "open" with the answer's digest, "missing" or "closed"."""
+        how, what, headers = check_target(url)
+        if how == "ashby":
+            company, job_id = what.split("\n")
+            job = (await self._ashby_jobs(company)).get(job_id)
+            return ("closed", None) if job is None else ("open", _content_version(job))
+
+        if how == "page":
+            try:
+                kind, found = await stream_page(
+                    self.scraper, what, ttl=0,
+                    on_ld=lambda block: self.scraper.parse(_result_from_ld_block, what, block),
+                )
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code not in GONE_STATUSES:
+                    raise
+                if self.state.gone_count(name, url) + 1 >= GONE_CONFIRMATIONS:
+                    return "closed", None
+                return "missing", None
+            if kind == "text":
+                found = await self.scraper.parse(run_page_extractors, what, found)
+                found = found and found[1]
+            return "open", _posting_digest(found)
+
+        r = await self.scraper.get(what, kind="api", headers=headers, ttl=0)
+        if r.status_code in GONE_STATUSES:
+            return "closed", None
+        r.raise_for_status()
+        entry = self.state.get(name, url)
+        if getattr(r, "from_cache", False) and entry is not None and entry.get("digest"):
+            return "open", entry["digest"]  # 304: the cached answer, already digested
+        if "json" in r.headers.get("content-type", ""):
+            return "open", _content_version(await self.scraper.parse(r.json))
+        # LinkedIn's guest API answers with an HTML fragment: digest the posting in it.
+        return "open", _posting_digest(await self.scraper.parse(parse_linkedin_posting, r.text, url))
+
+    async def check(self, name: str, url: str, created: float | None = None, now: float | None = None) -> dict:
+        """Check one posting, re-extracting it if it changed, and record the result.
+
+        Returns {"file", "url", "status", "frontmatter", "description", "error"};
+        status is "new" (first check), "unchanged", "changed" (frontmatter and
+        description hold the re-extracted posting), "missing" (a page answered
+        404/410, not yet confirmed), "closed" or "error".
+        """
+        now = time.time() if now is None else now
+        result = {"file": name, "url": url, "status": None, "frontmatter": None, "description": None,
+                  "error": None}
+        digest = None
+        try:
+            status, digest = await self._probe(name, url)
+            if status == "open":
+                entry = self.state.get(name, url)
+                if entry is None or not entry.get("digest"):
+                    status = "new"
+                elif entry["digest"] == digest:
+                    status = "unchanged"
+                else:
+                    status = "changed"
+                    strategy, fm, description = await self.scraper.scrape(url)
+                    if strategy == "jina" and description == jina_placeholder(url)[1]:
+                        raise ValueError("the posting changed but could not be re-extracted")
+                    result["frontmatter"], result["description"] = fm, description
+        except Exception as e:
+            status = "error"
+            digest = None
+            result["error"] = str(e) or e.__class__.__name__
+        result["status"] = status
+        self.state.record(name, url, status, now, created, digest)
+        self.stats["checked"] += 1
+        self.stats[status] += 1
+        return result
+
+    async def check_many(self, postings):
+        """Check postings [(file name, url, created_at)], at most `workers` at a time.
+
+        Yields one result dict (see check) per posting as it finishes.
+        """
+        todo = iter(postings)
+        running: set[asyncio.Task] = set()
+
+        def start() -> bool:
+            item = next(todo, None)
+            if item is None:
+                return False
+            name, url, created = item
+            running.add(asyncio.ensure_future(self.check(name, url, parse_time(created) if created else None)))
+            return True
+
+        try:
+            while len(running) < self.workers and start():
+                pass
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    running.discard(task)
+                    yield task.result()
+                    start()
+        finally:
+            for task in (*running, *self._boards.values()):
+                task.cancel()
+            await asyncio.gather(*running, *self._boards.values(), return_exceptions=True)
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Seeker <-> job matching, published as static files under data/matches/.
+
+Both sides are turned into hashed TF-IDF vectors in one shared feature space:
+word unigrams and bigrams are hashed (crc32) into FEATURES buckets, so there is
+no vocabulary to rebuild when documents are added. Term frequencies are
+sublinear (1 + log tf), weighted by IDF over both corpora and L2-normalized, so
+a sparse matrix product gives cosine similarity for every seeker/job pair.
+
+Scores are computed in batches of seeker rows (one sparse product per batch),
+and the top-k jobs per seeker and top-k seekers per job are taken from each
+batch with argpartition; nothing loops over pairs.
+
+Updates are incremental. Term-frequency rows are cached in .cache/build/matching/
+and only recomputed for documents whose content changed. IDF is frozen between
+full rebuilds (until the corpus has grown or shrunk by IDF_DRIFT), which keeps
+every unchanged pair's score stable, so:
+  - a changed seeker, or one whose top-k held a changed or removed job, is
+    re-scored against all jobs;
+  - every other seeker is scored against the changed jobs only and merged into
+    its existing top-k;
+and the same the other way round.
+
+Jobs are read from data/jobs/ (see job_artifacts.py; detail file names change
+with their content) and seekers from data/seekers.json, so run build_data.py
+first. Requires numpy and scipy.
+
+Published files:
+  data/matches/index.json                  k, bucket count, current file names
+  data/matches/seekers-<n>.<hash>.json     {seeker id: [[job id, score, title], ...]}
+  data/matches/jobs-<n>.<hash>.json        {job id: [[seeker id, score, name], ...]}
+An id lives in bucket fnv1a32(id) % buckets.
+
+Usage:
+  match_seekers.py           update matches for whatever changed
+  match_seekers.py --full    recompute IDF and every match
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:
+    print("pip install numpy scipy", file=sys.stderr)
+    sys.exit(1)
+
+from job_artifacts import ARTIFACTS_DIR, compact_json, content_name, write_once
+from search_index import STOPWORDS, fold
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SEEKERS_FILE = ROOT_DIR / "data" / "seekers.json"
+OUT_DIR = ROOT_DIR / "data" / "matches"
+STATE_DIR = ROOT_DIR / ".cache" / "build" / "matching"
+
+FEATURES = 1 << 18
+TOP_K = 10
+MIN_SCORE = 0.05
+MAX_TERMS = 128        # features kept per document; the rest barely move a cosine
+IDF_DRIFT = 0.10        # rebuild everything once the corpus size moved this much
+BATCH_ROWS = 1024
+ROWS_PER_BUCKET = 200
+FORMAT_VERSION = 1
+
+_TERM = re.compile(r"[^\W_]+")
+
+
+# ---------------------------------------------------------------------------
+# Text and features
+# ---------------------------------------------------------------------------
+
+def job_text(record: dict) -> str:
+    title = record.get("title") or ""
+    return "\n".join([title, title, record.get("requirements") or "", record.get("description") or ""])
+
+
+def seeker_text(record: dict) -> str:
+    fields = ["headline", "headline", "skills", "skills", "experience_summary", "availability", "about"]
+    return "\n".join(str(record.get(f) or "") for f in fields)
+
+
+class _WordHashes(dict):
+    """word -> crc32, or -1 for words that are not features; filled on first sight."""
+
+    def __missing__(self, word):
+        h = self[word] = -1 if len(word) < 2 or word in STOPWORDS else zlib.crc32(word.encode("utf-8"))
+        return h
+
+
+_word_hashes = _WordHashes()
+
+
+def features(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """(feature indices, sublinear tf weights) for one document."""
+    hashed = np.fromiter(map(_word_hashes.__getitem__, _TERM.findall(fold(text))), np.int64)
+    hashed = hashed[hashed >= 0].astype(np.uint64)
+    if not len(hashed):
+        return np.zeros(0, np.int32), np.zeros(0, np.float32)
+    # A bigram hashes to a mix of its two word hashes, so it costs no string work.
+    bigrams = (hashed[:-1] * np.uint64(0x9E3779B1) ^ (hashed[1:] + np.uint64(0x7F4A7C15))) >> np.uint64(7)
+    idx, counts = np.unique(np.concatenate([hashed, bigrams]) & np.uint64(FEATURES - 1), return_counts=True)
+    return idx.astype(np.int32), (1.0 + np.log(counts)).astype(np.float32)
+
+
+def _rows_to_csr(rows: list[tuple[np.ndarray, np.ndarray]]) -> sp.csr_matrix:
+    indptr = np.zeros(len(rows) + 1, np.int64)
+    indptr[1:] = np.cumsum([len(r[0]) for r in rows])
+    indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, np.int32)
+    data = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0, np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(rows), FEATURES), dtype=np.float32)
+
+
+def _key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Corpus: cached tf rows per document
+# ---------------------------------------------------------------------------
+
+class Corpus:
+    """Documents of one side with their tf rows and weighted vectors.
+
+    update() re-vectorizes changed documents only; unchanged rows keep their
+    order and changed or new ones are appended, so weigh() can limit itself to
+    the tail while IDF is frozen.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ids: list[str] = []
+        self.keys: list[str] = []
+        self.tf = sp.csr_matrix((0, FEATURES), dtype=np.float32)
+        self.vec = self.tf
+        self.fresh = 0  # rows at the end that have no weighted vector yet
+
+    def load(self, state: dict) -> None:
+        side = state.get(self.name) or {}
+        try:
+            tf = sp.load_npz(STATE_DIR / f"{self.name}-tf.npz").tocsr()
+            vec = sp.load_npz(STATE_DIR / f"{self.name}-vec.npz").tocsr()
+        except (OSError, ValueError):
+            return
+        if side and tf.shape == vec.shape == (len(side["ids"]), FEATURES):
+            self.ids, self.keys, self.tf, self.vec = side["ids"], side["keys"], tf, vec
+
+    def save(self, state: dict) -> None:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        sp.save_npz(STATE_DIR / f"{self.name}-tf.npz", self.tf, compressed=False)
+        sp.save_npz(STATE_DIR / f"{self.name}-vec.npz", self.vec, compressed=False)
+        state[self.name] = {"ids": self.ids, "keys": self.keys}
+
+    def update(self, docs: dict[str, tuple[str, callable]]) -> tuple[set, set]:
+        """docs: id -> (content key, text thunk). Returns (changed or added ids, removed ids)."""
+        kept = [i for i, (doc_id, key) in enumerate(zip(self.ids, self.keys))
+                if doc_id in docs and docs[doc_id][0] == key]
+        kept_ids = {self.ids[i] for i in kept}
+        removed = set(self.ids) - set(docs)
+        changed = sorted(set(docs) - kept_ids)
+        if len(kept) == len(self.ids) and not changed:
+            return set(), set()
+        rows = _rows_to_csr([features(docs[doc_id][1]()) for doc_id in changed])
+        self.tf = sp.vstack([self.tf[kept], rows], format="csr")
+        self.vec = self.vec[kept]
+        self.fresh = len(changed)
+        self.ids = [self.ids[i] for i in kept] + changed
+        self.keys = [self.keys[i] for i in kept] + [docs[doc_id][0] for doc_id in changed]
+        return set(changed), removed
+
+    def weigh(self, idf: np.ndarray, everything: bool = False) -> None:
+        if everything:
+            self.vec = _weighted(self.tf, idf)
+        elif self.fresh:
+            self.vec = sp.vstack([self.vec, _weighted(self.tf[-self.fresh:], idf)], format="csr")
+        self.fresh = 0
+
+
+def _weighted(tf: sp.csr_matrix, idf: np.ndarray) -> sp.csr_matrix:
+    """tf-idf rows, cut to their MAX_TERMS heaviest features and L2-normalized."""
+    x = tf.multiply(idf).tocsr().astype(np.float32)
+    x.sort_indices()
+    lengths = np.diff(x.indptr)
+    if lengths.max(initial=0) > MAX_TERMS:
+        keep = np.ones(x.nnz, bool)
+        for row in np.flatnonzero(lengths > MAX_TERMS):
+            start, end = x.indptr[row], x.indptr[row + 1]
+            drop = np.argpartition(x.data[start:end], end - start - MAX_TERMS)[:end - start - MAX_TERMS]
+            keep[start + drop] = False
+        x = sp.csr_matrix((x.data[keep], x.indices[keep], np.concatenate([[0], np.cumsum(
+            np.minimum(lengths, MAX_TERMS))])), shape=x.shape)
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.diags(1.0 / norms).dot(x).tocsr()
+
+
+def compute_idf(*tfs: sp.csr_matrix) -> tuple[np.ndarray, int]:
+    df = np.zeros(FEATURES, np.float64)
+    n = 0
+    for tf in tfs:
+        df += np.bincount(tf.indices, minlength=FEATURES)
+        n += tf.shape[0]
+    return np.log((1.0 + n) / (1.0 + df)).astype(np.float32) + 1.0, n
+
+
+# ---------------------------------------------------------------------------
+# Top-k
+# ---------------------------------------------------------------------------
+
+def _top_k(block: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per row of a dense block: (column indices, scores) of the k largest, best first."""
+    k = min(k, block.shape[1])
+    if k == 0:
+        empty = np.zeros((block.shape[0], 0))
+        return empty.astype(np.int64), empty
+    idx = np.argpartition(-block, k - 1, axis=1)[:, :k]
+    vals = np.take_along_axis(block, idx, axis=1)
+    order = np.argsort(-vals, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(vals, order, axis=1)
+
+
+def _lists(idx: np.ndarray, vals: np.ndarray, names: list[str]) -> list[list]:
+    return [
+        [[names[j], round(float(v), 3)] for j, v in zip(row_idx, row_vals) if v >= MIN_SCORE]
+        for row_idx, row_vals in zip(idx, vals)
+    ]
+
+
+def score_all(a: sp.csr_matrix, b: sp.csr_matrix, a_names, b_names, k: int = TOP_K):
+    """Top-k of b for every row of a, and of a for every row of b, from batched products a @ b.T."""
+    bt = b.T.tocsr()
+    a_top = []
+    col_idx = np.zeros((b.shape[0], 0), np.int64)
+    col_val = np.zeros((b.shape[0], 0), np.float32)
+    for start in range(0, a.shape[0], BATCH_ROWS):
+        block = (a[start:start + BATCH_ROWS] @ bt).toarray()
+        idx, vals = _top_k(block, k)
+        a_top += _lists(idx, vals, b_names)
+        # Columns: best rows within this batch, merged with the running best.
+        idx, vals = _top_k(block.T, k)
+        col_idx, col_val = _top_k_merge(col_idx, col_val, idx + start, vals, k)
+    return a_top, _lists(col_idx, col_val, a_names)
+
+
+def _top_k_merge(idx_a, val_a, idx_b, val_b, k):
+    idx = np.concatenate([idx_a, idx_b], axis=1)
+    vals = np.concatenate([val_a, val_b], axis=1)
+    pick, vals = _top_k(vals, k)
+    return np.take_along_axis(idx, pick, axis=1), vals
+
+
+def merge_lists(old: list, new: list, k: int = TOP_K) -> list:
+    best = {name: score for name, score in old}
+    for name, score in new:
+        best[name] = max(score, best.get(name, 0.0))
+    return [[n, s] for n, s in sorted(best.items(), key=lambda x: (-x[1], x[0]))[:k]]
+
+
+# ---------------------------------------------------------------------------
+# Update
+# ---------------------------------------------------------------------------
+
+def _job_docs() -> tuple[dict, dict]:
+    """(id -> (content key, text thunk), id -> title) for every published job."""
+    index = json.loads((ARTIFACTS_DIR / "index.json").read_text(encoding="utf-8"))
+    rows = json.loads((ARTIFACTS_DIR / index["summary"]).read_text(encoding="utf-8"))["jobs"]
+
+    def text(row):
+        return lambda: job_text(json.loads((ARTIFACTS_DIR / row["detail"]).read_text(encoding="utf-8")))
+    # The detail file name carries the record's content hash.
+    return {row["id"]: (row["detail"], text(row)) for row in rows}, {row["id"]: row.get("title") for row in rows}
+
+
+def _seeker_docs() -> tuple[dict, dict]:
+    """(id -> (content key, text thunk), id -> name) for every seeker."""
+    try:
+        seekers = json.loads(SEEKERS_FILE.read_text(encoding="utf-8")).get("seekers") or []
+    except (OSError, ValueError):
+        seekers = []
+    docs = {}
+    for s in seekers:
+        text = seeker_text(s)
+        # The name is published next to matches, so renaming counts as a change too.
+        docs[s["id"]] = (_key(f"{s.get('name')}\n{text}"), lambda text=text: text)
+    return docs, {s["id"]: s.get("name") for s in seekers}
+
+
+def _rescore(rows_of, names, other, other_names, subset, against=None):
+    """Top-k lists of `other` for the named rows, optionally only against some columns."""
+    pos = {n: i for i, n in enumerate(names)}
+    rows = rows_of[[pos[n] for n in subset]] if subset else rows_of[:0]
+    if against is not None:
+        opos = {n: i for i, n in enumerate(other_names)}
+        cols = [opos[n] for n in against]
+        other, other_names = other[cols], [other_names[c] for c in cols]
+    if not subset or other.shape[0] == 0:
+        return {n: [] for n in subset}
+    top, _ = score_all(rows, other, list(subset), other_names)
+    return dict(zip(subset, top))
+
+
+def update(full: bool = False) -> dict:
+    t0 = time.time()
+    try:
+        state = json.loads((STATE_DIR / "state.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    if state.get("format") != FORMAT_VERSION:
+        state, full = {}, True
+
+    jobs, seekers = Corpus("jobs"), Corpus("seekers")
+    if not full:
+        jobs.load(state)
+        seekers.load(state)
+    job_docs, job_titles = _job_docs()
+    seeker_docs, seeker_names = _seeker_docs()
+    changed_j, removed_j = jobs.update(job_docs)
+    changed_s, removed_s = seekers.update(seeker_docs)
+
+    n = len(jobs.ids) + len(seekers.ids)
+    idf_n = state.get("idf_n") or 0
+    idf_path = STATE_DIR / "idf.npy"
+    if full or not idf_path.exists() or not idf_n or abs(n - idf_n) > IDF_DRIFT * idf_n:
+        full = True
+        idf, idf_n = compute_idf(jobs.tf, seekers.tf)
+    else:
+        idf = np.load(idf_path)
+
+    if not full and not (changed_j or removed_j or changed_s or removed_s) and _is_published():
+        return {"full": False, "jobs": len(jobs.ids), "seekers": len(seekers.ids), "unchanged": True,
+                "elapsed": round(time.time() - t0, 2)}
+    jobs.weigh(idf, everything=full)
+    seekers.weigh(idf, everything=full)
+    J, S = jobs.vec, seekers.vec
+    if full:
+        s_top, j_top = score_all(S, J, seekers.ids, jobs.ids)
+        seeker_top, job_top = dict(zip(seekers.ids, s_top)), dict(zip(jobs.ids, j_top))
+        rescored = (len(seekers.ids), len(jobs.ids))
+    else:
+        seeker_top, job_top = state.get("seeker_top") or {}, state.get("job_top") or {}
+        touched_j, touched_s = changed_j | removed_j, changed_s | removed_s
+        live_s, live_j = set(seekers.ids), set(jobs.ids)
+
+        full_s = sorted(s for s in live_s if s in changed_s or any(j in touched_j for j, _ in seeker_top.get(s, [])))
+        full_j = sorted(j for j in live_j if j in changed_j or any(s in touched_s for s, _ in job_top.get(j, [])))
+        rest_s = sorted(live_s - set(full_s))
+        rest_j = sorted(live_j - set(full_j))
+
+        new_seeker_top = _rescore(S, seekers.ids, J, jobs.ids, full_s)
+        new_job_top = _rescore(J, jobs.ids, S, seekers.ids, full_j)
+        if changed_j:
+            extra = _rescore(S, seekers.ids, J, jobs.ids, rest_s, against=sorted(changed_j))
+            for s in rest_s:
+                new_seeker_top[s] = merge_lists(seeker_top.get(s, []), extra[s])
+        else:
+            new_seeker_top.update({s: seeker_top.get(s, []) for s in rest_s})
+        if changed_s:
+            extra = _rescore(J, jobs.ids, S, seekers.ids, rest_j, against=sorted(changed_s))
+            for j in rest_j:
+                new_job_top[j] = merge_lists(job_top.get(j, []), extra[j])
+        else:
+            new_job_top.update({j: job_top.get(j, []) for j in rest_j})
+        seeker_top, job_top = new_seeker_top, new_job_top
+        rescored = (len(full_s), len(full_j))
+
+    jobs.save(state)
+    seekers.save(state)
+    np.save(idf_path, idf)
+    state.update(format=FORMAT_VERSION, idf_n=idf_n, seeker_top=seeker_top, job_top=job_top)
+    (STATE_DIR / "state.json").write_text(json.dumps(state), encoding="utf-8")
+    publish(seeker_top, job_top, job_titles, seeker_names)
+    return {
+        "full": full,
+        "jobs": len(jobs.ids), "seekers": len(seekers.ids),
+        "changed_jobs": len(changed_j | removed_j), "changed_seekers": len(changed_s | removed_s),
+        "rescored_seekers": rescored[0], "rescored_jobs": rescored[1],
+        "elapsed": round(time.time() - t0, 2),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _is_published(out_dir: Path = OUT_DIR) -> bool:
+    try:
+        index = json.loads((out_dir / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return index.get("format") == FORMAT_VERSION and all(
+        (out_dir / name).exists() for name in index["seekers"] + index["jobs"])
+
+
+def fnv1a32(text: str) -> int:
+    h = 0x811C9DC5
+    for byte in text.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def publish(seeker_top: dict, job_top: dict, job_titles: dict, seeker_names: dict,
+            out_dir: Path = OUT_DIR) -> None:
+    """Write the bucket files and index.json; each entry is [other id, score, its title or name]."""
+    n = max(len(seeker_top), len(job_top))
+    buckets = 1 << max(0, math.ceil(math.log2(max(1, n / ROWS_PER_BUCKET))))
+    index = {"format": FORMAT_VERSION, "k": TOP_K, "buckets": buckets}
+    keep = {"index.json"}
+    for side, top, labels in (("seekers", seeker_top, job_titles), ("jobs", job_top, seeker_names)):
+        split = [{} for _ in range(buckets)]
+        for doc_id in sorted(top):
+            split[fnv1a32(doc_id) % buckets][doc_id] = [[other, score, labels.get(other)]
+                                                        for other, score in top[doc_id]]
+        names = []
+        for b, part in enumerate(split):
+            data = compact_json(part)
+            name = content_name(f"{side}-{b}", data)
+            write_once(out_dir / name, data)
+            names.append(name)
+        index[side] = names
+        keep.update(names)
+
+    data = json.dumps(index, indent=2).encode("utf-8") + b"\n"
+    index_path = out_dir / "index.json"
+    if not index_path.exists() or index_path.read_bytes() != data:
+        index_path.unlink(missing_ok=True)
+        write_once(index_path, data)
+    for path in out_dir.glob("*.json"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match seekers to jobs into data/matches/")
+    parser.add_argument("--full", action="store_true", help="recompute IDF and every match")
+    args = parser.parse_args()
+    try:
+        stats = update(args.full)
+    except FileNotFoundError as e:
+        print(f"Missing build output ({e.filename}); run scripts/build_data.py first", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Retries, rate limits and circuit breaking for the scrapers' HTTP requests.
+
+Guard.call(host, strategy, send) wraps one logical request:
+  - a token bucket per host spaces requests out (RATE_LIMITS). The buckets are
+    shared by every thread in the process, so a batch run stays within each
+    host's budget however many workers it has;
+  - connection errors, timeouts, 429 and 5xx responses are retried with
+    full-jitter exponential backoff, or after Retry-After when the server sends
+    one. A 429's Retry-After also pauses the host's bucket for every thread;
+  - a circuit breaker per (host, strategy) opens after BREAKER_THRESHOLD
+    failed requests in a row. While it is open, calls raise CircuitOpen at once
+    instead of waiting out another timeout; after BREAKER_COOLDOWN seconds one
+    trial request decides whether it closes again.
+
+Guard.call_async does the same for a coroutine, sleeping with asyncio.sleep.
+Guard.can_spare(host, strategy) tells a caller whether an optional request
+(a hedge) is affordable: the circuit is closed and the host's bucket holds at
+least HEDGE_MIN_SHARE of its burst.
+Used by the async engine (scrape_async.py), and through it by
+scrape-job-url.py and .github/scripts/scrape_linkedin_job.py.
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+RETRIES = 3                 # extra attempts after the first
+BACKOFF_BASE = 0.5          # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+BACKOFF_CAP = 20.0          # longest backoff between two attempts
+MAX_RETRY_AFTER = 60.0      # a longer Retry-After is not waited for
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+BREAKER_THRESHOLD = 5       # consecutive failures that open a circuit
+BREAKER_COOLDOWN = 60.0     # seconds an open circuit stays open before a trial
+
+HEDGE_MIN_SHARE = 0.5       # share of a host's burst that must be saved up before it is hedged into
+
+# host -> (requests per second, burst). Jina Reader allows 20 requests a minute
+# without an API key; the ATS APIs are generous but shared with other users.
+DEFAULT_RATE = (5.0, 10)
+RATE_LIMITS = {
+    "r.jina.ai": (20 / 60, 3),
+    "boards-api.greenhouse.io": (10.0, 20),
+    "api.lever.co": (10.0, 20),
+    "www.linkedin.com": (1.0, 3),
+}
+
+
+class CircuitOpen(Exception):
+    """The (host, strategy) circuit is open; the request was not sent."""
+
+
+class RateLimited(Exception):
+    """No request token for the host became available within the caller's budget."""
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after(resp) -> float | None:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), or None."""
+    value = (getattr(resp, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# ---------------------------------------------------------------------------
+# Rate limits
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, timeout: float | None = None) -> float | None:
+        """Claim the next token; return how long to wait before using it.
+
+        Returns None (and claims nothing) when the wait would exceed timeout.
+        Claims queue up: each caller waits for its own slot, in order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self.paused_until)
+            if start > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (start - self.updated) * self.rate)
+                self.updated = start
+            ready = self.updated + max(0.0, (1 - self.tokens) / self.rate)
+            wait = ready - now
+            if timeout is not None and wait > timeout:
+                return None
+            self.tokens -= 1
+            return max(0.0, wait)
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Take one token, sleeping until it is due. False if that takes over timeout."""
+        wait = self.reserve(timeout)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    def available(self) -> float:
+        """Tokens that could be taken now without waiting (negative while claims are queued)."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return min(self.tokens, 0.0)
+            return min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds` (the host asked us to back off), then start empty."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.updated = max(self.updated, until)
+                self.tokens = min(self.tokens, 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+class CircuitBreaker:
+    """Consecutive-failure breaker per key: closed -> open -> one trial -> closed or open."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state: dict = {}  # key -> [consecutive failures, opened at or None, trial in flight]
+
+    def allow(self, key) -> bool:
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or state[1] is None:
+                return True
+            if not state[2] and time.monotonic() - state[1] >= self.cooldown:
+                state[2] = True
+                return True
+            return False
+
+    def closed(self, key) -> bool:
+        """True unless the circuit is open or half-open (waiting for, or running, its trial)."""
+        with self._lock:
+            state = self._state.get(key)
+            return state is None or state[1] is None
+
+    def success(self, key) -> None:
+        with self._lock:
+            self._state.pop(key, None)
+
+    def failure(self, key) -> None:
+        with self._lock:
+            state = self._state.setdefault(key, [0, None, False])
+            state[0] += 1
+            if state[2] or state[0] >= self.threshold:
+                if state[1] is None or state[2]:
+                    print(f"[breaker] {key[0]} {key[1]}: open for {self.cooldown:g}s", file=sys.stderr)
+                state[1] = time.monotonic()
+                state[2] = False
+
+    def release(self, key) -> None:
+        """The trial request was never sent; let the next call try instead."""
+        with self._lock:
+            state = self._state.get(key)
+            if state is not None:
+                state[2] = False
+
+
+# ---------------------------------------------------------------------------
+# Guard
+# ---------------------------------------------------------------------------
+
+class Guard:
+    """Rate limits, retries and circuit breaking around a request function."""
+
+    def __init__(self, transient: tuple = (OSError,), retries: int = RETRIES,
+                 rates: dict | None = None, breaker: CircuitBreaker | None = None):
+        self.transient = transient
+        self.retries = retries
+        self.rates = RATE_LIMITS if rates is None else rates
+        self.breaker = breaker or CircuitBreaker()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(*self.rates.get(host, DEFAULT_RATE))
+            return bucket
+
+    def can_spare(self, host: str, strategy: str) -> bool:
+        """Whether an optional request to host can be afforded right now.
+
+        Hedges use this: they should not spend the tokens a host's primary
+        requests will need, nor the single trial of a half-open circuit.
+        """
+        if not self.breaker.closed((host, strategy)):
+            return False
+        bucket = self.bucket(host)
+        return bucket.available() >= max(1.0, bucket.capacity * HEDGE_MIN_SHARE)
+
+    def _admit(self, host: str, strategy: str):
+        key = (host, strategy)
+        if not self.breaker.allow(key):
+            raise CircuitOpen(f"{host} {strategy}: circuit open after repeated failures")
+        return key
+
+    def _reserve(self, key, bucket: TokenBucket, started: float, budget: float | None) -> float:
+        """Seconds until the host's next request token; RateLimited if past the budget."""
+        remaining = None if budget is None else budget - (time.monotonic() - started)
+        wait = bucket.reserve(remaining)
+        if wait is None:
+            self.breaker.release(key)
+            raise RateLimited(f"{key[0]}: no request budget left within {budget:g}s")
+        return wait
+
+    def _abandon(self, key, error: BaseException) -> None:
+        """Settle the breaker for a call that ended before an outcome was recorded.
+
+        A cancelled call (a lost race, a shutdown) says nothing about the host:
+        it only gives up its trial slot, if it held one, so the next call can
+        try. Any other unexpected error counts as a failure. Either way a
+        half-open circuit is never left waiting for a trial that won't finish.
+        """
+        if isinstance(error, (asyncio.CancelledError, KeyboardInterrupt, SystemExit, RateLimited)):
+            self.breaker.release(key)
+        else:
+            self.breaker.failure(key)
+
+    def _retry_delay(self, key, bucket: TokenBucket, attempt: int, started: float,
+                     budget: float | None, resp, error) -> float | None:
+        """Seconds to wait before retrying, or None when this outcome is final."""
+        if error is None and resp.status_code not in RETRY_STATUSES:
+            self.breaker.success(key)
+            return None
+
+        delay = retry_after(resp) if resp is not None else None
+        if delay is not None and resp.status_code == 429:
+            bucket.pause(min(delay, MAX_RETRY_AFTER))
+        if delay is None:
+            delay = backoff_delay(attempt)
+        elapsed = time.monotonic() - started
+        if (attempt >= self.retries or delay > MAX_RETRY_AFTER
+                or (budget is not None and elapsed + delay > budget)):
+            self.breaker.failure(key)
+            return None
+        reason = error.__class__.__name__ if error is not None else f"HTTP {resp.status_code}"
+        print(f"[retry] {key[0]}: {reason}; attempt {attempt + 2} in {delay:.1f}s", file=sys.stderr)
+        if resp is not None:
+            resp.close()
+        return delay
+
+    def call(self, host: str, strategy: str, send, budget: float | None = None):
+        """Return send()'s response, retrying transient failures within `budget` seconds.
+
+        A response that is still a 429/5xx after the last retry is returned as
+        is; a transient exception after the last retry is re-raised. Raises
+        CircuitOpen without calling send() while the circuit is open, and
+        RateLimited when no token for the host frees up within the budget.
+        """
+        key = self._admit(host, strategy)
+        bucket = self.bucket(host)
+        started = time.monotonic()
+        attempt = 0
+        try:
+            while True:
+                wait = self._reserve(key, bucket, started, budget)
+                if wait:
+                    time.sleep(wait)
+                resp = error = None
+                try:
+                    resp = send()
+                except self.transient as e:
+                    error = e
+                delay = self._retry_delay(key, bucket, attempt, started, budget, resp, error)
+                if delay is None:
+                    break
+                attempt += 1
+                time.sleep(delay)
+        except BaseException as e:
+            self._abandon(key, e)
+            raise
+        if error is not None:
+            raise error
+        return resp
+
+    async def call_async(self, host: str, strategy: str, send, budget: float | None = None):
+        """call() for a coroutine function send(); waits without blocking the event loop."""
+        key = self._admit(host, strategy)
+        bucket = self.bucket(host)
+        started = time.monotonic()
+        attempt = 0
+        try:
+            while True:
+                wait = self._reserve(key, bucket, started, budget)
+                if wait:
+                    await asyncio.sleep(wait)
+                resp = error = None
+                try:
+                    resp = await send()
+                except self.transient as e:
+                    error = e
+                delay = self._retry_delay(key, bucket, attempt, started, budget, resp, error)
+                if delay is None:
+                    break
+                attempt += 1
+                await asyncio.sleep(delay)
+        except BaseException as e:
+            self._abandon(key, e)
+            raise
+        if error is not None:
+            raise error
+        return resp
@@ -1,33 +1,151 @@
 #!/usr/bin/env python3
 """
 Fetch a job URL and write jobs/<slug>.md with structured frontmatter.
-Strategy (in order):
+Strategy:
   1. Greenhouse public JSON API  (boards.greenhouse.io / job-boards.greenhouse.io)
   2. Lever public JSON API       (jobs.lever.co)
-  3. JSON-LD JobPosting schema   (Workable, Indeed, LinkedIn, most modern ATS)
-  4. Static HTML heuristics      (BeautifulSoup title + body extraction)
-  5. Jina Reader API fallback    (r.jina.ai — handles JS-rendered pages)
+  3. Ashby, Workable, SmartRecruiters and Recruitee public posting APIs
+  4. LinkedIn guest job posting  (linkedin.com/jobs/view/<id>; a small HTML fragment)
+  5. JSON-LD JobPosting schema   (Indeed, most modern ATS)
+  6. Static HTML heuristics      (BeautifulSoup title + body extraction)
+  7. Jina Reader API fallback    (r.jina.ai — handles JS-rendered pages)
+
+The strategies, extractor registry and HTTP layer live in scrape_async.py, an
+asyncio engine that can also be embedded in other async code; this script is
+the command-line front end that writes job files, checks for duplicates and
+imports boards.
+
+Usage:
+  scrape-job-url.py <job_url>
+  scrape-job-url.py --batch urls.txt [--workers N] [--per-host N]
+  scrape-job-url.py --batch - < urls.txt
+  scrape-job-url.py --issues issues.jsonl --manifest issue-manifest.json --build-data
+  scrape-job-url.py <job_url> --offline     (replay from the response cache only)
+  scrape-job-url.py --board https://boards.greenhouse.io/cloudflare
+  scrape-job-url.py --board cloudflare --ats lever
+  scrape-job-url.py --board https://jobs.ashbyhq.com/acme
+  scrape-job-url.py --batch urls.txt --deadline 20 --hedge-delay 2
+  scrape-job-url.py --crawl https://acme.com/careers --crawl https://example.org/sitemap.xml
+  scrape-job-url.py --crawl-seeds employers.txt [--max-pages N] [--max-depth N]
+  scrape-job-url.py --check-links [--max-checks N] [--workers N]
+  scrape-job-url.py --serve                 (worker: JSON-line requests on stdin)
+  scrape-job-url.py --socket /tmp/scrape.sock
+  scrape-job-url.py --batch urls.txt --no-cache --stand-in http://127.0.0.1:8700
+  scrape-job-url.py --batch urls.txt --metrics timings.jsonl --prometheus scrape.prom --profile-slow 5
+
+Batch mode scrapes many URLs concurrently on one event loop and prints one
+JSON line per URL. Board mode imports every posting on a Greenhouse, Lever,
+Ashby, Workable, SmartRecruiters or Recruitee board in a few bulk requests, rewriting only postings whose ID or update
+marker changed since the last import (tracked in data/board-imports.json).
+
+Issue mode (--issues FILE) takes a queue of submission issues, one JSON object
+({"number", "body"}) per line, and scrapes the "### Job URL" of every one of
+them as a single batch. Job files are written with atomic renames, and with
+--build-data the data files are rebuilt once for the whole queue. --manifest
+FILE records each issue's outcome (created, duplicate, no-url or error, with
+the job file) for the workflow that comments on and closes the issues.
+
+Crawl mode finds postings by itself, starting from careers pages and sitemaps
+(see crawler.py): robots.txt and crawl delays are respected, only pages with
+structured postings are written, and a recrawl only re-reads postings whose
+sitemap lastmod changed (tracked in data/crawl-state.json). Postings already
+listed are updated in place. One JSON line is printed per posting found.
+
+Link-check mode (--check-links) revisits the postings already listed (see
+link_health.py): every due application_url is checked with a conditional
+request, on the ATS API where there is one, on an adaptive schedule kept in
+data/link-health.json. A closed posting gets expires_at set; one whose content
+changed is re-extracted and rewritten in place. --max-checks caps the checks
+per run (most overdue first) and --check-all ignores the schedule. One JSON
+line is printed per posting checked.
+
+Worker mode (--serve, or --socket PATH for a Unix socket) keeps one warm
+scraper running and answers requests such as {"url": "…", "id": 1} as they
+finish, one JSON line each, so callers submitting URLs one at a time pay no
+start-up cost per URL; see Worker for the protocol. It exits at end of input
+(or on SIGTERM), saving the job index and host history on the way out.
+
+Before fetching, every URL is checked against data/job-index.json (see
+job_index.py); a posting that is already listed is not scraped again, and one
+whose text nearly matches an existing listing is merged into it rather than
+written twice. --allow-duplicate skips both checks.
+
+Static fetch and Jina race under one deadline per URL (--deadline, default
+40s). The strategy a host's history favours starts first; if it has not won
+after --hedge-delay seconds (default 4, less for hosts known to answer fast)
+the other starts alongside it, and whichever returns a usable result first
+wins. Per-host latencies and success rates live in .cache/http/host-history.json
+(see host_history.py).
+
+Every scraped posting gets its skills and requirements fields filled from the
+description by job_skills.py.
+
+--metrics FILE appends one JSON line per scraped URL: every strategy attempt
+with its outcome and fallback reason, and every request's queue, DNS, connect,
+time-to-first-byte and download times and bytes, plus the time spent parsing,
+extracting text and matching skills. --prometheus FILE writes the same as
+counters and histograms (rewritten at the end, and periodically in worker
+mode). --profile-slow SECONDS profiles the parsing work and keeps the profiles
+of URLs slower than that in --profile-dir. See scrape_metrics.py.
+
+--stand-in URL sends every request to a stand-in server (bench/stand_in.py)
+that answers from recorded responses, so single and batch runs can be
+load-tested offline; use it with --no-cache.
+
+--build-data refreshes data/jobs.json and data/seekers.json in-process once the
+run is done (see build_data.py), re-parsing only the job files that changed.
 """
 
+import argparse
+import asyncio
+import inspect
 import json
+import os
 import re
+import signal
 import sys
-from datetime import datetime
-from html import unescape
+import tempfile
+import threading
+import time
+from importlib.util import find_spec
 from pathlib import Path
 from urllib.parse import urlparse
 
-try:
-    import requests
-    from bs4 import BeautifulSoup
-except ImportError:
-    print("pip install requests beautifulsoup4", file=sys.stderr)
+# Checked without importing: aiohttp is only loaded once a fetch is due and
+# BeautifulSoup only when a page has to be parsed (see scrape_async.py).
+if any(find_spec(name) is None for name in ("requests", "bs4", "aiohttp")):
+    print("pip install -r scripts/requirements-scrape.txt", file=sys.stderr)
     sys.exit(1)
 
-JOBS_DIR = Path(__file__).resolve().parent.parent / "jobs"
-HEADERS = {
-    "User-Agent": "OWASP-BLT-Jobs-Bot/1.0 (https://github.com/OWASP-BLT/BLT-Jobs)"
-}
+import crawler
+import frontmatter
+import job_skills
+import link_health
+import scrape_async
+import scrape_metrics
+from host_history import HostHistory
+from http_cache import HttpCache
+from job_index import JobIndex
+from resilience import RETRIES, Guard
+from scrape_async import (
+    BOARD_HOSTS,
+    BOARD_LISTERS,
+    CACHE_DIR,
+    DEADLINE,
+    DEFAULT_PER_HOST,
+    GREENHOUSE_HOSTS,
+    HEDGE_DELAY,
+    AsyncScraper,
+    build_frontmatter,
+)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+JOBS_DIR = ROOT_DIR / "jobs"
+BOARD_STATE_FILE = ROOT_DIR / "data" / "board-imports.json"
+INDEX_FILE = ROOT_DIR / "data" / "job-index.json"
+
+# Batch mode default: URLs scraped at once (per-host limits still apply).
+DEFAULT_WORKERS = scrape_async.DEFAULT_CONCURRENCY
 
 
 # ---------------------------------------------------------------------------
@@ -41,398 +159,959 @@ def slugify(s: str) -> str:
     return s.strip("-") or "job"
 
 
-def html_to_text(html: str, max_chars: int = 15000) -> str:
-    """Strip HTML tags and return plain text."""
-    if not html:
-        return ""
-    soup = BeautifulSoup(html, "html.parser")
-    return soup.get_text(separator="\n", strip=True)[:max_chars]
-
-
-def soup_main_text(soup: BeautifulSoup, max_chars: int = 15000) -> str:
-    """Pull the most content-rich section from a parsed page."""
-    candidates = [
-        ".job-description", "#job-description",
-        "[class*='job-desc']", "[id*='job-desc']",
-        ".posting-content", "#posting-content",
-        ".content-intro", ".jobsearch-jobDescriptionText",
-        "[role='main']", "main", "article",
-        ".content", "#content",
-    ]
-    for sel in candidates:
-        el = soup.select_one(sel)
-        if el:
-            text = el.get_text(separator="\n", strip=True)
-            if len(text) > 300:
-                return text[:max_chars]
-    # Last resort: strip nav/header/footer noise then dump body
-    for tag in soup(["nav", "header", "footer", "script", "style", "noscript"]):
-        tag.decompose()
-    return soup.get_text(separator="\n", strip=True)[:max_chars]
-
-
-def org_from_host(url: str) -> str:
-    host = urlparse(url).netloc or ""
-    return host.replace("www.", "").split(".")[0].replace("-", " ").title()
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+# Settings from the command line, and the state every AsyncScraper of this
+# process shares (each asyncio.run gets a scraper of its own).
+_host_limit = DEFAULT_PER_HOST
+_deadline = DEADLINE
+_hedge_delay = HEDGE_DELAY
+_retries = RETRIES
+_guard: Guard | None = None
+_cache: HttpCache | None = None
+_history: HostHistory | None = None
+_stand_in: str | None = None
+_metrics: scrape_metrics.Metrics | None = None
+_prometheus_file: str | None = None
+_history_lock = threading.Lock()
+
+
+def set_host_limit(limit: int) -> None:
+    """Cap simultaneous requests per host."""
+    global _host_limit
+    _host_limit = max(1, limit)
+
+
+def set_retries(retries: int) -> None:
+    """Extra attempts for a transient failure (connection error, timeout, 429, 5xx)."""
+    global _retries
+    _retries = max(0, retries)
+    if _guard is not None:
+        _guard.retries = _retries
+
+
+def set_race(deadline: float | None = None, hedge_delay: float | None = None) -> None:
+    global _deadline, _hedge_delay
+    if deadline is not None:
+        _deadline = max(1.0, deadline)
+    if hedge_delay is not None:
+        _hedge_delay = max(0.0, hedge_delay)
+
+
+def set_stand_in(base: str | None) -> None:
+    """Send every request to a stand-in server (bench/stand_in.py) instead of the real hosts."""
+    global _stand_in
+    _stand_in = base
+
+
+def configure_metrics(jsonl: str | None = None, prometheus: str | None = None,
+                      profile_slow: float | None = None, profile_dir=scrape_metrics.PROFILE_DIR) -> None:
+    """Trace every scrape (see scrape_metrics.py); without any output requested, don't."""
+    global _metrics, _prometheus_file
+    _prometheus_file = prometheus
+    if jsonl or prometheus or profile_slow is not None:
+        _metrics = scrape_metrics.Metrics(jsonl, profile_slow, profile_dir)
+
+
+def save_metrics(final: bool = False) -> None:
+    """Write the Prometheus file; at the end of a run also print where the time went."""
+    if _metrics is None:
+        return
+    if _prometheus_file:
+        _metrics.write_prometheus(_prometheus_file)
+    if final:
+        for line in _metrics.summary():
+            print(line, file=sys.stderr)
+        _metrics.close()
+
+
+def configure_cache(directory=CACHE_DIR, mode: str = "default") -> None:
+    """Put the on-disk response cache in front of every fetch. directory=None disables it."""
+    global _cache
+    _cache = HttpCache(directory, mode) if directory is not None else None
+
+
+def get_history() -> HostHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = HostHistory()
+        return _history
+
+
+def save_history() -> None:
+    if _history is not None:
+        _history.save()
+
+
+def new_scraper() -> AsyncScraper:
+    """An AsyncScraper with this process's settings, cache, host history and guard."""
+    global _guard
+    if _guard is None:
+        _guard = Guard(transient=scrape_async.transient_errors(), retries=_retries)
+    return AsyncScraper(per_host=_host_limit, cache=_cache, history=get_history(), guard=_guard,
+                        deadline=_deadline, hedge_delay=_hedge_delay, stand_in=_stand_in,
+                        metrics=_metrics)
+
+
+async def _scrape_one(url: str) -> tuple[str, dict, str]:
+    async with new_scraper() as scraper:
+        return await scraper.scrape(url)
+
+
+def scrape_url_with_strategy(url: str) -> tuple[str, dict, str]:
+    """Like scrape_url, but also return the name of the strategy that succeeded."""
+    return asyncio.run(_scrape_one(url))
+
+
+def scrape_url(url: str) -> tuple[dict, str]:
+    _, fm, description = scrape_url_with_strategy(url)
+    return fm, description
 
 
 # ---------------------------------------------------------------------------
-# 1. Greenhouse API
+# Output
 # ---------------------------------------------------------------------------
 
-_GREENHOUSE_HOSTS = {
-    "boards.greenhouse.io",
-    "boards.eu.greenhouse.io",
-    "job-boards.greenhouse.io",
-    "job-boards.eu.greenhouse.io",
-}
+_write_lock = threading.Lock()
 
-def scrape_greenhouse(url: str):
-    parsed = urlparse(url)
-    if parsed.netloc not in _GREENHOUSE_HOSTS:
-        return None
 
-    parts = [p for p in parsed.path.strip("/").split("/") if p]
-    # Expected path: /<company>/jobs/<id>
-    if len(parts) < 3 or parts[1] != "jobs":
-        return None
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    if not url.startswith("http://") and not url.startswith("https://"):
+        url = "https://" + url
+    return url
 
-    company, job_id = parts[0], parts[2]
-    api_base = (
-        "https://boards-api.eu.greenhouse.io/v1/boards"
-        if "eu" in parsed.netloc
-        else "https://boards-api.greenhouse.io/v1/boards"
-    )
 
+def _write_atomic(path: Path, text: str) -> None:
+    """Write text to a temp file next to path and rename it over path.
+
+    A build or a git add running alongside never sees a half-written job
+    file; the temp name (.<stem>.*.tmp) doesn't end in .md, so builds skip it.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
     try:
-        # Get company display name
-        cr = requests.get(f"{api_base}/{company}", headers=HEADERS, timeout=15)
-        org_name = cr.json().get("name", company.replace("-", " ").title()) if cr.ok else company.replace("-", " ").title()
-
-        # Get job details
-        jr = requests.get(f"{api_base}/{company}/jobs/{job_id}", headers=HEADERS, timeout=15)
-        jr.raise_for_status()
-        data = jr.json()
-    except Exception as e:
-        print(f"Greenhouse API error: {e}", file=sys.stderr)
-        return None
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; job files are ordinary content
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_job_file(fm: dict, body: str, path: Path | None = None) -> Path:
+    """Write jobs/<company>-<title>.md, suffixing -1, -2, … on collision.
 
-    title = (data.get("title") or "Job Listing").strip()
-    loc_obj = data.get("location") or {}
-    location = (loc_obj.get("name") or "").strip()
-    # Greenhouse returns HTML-entity-escaped HTML — unescape before parsing
-    description = html_to_text(unescape(data.get("content") or ""))
+    If path is given, that file is overwritten instead (updating a known posting).
+    """
+    company_slug = slugify(fm["organization_name"])
+    title_slug = slugify(fm["title"])[:50]
+    filename = (
+        f"{company_slug}-{title_slug}.md"
+        if title_slug and title_slug != "job"
+        else f"{company_slug}-job.md"
+    )
 
-    print(f"[Greenhouse API] {org_name} — {title}", file=sys.stderr)
-    return {
-        "title": title,
-        "organization_name": org_name,
-        "location": location,
-        "job_type": "full-time",
-        "salary_range": "",
-        "application_url": url,
-    }, description
+    # Batch workers may finish with the same slug at the same time; pick the
+    # name and create the file under one lock so neither overwrites the other.
+    with _write_lock:
+        JOBS_DIR.mkdir(parents=True, exist_ok=True)
+        out_path = path or JOBS_DIR / filename
+        if path is None and out_path.exists():
+            stem = out_path.stem
+            for i in range(1, 100):
+                out_path = JOBS_DIR / f"{stem}-{i}.md"
+                if not out_path.exists():
+                    break
+        _write_atomic(out_path, frontmatter.dump(fm, body))
+    if _dedupe:
+        get_index().add(out_path, fm.get("application_url", ""), body)
+    return out_path
 
 
 # ---------------------------------------------------------------------------
-# 2. Lever API
+# Duplicate detection
 # ---------------------------------------------------------------------------
 
-def scrape_lever(url: str):
-    parsed = urlparse(url)
-    if parsed.netloc != "jobs.lever.co":
-        return None
+_dedupe = True
+_index: JobIndex | None = None
+_index_lock = threading.Lock()
 
-    parts = [p for p in parsed.path.strip("/").split("/") if p]
-    if len(parts) < 2:
-        return None
 
-    company, posting_id = parts[0], parts[1]
+def set_dedupe(enabled: bool) -> None:
+    global _dedupe
+    _dedupe = enabled
 
-    try:
-        r = requests.get(
-            f"https://api.lever.co/v0/postings/{company}/{posting_id}",
-            headers=HEADERS,
-            timeout=15,
-        )
-        r.raise_for_status()
-        data = r.json()
-    except Exception as e:
-        print(f"Lever API error: {e}", file=sys.stderr)
+
+def get_index() -> JobIndex:
+    """The job index, loaded (and synced with jobs/) on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JobIndex.load(INDEX_FILE, JOBS_DIR)
+        return _index
+
+
+def save_index() -> None:
+    if _index is not None:
+        _index.save()
+
+
+def known_posting(url: str) -> Path | None:
+    """Job file already listing the posting at url (checked before any fetch)."""
+    if not _dedupe:
         return None
+    path = get_index().lookup_url(url)
+    return path if path and path.exists() else None
 
-    title = (data.get("text") or "Job Listing").strip()
-    org_name = company.replace("-", " ").title()
-    cats = data.get("categories") or {}
-    location = (cats.get("location") or "").strip()
-    job_type = (cats.get("commitment") or "full-time").lower()
-
-    # Build description from multiple HTML fields Lever provides
-    html_parts = [data.get("description") or ""]
-    for lst in data.get("lists") or []:
-        html_parts.append(f"<h3>{lst.get('text', '')}</h3>")
-        html_parts.append(lst.get("content") or "")
-    html_parts.append(data.get("additional") or "")
-    description = html_to_text("\n".join(html_parts))
-
-    print(f"[Lever API] {org_name} — {title}", file=sys.stderr)
-    return {
-        "title": title,
-        "organization_name": org_name,
-        "location": location,
-        "job_type": job_type or "full-time",
-        "salary_range": "",
-        "application_url": url,
-    }, description
+
+def near_duplicate(url: str, description: str) -> Path | None:
+    """Existing job file with near-identical text; url is recorded as an alias of it."""
+    if not _dedupe:
+        return None
+    index = get_index()
+    matches = index.near_duplicates(description)
+    if not matches:
+        return None
+    path, distance = matches[0]
+    index.add_alias(path.name, url)
+    print(f"Near-duplicate of {path.name} (distance {distance}); not writing a new file", file=sys.stderr)
+    return path
+
+
+def ingest_url(url: str) -> dict:
+    """Scrape url into a job file unless it is already listed.
+
+    Returns {"path", "strategy", "duplicate"}; duplicate is "url" when the
+    posting was recognised before fetching, "content" when its text matched an
+    existing listing, and None when a new file was written.
+    """
+    existing = known_posting(url)
+    if existing is not None:
+        print(f"Already listed: {existing.name}", file=sys.stderr)
+        return {"path": str(existing), "strategy": None, "duplicate": "url"}
+    strategy, fm, body = scrape_url_with_strategy(url)
+    return store_scraped(url, strategy, fm, body)
+
+
+def store_scraped(url: str, strategy: str, fm: dict, body: str) -> dict:
+    """Write a scraped posting unless it is already listed; same result as ingest_url."""
+    existing = known_posting(url)  # listed while this one was being scraped (e.g. twice in a batch)
+    if existing is not None:
+        return {"path": str(existing), "strategy": strategy, "duplicate": "url"}
+    existing = near_duplicate(url, body)
+    if existing is not None:
+        return {"path": str(existing), "strategy": strategy, "duplicate": "content"}
+    return {"path": str(write_job_file(fm, body)), "strategy": strategy, "duplicate": None}
 
 
 # ---------------------------------------------------------------------------
-# 3 & 4. Generic: JSON-LD + static HTML heuristics
+# Batch mode
 # ---------------------------------------------------------------------------
 
-def extract_json_ld(soup: BeautifulSoup) -> dict | None:
-    """Return the first JobPosting JSON-LD block found, or None."""
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            raw = json.loads(script.string or "")
-            items = raw if isinstance(raw, list) else [raw]
-            if isinstance(raw, dict) and "@graph" in raw:
-                items = raw["@graph"]
-            for item in items:
-                if str(item.get("@type", "")).lower() in ("jobposting",):
-                    return item
-        except (json.JSONDecodeError, AttributeError):
+def read_urls(source: str) -> list[str]:
+    """Read one URL per line from a file (or stdin for "-"), skipping blanks and # comments."""
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        urls = []
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(normalize_url(line))
+        return urls
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_batch(urls: list[str], workers: int = DEFAULT_WORKERS) -> int:
+    """Scrape urls on one event loop, at most `workers` at a time.
+
+    Prints one JSON line per URL as it finishes and returns the number of URLs
+    that failed.
+    """
+    failures = asyncio.run(_run_batch(urls, workers))
+    save_index()
+    save_history()
+    save_metrics(final=True)
+    return failures
+
+
+async def _run_batch(urls: list[str], workers: int) -> int:
+    failures = 0
+    todo = []
+    for url in urls:
+        existing = known_posting(url)
+        if existing is None:
+            todo.append(url)
             continue
-    return None
+        print(f"Already listed: {existing.name}", file=sys.stderr)
+        print(json.dumps({"url": url, "path": str(existing), "strategy": None, "duplicate": "url",
+                          "elapsed": 0.0, "error": None}), flush=True)
+
+    async with new_scraper() as scraper:
+        async for scraped in scraper.scrape_many(todo, workers):
+            result = {"url": scraped["url"], "path": None, "strategy": scraped["strategy"],
+                      "duplicate": None, "elapsed": scraped["elapsed"], "error": scraped["error"]}
+            if result["error"] is None:
+                try:
+                    result.update(store_scraped(scraped["url"], scraped["strategy"],
+                                                scraped["frontmatter"], scraped["description"]))
+                except Exception as e:
+                    result["error"] = str(e) or e.__class__.__name__
+            if result["error"]:
+                failures += 1
+            print(json.dumps(result), flush=True)
+    return failures
 
 
-def parse_json_ld(ld: dict, url: str) -> tuple[dict, str]:
-    title = (ld.get("title") or ld.get("name") or "Job Listing").strip()
+# ---------------------------------------------------------------------------
+# Issue queue
+# ---------------------------------------------------------------------------
 
-    org_obj = ld.get("hiringOrganization") or {}
-    org_name = (org_obj.get("name") if isinstance(org_obj, dict) else str(org_obj)).strip() or org_from_host(url)
+# The "Job URL" field of the job-posting-from-link issue form (the same match
+# process-submissions.yml used per issue).
+JOB_URL_FIELD = re.compile(r"###\s*Job URL\s*\n+([^\n#]+)")
 
-    # Location
-    loc_obj = ld.get("jobLocation") or {}
-    if isinstance(loc_obj, list):
-        loc_obj = loc_obj[0] if loc_obj else {}
-    addr = (loc_obj.get("address") or {}) if isinstance(loc_obj, dict) else {}
-    if isinstance(addr, str):
-        location = addr
-    else:
-        parts = [
-            addr.get("addressLocality", ""),
-            addr.get("addressRegion", ""),
-            addr.get("addressCountry", ""),
-        ]
-        location = ", ".join(p for p in parts if p).strip(", ")
-    if not location and isinstance(loc_obj, dict):
-        location = loc_obj.get("name") or ""
-
-    # Employment type
-    emp = (ld.get("employmentType") or "full-time").lower()
-
-    # Salary
-    salary_obj = ld.get("baseSalary") or {}
-    salary = ""
-    if isinstance(salary_obj, dict):
-        val = salary_obj.get("value") or {}
-        currency = salary_obj.get("currency", "")
-        if isinstance(val, dict):
-            mn, mx = val.get("minValue", ""), val.get("maxValue", "")
-            if mn and mx:
-                salary = f"{currency} {mn}–{mx}".strip()
-            elif mn or mx:
-                salary = f"{currency} {mn or mx}".strip()
-
-    description = html_to_text(ld.get("description") or "")
-
-    return {
-        "title": title,
-        "organization_name": org_name,
-        "location": location,
-        "job_type": emp,
-        "salary_range": salary,
-        "application_url": url,
-    }, description
-
-
-def scrape_static(url: str):
-    """Fetch static HTML, try JSON-LD then heuristics. Returns None if page looks JS-rendered."""
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-    except Exception as e:
-        print(f"Static fetch error: {e}", file=sys.stderr)
-        return None
 
-    # --- JSON-LD (best quality) ---
-    ld = extract_json_ld(soup)
-    if ld:
-        fm, description = parse_json_ld(ld, url)
-        if description or fm["title"] != "Job Listing":
-            print(f"[JSON-LD] {fm['organization_name']} — {fm['title']}", file=sys.stderr)
-            return fm, description
-
-    # --- Heuristic HTML extraction ---
-    body_text = soup.get_text(strip=True)
-    if len(body_text) < 400:
-        # Too little content — likely JS-rendered, signal caller to use fallback
+def issue_job_url(body: str) -> str | None:
+    """The Job URL an issue body submits, normalized; None if it has none."""
+    m = JOB_URL_FIELD.search(body or "")
+    url = m.group(1).strip() if m else ""
+    if not url or url == "_No response_":
         return None
+    return normalize_url(url if url.startswith("http") else url.lstrip("/"))
+
+
+def read_issues(source: str) -> list[dict]:
+    """Read one issue per line ({"number", "body", …}) from a file, or stdin for "-".
 
-    title = ""
-    og = soup.find("meta", property="og:title")
-    if og and og.get("content"):
-        title = og["content"].strip()
-    if not title and soup.title:
-        title = soup.title.get_text(strip=True)
-    if not title:
-        h1 = soup.find("h1")
-        title = h1.get_text(strip=True) if h1 else "Job Listing"
-
-    og_site = soup.find("meta", property="og:site_name")
-    org_name = (og_site["content"].strip() if og_site and og_site.get("content") else "") or org_from_host(url)
-
-    description = soup_main_text(soup)
-    print(f"[Static HTML] {org_name} — {title}", file=sys.stderr)
-    return {
-        "title": title,
-        "organization_name": org_name,
-        "location": "",
-        "job_type": "full-time",
-        "salary_range": "",
-        "application_url": url,
-    }, description
+    This is what `gh issue list --json number,body --jq '.[]'` prints.
+    """
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        issues = []
+        for n, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                issue = json.loads(line)
+            except ValueError as e:
+                print(f"{source}:{n}: not a JSON issue ({e}); skipped", file=sys.stderr)
+                continue
+            if isinstance(issue, dict):
+                issues.append(issue)
+        return issues
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def write_manifest(path: str, entries: list[dict]) -> None:
+    """Write the per-issue status manifest that the workflow comments on and closes issues from."""
+    counts = {}
+    for entry in entries:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(out, json.dumps({"counts": counts, "issues": entries}, indent=2) + "\n")
+
+
+def run_issue_queue(issues: list[dict], workers: int = DEFAULT_WORKERS, manifest: str | None = None) -> int:
+    """Scrape the Job URL of every issue in one batch and write the new job files.
+
+    Prints one JSON line per issue as it is settled and, if manifest is given,
+    writes every issue's status there in input order: "created", "duplicate"
+    (already listed, or submitted twice in the batch), "no-url" or "error".
+    Returns the number of issues that failed.
+    """
+    entries = []
+    try:
+        return asyncio.run(_run_issue_queue(issues, workers, entries))
+    finally:
+        if manifest:
+            write_manifest(manifest, entries)
+        save_index()
+        save_history()
+        save_metrics(final=True)
+
+
+async def _run_issue_queue(issues: list[dict], workers: int, entries: list[dict]) -> int:
+    failures = 0
+    todo: dict[str, list[dict]] = {}  # URL -> the entries of every issue submitting it
+    for issue in issues:
+        entry = {"issue": issue.get("number"), "url": issue_job_url(issue.get("body")), "status": None,
+                 "path": None, "strategy": None, "error": None}
+        entries.append(entry)
+        if entry["url"] is None:
+            entry.update(status="no-url", error="no Job URL in the issue body")
+        elif entry["url"] in todo:
+            todo[entry["url"]].append(entry)
+            continue
+        elif (existing := known_posting(entry["url"])) is not None:
+            entry.update(status="duplicate", path=str(existing))
+        else:
+            todo[entry["url"]] = [entry]
+            continue
+        if entry["status"] == "no-url":
+            failures += 1
+        print(json.dumps(entry), flush=True)
+
+    async with new_scraper() as scraper:
+        async for scraped in scraper.scrape_many(list(todo), workers):
+            first, *repeats = todo[scraped["url"]]
+            first.update(strategy=scraped["strategy"], error=scraped["error"])
+            if first["error"] is None:
+                try:
+                    stored = store_scraped(scraped["url"], scraped["strategy"],
+                                           scraped["frontmatter"], scraped["description"])
+                    first.update(path=stored["path"], status="duplicate" if stored["duplicate"] else "created")
+                except Exception as e:
+                    first["error"] = str(e) or e.__class__.__name__
+            if first["error"] is not None:
+                first["status"] = "error"
+            for entry in repeats:
+                entry.update({k: v for k, v in first.items() if k != "issue"})
+                if entry["status"] == "created":
+                    entry["status"] = "duplicate"
+            for entry in (first, *repeats):
+                failures += entry["status"] == "error"
+                print(json.dumps(entry), flush=True)
+    return failures
 
 
 # ---------------------------------------------------------------------------
-# 5. Jina Reader fallback
+# Crawl mode
 # ---------------------------------------------------------------------------
 
-def scrape_jina(url: str) -> tuple[dict, str]:
-    """Use r.jina.ai to render and extract any page, including JS-heavy ones."""
-    print("Falling back to Jina Reader API…", file=sys.stderr)
+def store_crawled(found: dict) -> dict:
+    """Write a posting the crawler found; one that is already listed is refreshed in place."""
+    url, fm, body = found["url"], found["frontmatter"], found["description"]
+    existing = known_posting(url)
+    if existing is None:
+        result = store_scraped(url, found["strategy"], fm, body)
+        return {**result, "status": "duplicate" if result["duplicate"] else "created"}
+    # Re-read because it is new to the crawl state or its lastmod changed.
+    created = frontmatter.read(existing)[0].get("created_at")
+    path = write_job_file({**fm, "created_at": created or fm["created_at"]}, body, path=existing)
+    return {"path": str(path), "strategy": found["strategy"], "duplicate": "url", "status": "updated"}
+
+
+def run_crawl(seeds: list[str], workers: int = crawler.DEFAULT_WORKERS, max_pages: int = crawler.MAX_PAGES,
+              max_depth: int = crawler.MAX_DEPTH) -> int:
+    """Crawl seeds and write every posting found; print one JSON line per posting. Returns failures."""
     try:
-        jina_url = f"https://r.jina.ai/{url}"
-        r = requests.get(
-            jina_url,
-            headers={**HEADERS, "Accept": "text/plain", "X-Return-Format": "markdown"},
-            timeout=45,
-        )
-        r.raise_for_status()
-        content = r.text.strip()
-    except Exception as e:
-        print(f"Jina Reader error: {e}", file=sys.stderr)
-        return {
-            "title": "Job Listing",
-            "organization_name": org_from_host(url),
-            "location": "", "job_type": "full-time", "salary_range": "",
-            "application_url": url,
-        }, f"See full listing at: {url}"
-
-    lines = [l.strip() for l in content.splitlines() if l.strip()]
-
-    # Jina prepends "Title: ..." and "URL Source: ..." metadata lines
-    title = "Job Listing"
-    body_start = 0
-    for i, line in enumerate(lines):
-        if line.startswith("Title:"):
-            title = line[6:].strip()
-        elif line.startswith("URL Source:") or line.startswith("Markdown Content:"):
-            body_start = i + 1
-            break
-
-    description = "\n".join(lines[body_start:]) if body_start else "\n".join(lines[1:])
-    org_name = org_from_host(url)
-
-    print(f"[Jina Reader] {org_name} — {title}", file=sys.stderr)
-    return {
-        "title": title,
-        "organization_name": org_name,
-        "location": "", "job_type": "full-time", "salary_range": "",
-        "application_url": url,
-    }, description
+        return asyncio.run(_run_crawl(seeds, workers, max_pages, max_depth))
+    finally:
+        save_index()
+        save_history()
+        save_metrics(final=True)
+
+
+async def _run_crawl(seeds: list[str], workers: int, max_pages: int, max_depth: int) -> int:
+    failures = 0
+    state = crawler.CrawlState()
+    async with new_scraper() as scraper:
+        crawl = crawler.Crawler(scraper, state, workers=workers, max_pages=max_pages, max_depth=max_depth)
+        try:
+            async for found in crawl.crawl([normalize_url(seed) for seed in seeds]):
+                result = {"url": found["url"], "path": None, "strategy": found["strategy"],
+                          "duplicate": None, "status": None, "error": None}
+                try:
+                    result.update(store_crawled(found))
+                except Exception as e:
+                    result["error"] = str(e) or e.__class__.__name__
+                    failures += 1
+                print(json.dumps(result), flush=True)
+        finally:
+            state.save()
+            print("[crawl] " + ", ".join(f"{k} {v}" for k, v in crawl.stats.items()), file=sys.stderr)
+    return failures
 
 
 # ---------------------------------------------------------------------------
-# Dispatcher
+# Link checks
 # ---------------------------------------------------------------------------
 
-def scrape_url(url: str) -> tuple[dict, str]:
-    result = scrape_greenhouse(url)
-    if result is None:
-        result = scrape_lever(url)
-    if result is None:
-        result = scrape_static(url)
-    if result is None:
-        result = scrape_jina(url)
-
-    if result is None:
-        print("Could not extract job data from URL (all strategies failed).", file=sys.stderr)
-        sys.exit(1)
+def listed_postings() -> list[tuple[str, str, str]]:
+    """(file name, application_url, created_at) of every job file still open."""
+    now = time.time()
+    postings = []
+    for path in sorted(JOBS_DIR.glob("*.md")):
+        if path.name == "README.md":
+            continue
+        try:
+            fm, _ = frontmatter.read(path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        url = (fm.get("application_url") or "").strip()
+        expires = link_health.parse_time(fm["expires_at"]) if fm.get("expires_at") else None
+        if url.startswith(("http://", "https://")) and (expires is None or expires > now):
+            postings.append((path.name, url, fm.get("created_at") or ""))
+    return postings
+
+
+def store_checked(result: dict) -> dict:
+    """Write what a link check found: expires_at for a closed posting, the new text for a changed one."""
+    path = JOBS_DIR / result["file"]
+    fm, body = frontmatter.read(path)
+    body = body.removeprefix("\n")
+    if result["status"] == "closed":
+        write_job_file({**fm, "expires_at": link_health.now_iso()}, body, path=path)
+        return {"written": True}
+    if result["status"] != "changed":
+        return {"written": False}
+    # Fields the extractors leave empty (a logo, application instructions) and
+    # the listing's own counters are kept.
+    merged = dict(result["frontmatter"])
+    for key, value in fm.items():
+        if key in ("created_at", "views_count") or (value and not merged.get(key)):
+            merged[key] = value
+    if merged == fm and result["description"].strip() == body.strip():
+        return {"written": False}
+    write_job_file(merged, result["description"], path=path)
+    return {"written": True}
+
+
+def run_link_check(workers: int = link_health.DEFAULT_WORKERS, limit: int | None = None,
+                   everything: bool = False) -> int:
+    """Check the postings that are due (see link_health.py); print one JSON line each. Returns errors."""
+    try:
+        return asyncio.run(_run_link_check(workers, limit, everything))
+    finally:
+        save_index()
+        save_history()
+        save_metrics(final=True)
 
-    fm_partial, description = result
-    created = datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ") if hasattr(datetime, "UTC") else datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-    fm = {
-        "title":                   fm_partial.get("title", "Job Listing"),
-        "organization_name":       fm_partial.get("organization_name", "Company"),
-        "organization_logo":       "",
-        "location":                fm_partial.get("location", ""),
-        "job_type":                fm_partial.get("job_type", "full-time"),
-        "salary_range":            fm_partial.get("salary_range", ""),
-        "expires_at":              "",
-        "application_email":       "",
-        "application_url":         fm_partial.get("application_url", url),
-        "application_instructions": "",
-        "requirements":            "",
-        "created_at":              created,
-        "views_count":             0,
-    }
-    return fm, description
+
+async def _run_link_check(workers: int, limit: int | None, everything: bool) -> int:
+    failures = 0
+    async with new_scraper() as scraper:
+        checker = link_health.LinkChecker(scraper, link_health.LinkState(), workers)
+        try:
+            due = checker.due(listed_postings(), limit=limit, everything=everything)
+            async for checked in checker.check_many(due):
+                result = {"path": str(JOBS_DIR / checked["file"]), "url": checked["url"],
+                          "status": checked["status"], "written": False, "error": checked["error"]}
+                if result["error"] is None:
+                    try:
+                        result.update(store_checked(checked))
+                    except Exception as e:
+                        result["error"] = str(e) or e.__class__.__name__
+                if result["error"]:
+                    failures += 1
+                print(json.dumps(result), flush=True)
+        finally:
+            checker.state.save()
+            print("[links] " + ", ".join(f"{k} {v}" for k, v in checker.stats.items()), file=sys.stderr)
+    return failures
 
 
 # ---------------------------------------------------------------------------
-# Main
+# Worker mode
 # ---------------------------------------------------------------------------
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: scrape-job-url.py <job_url>", file=sys.stderr)
-        sys.exit(1)
+SAVE_INTERVAL = 30.0  # seconds between job index / host history saves while serving
 
-    url = sys.argv[1].strip()
-    if not url.startswith("http://") and not url.startswith("https://"):
-        url = "https://" + url
 
-    fm, body = scrape_url(url)
+class Worker:
+    """Answers scrape requests with one long-lived AsyncScraper.
 
-    company_slug = slugify(fm["organization_name"])
-    title_slug = slugify(fm["title"])[:50]
-    filename = (
-        f"{company_slug}-{title_slug}.md"
-        if title_slug and title_slug != "job"
-        else f"{company_slug}-job.md"
-    )
+    The connection pool, response cache, host history, job index and skill
+    matcher are set up once and stay warm for every request, so a caller that
+    submits URLs one at a time pays no interpreter start-up or TLS handshake
+    per URL.
 
-    out_path = JOBS_DIR / filename
-    if out_path.exists():
-        stem = out_path.stem
-        for i in range(1, 100):
-            out_path = JOBS_DIR / f"{stem}-{i}.md"
-            if not out_path.exists():
-                break
+    A request is one JSON object per line:
+      {"url": "https://…", "id": 7, "write": true}
+    With write (the default) the posting is stored like a single-URL run and
+    the answer has the batch-mode fields (url, path, strategy, duplicate,
+    elapsed, error). With "write": false nothing is written and the answer
+    carries url, strategy, frontmatter, description, error and elapsed. Answers
+    arrive as scrapes finish, not in request order; "id", if given, is echoed
+    back to match them up.
+    """
 
-    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    def __init__(self, scraper: AsyncScraper, workers: int = DEFAULT_WORKERS):
+        self.scraper = scraper
+        self.slots = asyncio.Semaphore(max(1, workers))
+        self.saved_at = time.monotonic()
 
-    lines = ["---"]
-    for k, v in fm.items():
-        s = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
-        lines.append(f'{k}: "{s}"')
-    lines += ["---", "", body]
+    async def handle(self, line: str) -> dict:
+        try:
+            request = json.loads(line)
+            url = normalize_url(request["url"])
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return {"error": f"bad request: {e.__class__.__name__}: {e}"}
+        if request.get("write", True):
+            result = await self.ingest(url)
+        else:
+            result = await self.scraper.scrape_result(url)
+        if "id" in request:
+            result["id"] = request["id"]
+        return result
+
+    async def ingest(self, url: str) -> dict:
+        started = time.monotonic()
+        result = {"url": url, "path": None, "strategy": None, "duplicate": None, "error": None}
+        try:
+            existing = known_posting(url)
+            if existing is not None:
+                result.update(path=str(existing), duplicate="url")
+            else:
+                result.update(store_scraped(url, *await self.scraper.scrape(url)))
+        except Exception as e:
+            result["error"] = str(e) or e.__class__.__name__
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        return result
+
+    def checkpoint(self, force: bool = False) -> None:
+        """Save the job index and host history if SAVE_INTERVAL has passed."""
+        if force or time.monotonic() - self.saved_at >= SAVE_INTERVAL:
+            save_index()
+            save_history()
+            save_metrics()
+            self.saved_at = time.monotonic()
+
+    async def serve(self, lines, reply) -> None:
+        """Answer every request in the async iterable `lines` through `await reply(result)`.
+
+        At most `workers` requests are in flight; reading pauses until one
+        finishes. Returns once the input ends and every answer has been sent.
+        """
+        tasks = set()
+
+        async def answer(line: str) -> None:
+            try:
+                result = await self.handle(line)
+            finally:
+                self.slots.release()
+            await reply(result)
+            self.checkpoint()
+
+        async for line in lines:
+            if not line.strip():
+                continue
+            await self.slots.acquire()
+            task = asyncio.create_task(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+async def _stdin_lines():
+    # Read on a daemon thread: that works for pipes, terminals and regular files
+    # alike (the loop's pipe transport rejects files), and a read still blocked
+    # at shutdown does not hold up the exit.
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def pump() -> None:
+        try:
+            for line in sys.stdin:
+                loop.call_soon_threadsafe(queue.put_nowait, line)
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+        except RuntimeError:  # the loop has closed
+            pass
+
+    threading.Thread(target=pump, name="stdin", daemon=True).start()
+    while (line := await queue.get()) is not None:
+        yield line
+
+
+async def _print_result(result: dict) -> None:
+    print(json.dumps(result), flush=True)
+
+
+async def _serve_socket(worker: Worker, path: str) -> asyncio.AbstractServer:
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def lines():
+            while line := await reader.readline():
+                yield line.decode("utf-8", "replace")
+
+        async def reply(result: dict) -> None:
+            writer.write(json.dumps(result).encode("utf-8") + b"\n")
+            await writer.drain()
+
+        try:
+            await worker.serve(lines(), reply)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    Path(path).unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(client, path=path, limit=2 ** 20)
+    os.chmod(path, 0o600)
+    print(f"[worker] listening on {path}", file=sys.stderr)
+    return server
+
+
+async def _run_worker(socket_path: str | None, workers: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with new_scraper() as scraper:
+        worker = Worker(scraper, workers)
+        get_index()
+        try:
+            if socket_path:
+                async with await _serve_socket(worker, socket_path):
+                    await stop.wait()
+            else:
+                serving = asyncio.create_task(worker.serve(_stdin_lines(), _print_result))
+                stopping = asyncio.create_task(stop.wait())
+                await asyncio.wait({serving, stopping}, return_when=asyncio.FIRST_COMPLETED)
+                stopping.cancel()
+                if not serving.done():
+                    serving.cancel()
+                await asyncio.gather(serving, stopping, return_exceptions=True)
+        finally:
+            worker.checkpoint(force=True)
+            if socket_path:
+                Path(socket_path).unlink(missing_ok=True)
+
+
+def run_worker(socket_path: str | None = None, workers: int = DEFAULT_WORKERS) -> None:
+    """Serve scrape requests from stdin (answers on stdout) or a Unix socket until EOF or SIGTERM."""
+    asyncio.run(_run_worker(socket_path, workers))
+    save_metrics(final=True)
+
+
+# ---------------------------------------------------------------------------
+# Board import
+# ---------------------------------------------------------------------------
 
-    out_path.write_text("\n".join(lines), encoding="utf-8")
-    print(str(out_path))
+def parse_board_ref(ref: str, ats: str | None = None) -> tuple[str, str, str]:
+    """Resolve a board URL, posting URL or bare slug to (ats, company, host)."""
+    ref = ref.strip()
+    if "/" not in ref and "." not in ref:
+        if ats not in BOARD_LISTERS:
+            raise ValueError(f"--ats {'|'.join(sorted(BOARD_LISTERS))} is required "
+                             f"with a bare company slug ({ref!r})")
+        return ats, ref, BOARD_HOSTS[ats].format(company=ref)
+
+    parsed = urlparse(normalize_url(ref))
+    host = parsed.netloc.lower()
+    parts = [p for p in parsed.path.split("/") if p]
+    if host.endswith(".recruitee.com"):
+        return "recruitee", host.split(".")[0], host
+    if host in GREENHOUSE_HOSTS and parts:
+        return "greenhouse", parts[0], host
+    for board_ats, board_host in BOARD_HOSTS.items():
+        if host == board_host and parts:
+            return board_ats, parts[0], host
+    raise ValueError(f"not a supported job board ({', '.join(sorted(BOARD_LISTERS))}): {ref}")
+
+
+async def _parse_posting(scraper: AsyncScraper, parse) -> tuple[dict, str]:
+    """Run a board posting's parse: a coroutine function is awaited, a plain parser goes off the loop."""
+    if inspect.iscoroutinefunction(parse):
+        return await parse()
+    return await scraper.parse(parse)
+
+
+def load_board_state() -> dict:
+    try:
+        return json.loads(BOARD_STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_board_state(state: dict) -> None:
+    BOARD_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = BOARD_STATE_FILE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, BOARD_STATE_FILE)
+
+
+async def _import_board(ats: str, company: str, host: str, board_key: str, known: dict) -> list[dict]:
+    async with new_scraper() as scraper:
+        postings = await BOARD_LISTERS[ats](scraper, company, host)
+
+        def unchanged(posting_id: str, version: str) -> Path | None:
+            prev = known.get(posting_id)
+            path = ROOT_DIR / prev["path"] if prev else None
+            return path if prev and prev["version"] == version and path.exists() else None
+
+        # Postings that need writing are parsed (or fetched, where the listing
+        # has no descriptions) together.
+        todo = [p for p in postings if unchanged(p[0], p[1]) is None]
+        parsed = dict(zip((p[0] for p in todo), await asyncio.gather(
+            *(_parse_posting(scraper, p[3]) for p in todo), return_exceptions=True)))
+
+    results = []
+    for posting_id, version, url, _ in postings:
+        kept = unchanged(posting_id, version)
+        if kept is not None:
+            results.append({"board": board_key, "id": posting_id, "path": str(kept), "status": "unchanged"})
+            continue
+        if isinstance(parsed[posting_id], Exception):
+            print(f"Board posting {posting_id} failed: {parsed[posting_id]}", file=sys.stderr)
+            results.append({"board": board_key, "id": posting_id, "path": None, "status": "error",
+                            "error": str(parsed[posting_id]) or parsed[posting_id].__class__.__name__})
+            continue
+
+        prev = known.get(posting_id)
+        prev_path = ROOT_DIR / prev["path"] if prev else None
+        existing = prev_path if prev and prev_path.exists() else None
+        created = prev.get("created_at") if existing else None
+        if existing is None:
+            # Listed before through a single-URL submission: update that file.
+            existing = known_posting(url)
+            if existing is not None:
+                created = frontmatter.read(existing)[0].get("created_at")
+        fm_partial, description = parsed[posting_id]
+        fm = build_frontmatter(fm_partial, url, created=created)
+        job_skills.annotate(fm, description)
+        out_path = write_job_file(fm, description, path=existing)
+        known[posting_id] = {
+            "version": version,
+            "path": out_path.relative_to(ROOT_DIR).as_posix(),
+            "created_at": fm["created_at"],
+        }
+        results.append({"board": board_key, "id": posting_id, "path": str(out_path),
+                        "status": "updated" if existing else "created"})
+    return results
+
+
+def import_board(ref: str, ats: str | None = None) -> list[dict]:
+    """Write or update jobs/*.md for every posting on a board; return one result per posting.
+
+    Postings whose ID and version match the last import (and whose file still
+    exists) are left untouched.
+    """
+    ats, company, host = parse_board_ref(ref, ats)
+    state = load_board_state()
+    board_key = f"{ats}:{company}"
+    known = state.setdefault(board_key, {})
+
+    results = asyncio.run(_import_board(ats, company, host, board_key, known))
+    save_board_state(state)
+    save_index()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape job URLs into jobs/<slug>.md")
+    parser.add_argument("url", nargs="?", help="job URL to scrape")
+    parser.add_argument("--batch", metavar="FILE", help='file with one URL per line ("-" for stdin)')
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"URLs scraped or checked at once in the batch modes and worker mode (default {DEFAULT_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"max simultaneous requests per host (default {DEFAULT_PER_HOST})")
+    parser.add_argument("--issues", metavar="FILE",
+                        help='submission issues to ingest, one JSON object per line ("-" for stdin)')
+    parser.add_argument("--manifest", metavar="FILE", help="issues: write each issue's outcome to FILE")
+    parser.add_argument("--crawl", metavar="SEED", action="append", default=[],
+                        help="crawl a careers page or sitemap for postings (repeatable)")
+    parser.add_argument("--crawl-seeds", metavar="FILE", help='file with one crawl seed per line ("-" for stdin)')
+    parser.add_argument("--max-pages", type=int, default=crawler.MAX_PAGES,
+                        help=f"crawl: pages fetched per seed (default {crawler.MAX_PAGES})")
+    parser.add_argument("--max-depth", type=int, default=crawler.MAX_DEPTH,
+                        help=f"crawl: links followed from a seed page (default {crawler.MAX_DEPTH})")
+    parser.add_argument("--check-links", action="store_true",
+                        help="check listed postings that are due; expire closed ones, refresh changed ones")
+    parser.add_argument("--max-checks", type=int, metavar="N", help="check-links: postings checked per run")
+    parser.add_argument("--check-all", action="store_true",
+                        help="check-links: check every open posting, ignoring the schedule")
+    parser.add_argument("--serve", action="store_true",
+                        help="worker mode: read JSON-line requests on stdin, answer on stdout")
+    parser.add_argument("--socket", metavar="PATH", help="worker mode on a Unix socket at PATH")
+    parser.add_argument("--board", metavar="REF",
+                        help="import every posting on an ATS board (board URL, posting URL or slug with --ats)")
+    parser.add_argument("--ats", choices=sorted(BOARD_LISTERS), help="board type when --board is a bare slug")
+    parser.add_argument("--allow-duplicate", action="store_true",
+                        help="skip the already-listed and near-duplicate checks")
+    parser.add_argument("--build-data", action="store_true",
+                        help="rebuild data/jobs.json and data/seekers.json incrementally afterwards")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR),
+                        help="response cache directory (default .cache/http)")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help="extra attempts after a timeout, connection error, 429 or 5xx (default 3)")
+    parser.add_argument("--deadline", type=float, default=DEADLINE,
+                        help=f"seconds allowed for the page/Jina stage of one URL (default {DEADLINE})")
+    parser.add_argument("--hedge-delay", type=float, default=HEDGE_DELAY,
+                        help=f"seconds before the second strategy joins the race (default {HEDGE_DELAY:g})")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help='append one JSON line of timings per URL to FILE ("-" for stderr)')
+    parser.add_argument("--prometheus", metavar="FILE",
+                        help="write Prometheus-style counters and histograms to FILE")
+    parser.add_argument("--profile-slow", metavar="SECONDS", type=float,
+                        help="profile parsing and save the profiles of URLs slower than SECONDS")
+    parser.add_argument("--profile-dir", default=str(scrape_metrics.PROFILE_DIR),
+                        help="where --profile-slow saves profiles (default .cache/profiles)")
+    parser.add_argument("--stand-in", metavar="URL",
+                        help="send every request to this stand-in server instead (see bench/stand_in.py)")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument("--no-cache", action="store_true", help="bypass the response cache")
+    cache_mode.add_argument("--refresh", action="store_true",
+                            help="revalidate every cached response with the origin")
+    cache_mode.add_argument("--offline", action="store_true",
+                            help="serve only from the response cache; never touch the network")
+    args = parser.parse_args()
+
+    set_host_limit(args.per_host)
+    set_dedupe(not args.allow_duplicate)
+    set_race(args.deadline, args.hedge_delay)
+    set_retries(args.retries)
+    set_stand_in(args.stand_in)
+    configure_metrics(args.metrics, args.prometheus, args.profile_slow, args.profile_dir)
+    if args.no_cache:
+        configure_cache(None)
+    else:
+        configure_cache(args.cache_dir, "offline" if args.offline else "refresh" if args.refresh else "default")
+
+    seeds = args.crawl + (read_urls(args.crawl_seeds) if args.crawl_seeds else [])
+    if not (args.serve or args.socket or seeds or args.check_links or args.board or args.batch or args.issues
+            or args.url):
+        print("Usage: scrape-job-url.py <job_url> | --batch <file> | --issues <file> | --board <ref> | --crawl <seed>"
+              " | --check-links | --serve | --socket <path>", file=sys.stderr)
+        sys.exit(1)
+
+    status = 0
+    if args.serve or args.socket:
+        run_worker(args.socket, args.workers)
+    elif seeds:
+        status = 1 if run_crawl(seeds, args.workers, args.max_pages, args.max_depth) else 0
+    elif args.check_links:
+        status = 1 if run_link_check(args.workers, args.max_checks, args.check_all) else 0
+    elif args.board:
+        try:
+            results = import_board(args.board, args.ats)
+        except Exception as e:
+            print(f"Board import failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        for result in results:
+            print(json.dumps(result))
+    elif args.batch:
+        status = 1 if run_batch(read_urls(args.batch), args.workers) else 0
+    elif args.issues:
+        status = 1 if run_issue_queue(read_issues(args.issues), args.workers, args.manifest) else 0
+    else:
+        result = ingest_url(normalize_url(args.url))
+        save_index()
+        save_history()
+        save_metrics(final=True)
+        print(result["path"])
+
+    if args.build_data:
+        import build_data
+
+        for name, s in build_data.build_all().items():
+            state = "written" if s["written"] else "unchanged"
+            print(f"[build] {name}: {s['parsed']} parsed, {s['reused']} reused, {state}", file=sys.stderr)
+    sys.exit(status)
 
 
 if __name__ == "__main__":
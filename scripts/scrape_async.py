@@ -0,0 +1,1499 @@
+"""
+Asyncio scraping engine behind scrape-job-url.py.
+
+Strategies, in the order they are tried:
+  1. Greenhouse public JSON API  (boards.greenhouse.io / job-boards.greenhouse.io)
+  2. Lever public JSON API       (jobs.lever.co)
+  3. Ashby posting API           (jobs.ashbyhq.com)
+  4. Workable API                (apply.workable.com)
+  5. SmartRecruiters API         (jobs.smartrecruiters.com)
+  6. Recruitee API               (<company>.recruitee.com)
+  7. LinkedIn guest job posting  (linkedin.com/jobs/view/<id>; a small HTML fragment)
+  8. JSON-LD JobPosting schema   (Indeed, most modern ATS)
+  9. Static HTML heuristics      (BeautifulSoup title + body extraction)
+ 10. Jina Reader API fallback    (r.jina.ai — handles JS-rendered pages)
+
+API extractors (1-7) are registered per host and picked by a dict lookup on
+the URL's host plus a path pattern; add a new ATS with @register_api(...).
+Page extractors (8, 9) all run off a single fetch and parse of the page, in
+registration order. The page fetch and Jina race under one deadline per URL;
+see AsyncScraper._race.
+
+All network I/O runs on the event loop through one aiohttp session, behind the
+response cache (http_cache.py), a per-host concurrency limit and the retry /
+rate-limit / circuit-breaker guard (resilience.py). BeautifulSoup parsing and
+HTML-to-text conversion run on an executor, so a slow parse never stalls the
+other requests in flight. aiohttp is imported when the first scraper is made
+and BeautifulSoup only when a whole page has to be parsed, so API-only runs
+never load the HTML parser.
+
+Usage from async code:
+  async with AsyncScraper() as scraper:
+      strategy, fm, description = await scraper.scrape(url)
+      async for result in scraper.scrape_many(urls, concurrency=64):
+          ...
+
+or the one-off helpers scrape_url_async(url) and scrape_urls_async(urls).
+"""
+
+import asyncio
+import codecs
+import contextvars
+import hashlib
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from functools import partial
+from html import unescape
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlparse, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import job_facets
+import job_skills
+import scrape_metrics
+from host_history import HostHistory
+from html_extract import (
+    LdScanner,
+    Page,
+    bounded_text,
+    html_to_text,
+    main_text,
+    make_soup,
+    scan_page,
+    sniff_encoding,
+)
+from http_cache import HttpCache
+from job_index import posting_key
+from resilience import Guard
+from scrape_metrics import timed
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from scrape_metrics import Metrics
+
+# Text extraction is timed into the current trace (see scrape_metrics.py).
+html_to_text = timed("text")(html_to_text)
+main_text = timed("text")(main_text)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "http"
+HEADERS = {
+    "User-Agent": "OWASP-BLT-Jobs-Bot/1.0 (https://github.com/OWASP-BLT/BLT-Jobs)"
+}
+
+# URLs scraped at once by scrape_many, and simultaneous requests per host
+# (e.g. boards-api.greenhouse.io, r.jina.ai), regardless of how many URLs share it.
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 4
+
+# Connections kept open by the shared session (keep-alive and TLS sessions are
+# reused across strategies and URLs).
+POOL_LIMIT = 100
+TIMEOUTS = {
+    "api": 15,          # ATS JSON APIs, LinkedIn guest fragments
+    "page": 15,         # static HTML fetch
+    "render": 45,       # Jina Reader (renders the page server-side)
+}
+
+# Static fetch vs Jina race (see _race): the whole page + Jina stage of one URL
+# must finish within DEADLINE seconds. The strategy that usually works for the
+# host starts first; the other one starts HEDGE_DELAY seconds later (sooner for
+# hosts whose history shows they answer quickly) unless the first has won.
+DEADLINE = 40
+HEDGE_DELAY = 4.0
+
+# Response cache lifetimes (seconds) before a cached response is revalidated.
+CACHE_TTLS = {
+    "api": 3600,
+    "page": 3600,
+    "render": 3600,
+}
+BOARD_TTL = 7 * 24 * 3600  # Greenhouse board metadata (company name) rarely changes
+
+# Static pages are streamed: reading stops at this many bytes, or as soon as a
+# usable JSON-LD JobPosting has arrived, whichever comes first.
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+STREAM_CHUNK = 64 * 1024
+
+LEVER_PAGE_SIZE = 100
+SMARTRECRUITERS_PAGE_SIZE = 100  # the API's maximum
+
+
+def org_from_host(url: str) -> str:
+    host = urlparse(url).netloc or ""
+    return host.replace("www.", "").split(".")[0].replace("-", " ").title()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def _response(resp: "aiohttp.ClientResponse", body: bytes) -> requests.Response:
+    """A fully read aiohttp response as a requests.Response (what the cache and extractors use)."""
+    r = requests.Response()
+    r.url = str(resp.url)
+    r.status_code = resp.status
+    r.reason = resp.reason
+    r.headers = CaseInsensitiveDict(resp.headers)
+    r.encoding = get_encoding_from_headers(r.headers)
+    r._content = body
+    r._content_consumed = True
+    return r
+
+
+def stand_in_url(base: str, url: str) -> str:
+    """url as requested from a stand-in server at base: the original host becomes the first path segment."""
+    parts = urlsplit(url)
+    return f"{base.rstrip('/')}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+class StreamedResponse:
+    """An aiohttp response whose body is still to be read (AsyncScraper.get(stream=True))."""
+
+    def __init__(self, resp: "aiohttp.ClientResponse", timing: scrape_metrics.Request | None = None):
+        self._resp = resp
+        self._timing = timing
+        self.url = str(resp.url)
+        self.status_code = resp.status
+        self.reason = resp.reason
+        self.headers = CaseInsensitiveDict(resp.headers)
+        self.encoding = get_encoding_from_headers(self.headers)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error: {self.reason} for url: {self.url}",
+                                     response=self)
+
+    async def iter_chunks(self, size: int):
+        async for chunk in self._resp.content.iter_chunked(size):
+            if self._timing is not None:
+                self._timing.received(len(chunk))
+            yield chunk
+
+    def release(self) -> None:
+        """Return the connection to the pool (it is closed instead if the body was not read)."""
+        self._resp.release()
+
+    def close(self) -> None:
+        self._resp.close()
+
+
+async def iter_body(resp, size: int = STREAM_CHUNK):
+    """Chunks of a streamed network response, or of a cached body already in memory."""
+    if isinstance(resp, StreamedResponse):
+        async for chunk in resp.iter_chunks(size):
+            yield chunk
+    else:
+        body = resp.content
+        for i in range(0, len(body), size):
+            yield body[i:i + size]
+
+
+# ---------------------------------------------------------------------------
+# Extractor registry
+# ---------------------------------------------------------------------------
+
+class Route:
+    """An API extractor bound to a path pattern on one or more hosts."""
+
+    def __init__(self, name: str, fn, path: str):
+        self.name = name
+        self.fn = fn
+        self.path = re.compile(path)
+
+
+# host -> routes tried in registration order; lookup is one dict access per URL
+# ("*.example.com" entries catch per-company subdomains, one more access)
+_API_ROUTES: dict[str, list[Route]] = {}
+# (name, fn(url, page)) run in order against a single fetched and scanned page
+PAGE_EXTRACTORS: list[tuple[str, object]] = []
+
+
+def register_api(name: str, hosts, path: str):
+    """Register the coroutine fn(scraper, url, match) as the extractor for URLs on hosts whose path matches.
+
+    The regex is matched against the URL path; its named groups are available
+    on the match passed to fn. fn returns (frontmatter, description) or None.
+    A host of the form "*.example.com" matches every subdomain of example.com.
+    """
+    def decorator(fn):
+        route = Route(name, fn, path)
+        for host in hosts:
+            _API_ROUTES.setdefault(host.lower(), []).append(route)
+        return fn
+    return decorator
+
+
+def register_page(name: str):
+    """Register fn(url, page) as a page extractor; it returns a result or None.
+
+    page is an html_extract.Page: the parsed soup plus what one walk over it
+    found. Page extractors are plain functions and run on the parse executor.
+    """
+    def decorator(fn):
+        PAGE_EXTRACTORS.append((name, fn))
+        return fn
+    return decorator
+
+
+def match_api(url: str):
+    """Return (route, match) for the API extractor that handles url, or (None, None)."""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    routes = _API_ROUTES.get(host, [])
+    if "." in host:
+        routes = routes + _API_ROUTES.get("*." + host.split(".", 1)[1], [])
+    for route in routes:
+        m = route.path.match(parsed.path)
+        if m:
+            return route, m
+    return None, None
+
+
+def _match_for(url: str, name: str):
+    route, m = match_api(url)
+    return m if route is not None and route.name == name else None
+
+
+# ---------------------------------------------------------------------------
+# Scraper
+# ---------------------------------------------------------------------------
+
+def transient_errors() -> tuple:
+    """Exceptions the guard retries: connection errors and timeouts."""
+    import aiohttp
+
+    return (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class AsyncScraper:
+    """One aiohttp session plus the per-host limits, cache and history shared by its requests.
+
+    Use it as an async context manager, or call close() when done. The cache
+    (an HttpCache), host history (a HostHistory) and guard (a resilience.Guard)
+    can be shared between scrapers; by default there is no cache and the
+    history only lives as long as the scraper. executor runs the parsing work
+    (None: the event loop's default thread pool). stand_in is the base URL of
+    a server that answers every request in place of the real hosts (see
+    stand_in_url and bench/stand_in.py); cache keys, host limits and host
+    history still use the original URLs. metrics (a scrape_metrics.Metrics)
+    traces every scrape: attempts, request timings and parse time.
+    """
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST, cache: HttpCache | None = None,
+                 history: HostHistory | None = None, guard: Guard | None = None,
+                 deadline: float = DEADLINE, hedge_delay: float = HEDGE_DELAY, executor=None,
+                 stand_in: str | None = None, metrics: "Metrics | None" = None):
+        self.per_host = max(1, per_host)
+        self.cache = cache
+        self.history = history if history is not None else HostHistory(None)
+        self.guard = guard or Guard(transient=transient_errors())
+        self.deadline = max(1.0, deadline)
+        self.hedge_delay = max(0.0, hedge_delay)
+        self.executor = executor
+        self.stand_in = stand_in
+        self.metrics = metrics
+        self._session = None
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._waiting: dict[asyncio.Future, int] = {}  # shared fetch -> callers awaiting it
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self) -> None:
+        inflight = list(self._inflight.values())
+        for future in inflight:
+            future.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def session(self) -> "aiohttp.ClientSession":
+        """The shared session, created on first use inside the running loop."""
+        if self._session is None:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=POOL_LIMIT, ttl_dns_cache=300)
+            trace_configs = [scrape_metrics.trace_config()] if self.metrics is not None else []
+            self._session = aiohttp.ClientSession(headers=HEADERS, connector=connector,
+                                                  trace_configs=trace_configs)
+        return self._session
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = asyncio.Semaphore(self.per_host)
+        return slot
+
+    async def parse(self, fn, *args):
+        """Run CPU-bound parsing (BeautifulSoup, HTML to text) off the event loop.
+
+        It runs in a copy of the caller's context, so its time counts towards
+        the scrape being traced.
+        """
+        run = partial(contextvars.copy_context().run, scrape_metrics.call, fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+
+    async def get(self, url: str, kind: str = "page", headers: dict | None = None,
+                  ttl: float | None = None, stream: bool = False, timeout: float | None = None):
+        """GET via the response cache and shared session, within the per-host limit.
+
+        kind selects the timeout from TIMEOUTS and the cache lifetime from
+        CACHE_TTLS (ttl overrides it); headers are merged over HEADERS.
+
+        Network requests go through the resilience guard: the host's rate
+        limit, retries with backoff within the timeout, and a circuit breaker
+        per host and kind that raises CircuitOpen instead of sending to a host
+        that keeps failing.
+
+        Returns a requests.Response with the body read. Identical requests in
+        flight at the same time share one fetch and one response (e.g. the
+        board behind several postings of one company). With stream=True a
+        network response is returned as an unread StreamedResponse and is not
+        cached; call store() once its whole body has been read.
+        """
+        timeout = timeout or TIMEOUTS[kind]
+        host = urlparse(url).netloc
+        target = stand_in_url(self.stand_in, url) if self.stand_in else url
+
+        async def send(timing: scrape_metrics.Request | None, validators: dict | None):
+            import aiohttp
+
+            if timing is not None:
+                timing.begin()
+            async with self._slot(host):
+                resp = await self.session().get(target, headers={**(headers or {}), **(validators or {})},
+                                                timeout=aiohttp.ClientTimeout(total=None, sock_connect=timeout,
+                                                                              sock_read=timeout),
+                                                trace_request_ctx=timing)
+                if stream:
+                    return StreamedResponse(resp, timing)
+                try:
+                    return _response(resp, await resp.read())
+                finally:
+                    resp.release()
+
+        async def fetch(timing: scrape_metrics.Request | None, validators: dict | None = None):
+            return await self.guard.call_async(host, kind, partial(send, timing, validators), budget=timeout)
+
+        async def load():
+            timing = scrape_metrics.request(url, kind)
+            if self.cache is None:
+                return await fetch(timing)
+            resp = await self.cache.get_async(url, partial(fetch, timing), headers=headers,
+                                              ttl=CACHE_TTLS[kind] if ttl is None else ttl, store=not stream)
+            if timing is not None and timing.cached:
+                timing.hit(len(resp.content))
+            return resp
+
+        if stream:
+            return await load()
+        key = (url, kind, ttl, tuple(sorted((headers or {}).items())))
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = self._inflight[key] = asyncio.ensure_future(load())
+            shared.add_done_callback(partial(self._landed, key))
+        # Shielded: one caller giving up (a lost race) must not cancel the others' fetch.
+        # Once the last caller has given up, nobody wants the answer: the fetch is
+        # cancelled, which the guard records as a release, not a failure.
+        self._waiting[shared] = self._waiting.get(shared, 0) + 1
+        try:
+            return await asyncio.shield(shared)
+        finally:
+            left = self._waiting.pop(shared) - 1
+            if left:
+                self._waiting[shared] = left
+            elif not shared.done():
+                shared.cancel()
+
+    def _landed(self, key: tuple, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # retrieved, so an error nobody awaited is not logged as lost
+
+    async def store(self, url: str, resp, body: bytes, kind: str = "page", headers: dict | None = None) -> None:
+        """Cache the complete body of a response fetched with get(stream=True)."""
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, url, resp, body, headers=headers, ttl=CACHE_TTLS[kind])
+
+    # -- dispatch --------------------------------------------------------------
+
+    async def _attempt(self, strategy: str, url: str, deadline: float):
+        """Run one racing strategy within the deadline and record how it went.
+
+        A loser cancelled by the winner raises CancelledError before anything
+        is recorded: being cut off says nothing about the host.
+        """
+        started = time.monotonic()
+        remaining = deadline - started
+        if remaining <= 0:
+            return None
+        found = None
+        with scrape_metrics.attempt(strategy) as attempt:
+            reason = "no posting on the page" if strategy == "page" else "nothing rendered"
+            try:
+                if strategy == "page":
+                    found = await scrape_page(self, url, timeout=min(TIMEOUTS["page"], remaining))
+                else:
+                    result = await fetch_jina(self, url, timeout=min(TIMEOUTS["render"], remaining))
+                    found = ("jina", result) if result is not None else None
+            except Exception as e:
+                print(f"{strategy} failed: {e}", file=sys.stderr)
+                reason = str(e) or e.__class__.__name__
+            attempt.finish(found is not None, reason)
+        self.history.record(urlparse(url).netloc.lower(), strategy, found is not None,
+                            time.monotonic() - started)
+        return found
+
+    def _can_hedge(self, strategy: str, host: str) -> bool:
+        """Whether the guard can spare a hedged request for strategy on url's host."""
+        if strategy == "jina":
+            return self.guard.can_spare(JINA_HOST, "render")
+        return self.guard.can_spare(host, "page")
+
+    async def _race(self, url: str, deadline: float):
+        """Static fetch vs Jina: the first acceptable result wins. Returns (name, result) or None.
+
+        The strategy the host's history favours starts first. The other starts
+        once the first has failed or after the hedge delay, whichever is
+        sooner, and the loser is cancelled. A hedge is only started if its
+        host can spare the request (Guard.can_spare: enough rate-limit tokens
+        saved up, circuit closed); otherwise the other strategy waits until
+        the first has failed. A cancelled loser counts as neither a success
+        nor a failure for its circuit.
+        """
+        host = urlparse(url).netloc.lower()
+        first = self.history.first_strategy(host)
+        second = "jina" if first == "page" else "page"
+        delay = self.history.hedge_delay(host, first, self.hedge_delay)
+        hedge_at = time.monotonic() + delay
+
+        pending = {asyncio.create_task(self._attempt(first, url, deadline)): first}
+        hedged = False
+        try:
+            while pending:
+                now = time.monotonic()
+                until = deadline if hedged else min(hedge_at, deadline)
+                done, _ = await asyncio.wait(pending, timeout=max(0.0, until - now),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    strategy = pending.pop(task)
+                    found = task.result()
+                    if found is not None:
+                        if pending:
+                            print(f"[race] {strategy} won for {host}", file=sys.stderr)
+                        return found
+                now = time.monotonic()
+                if now >= deadline:
+                    print(f"[race] deadline of {self.deadline:g}s reached for {url}", file=sys.stderr)
+                    return None
+                if not hedged and (not pending or now >= hedge_at):
+                    if pending and not self._can_hedge(second, host):
+                        print(f"[race] {first} still running after {delay:.1f}s; "
+                              f"{second} cannot be spared, not hedging", file=sys.stderr)
+                        hedge_at = deadline  # start it only if the first fails
+                        continue
+                    if pending:
+                        print(f"[race] {first} still running after {delay:.1f}s; starting {second}",
+                              file=sys.stderr)
+                    pending[asyncio.create_task(self._attempt(second, url, deadline))] = second
+                    hedged = True
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def extract(self, url: str):
+        """Return (strategy name, result) using the fewest fetches that can succeed."""
+        deadline = time.monotonic() + self.deadline
+        route, m = match_api(url)
+        if route is not None:
+            with scrape_metrics.attempt(route.name) as attempt:
+                result = await route.fn(self, url, m)
+                attempt.finish(result is not None, "no posting in the API response")
+            if result is not None:
+                return route.name, result
+
+        found = await self._race(url, deadline)
+        if found is not None:
+            return found
+
+        scrape_metrics.note("placeholder", "no strategy found a posting")
+        return "jina", jina_placeholder(url)
+
+    async def scrape(self, url: str) -> tuple[str, dict, str]:
+        """(strategy, frontmatter, description) for url, with skills and requirements filled."""
+        with scrape_metrics.trace(self.metrics, url) as trace:
+            strategy, (fm_partial, description) = await self.extract(url)
+            fm = await self.parse(finish_frontmatter, fm_partial, url, description)
+            if trace is not None:
+                trace.strategy = strategy
+            return strategy, fm, description
+
+    async def scrape_result(self, url: str) -> dict:
+        """scrape() as one scrape_many result dict; errors are reported in it, not raised."""
+        started = time.monotonic()
+        result = {"url": url, "strategy": None, "frontmatter": None, "description": None,
+                  "error": None, "elapsed": 0.0}
+        try:
+            result["strategy"], result["frontmatter"], result["description"] = await self.scrape(url)
+        except Exception as e:
+            result["error"] = str(e) or e.__class__.__name__
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        return result
+
+    async def scrape_many(self, urls, concurrency: int = DEFAULT_CONCURRENCY):
+        """Scrape urls (an iterable or async iterable), at most `concurrency` at a time.
+
+        Yields one dict per URL as it finishes:
+          {"url", "strategy", "frontmatter", "description", "error", "elapsed"}
+        A URL that fails has error set; it never stops the others. URLs are
+        pulled from urls only as workers free up, so it can be an open-ended
+        stream.
+        """
+        concurrency = max(1, concurrency)
+        todo: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def feed():
+            try:
+                if hasattr(urls, "__aiter__"):
+                    async for url in urls:
+                        await todo.put(url)
+                else:
+                    for url in urls:
+                        await todo.put(url)
+            finally:
+                for _ in range(concurrency):
+                    await todo.put(None)
+
+        async def work():
+            while (url := await todo.get()) is not None:
+                await done.put(await self.scrape_result(url))
+            await done.put(None)
+
+        feeder = asyncio.create_task(feed())
+        workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+        try:
+            running = concurrency
+            while running:
+                result = await done.get()
+                if result is None:
+                    running -= 1
+                else:
+                    yield result
+            await feeder  # re-raise an error from the urls iterator
+        finally:
+            for task in (feeder, *workers):
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+
+
+async def scrape_url_async(url: str, **options) -> tuple[dict, str]:
+    """(frontmatter, description) for one URL; options are passed to AsyncScraper."""
+    async with AsyncScraper(**options) as scraper:
+        _, fm, description = await scraper.scrape(url)
+        return fm, description
+
+
+async def scrape_urls_async(urls, concurrency: int = DEFAULT_CONCURRENCY, **options):
+    """Async iterator over AsyncScraper.scrape_many results from a scraper of its own."""
+    async with AsyncScraper(**options) as scraper:
+        async for result in scraper.scrape_many(urls, concurrency):
+            yield result
+
+
+def build_frontmatter(fm_partial: dict, url: str, created: str | None = None) -> dict:
+    """Expand an extractor's partial frontmatter into the full jobs/*.md field set."""
+    if created is None:
+        created = datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ") if hasattr(datetime, "UTC") else datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "title":                   fm_partial.get("title", "Job Listing"),
+        "organization_name":       fm_partial.get("organization_name", "Company"),
+        "organization_logo":       "",
+        "location":                fm_partial.get("location", ""),
+        "job_type":                job_facets.job_type(fm_partial.get("job_type")),
+        "salary_range":            fm_partial.get("salary_range", ""),
+        "expires_at":              "",
+        "application_email":       "",
+        "application_url":         fm_partial.get("application_url", url),
+        "application_instructions": "",
+        "requirements":            "",
+        "skills":                  "",
+        "created_at":              created,
+        "views_count":             0,
+    }
+
+
+@timed("skills")
+def finish_frontmatter(fm_partial: dict, url: str, description: str) -> dict:
+    """build_frontmatter plus the skills and requirements found in the description."""
+    fm = build_frontmatter(fm_partial, url)
+    job_skills.annotate(fm, description)
+    return fm
+
+
+def salary_range(currency, minimum, maximum) -> str:
+    """"USD 90000–120000", or the one bound given, or ""."""
+    currency = currency or ""
+    if minimum and maximum:
+        return f"{currency} {minimum}–{maximum}".strip()
+    if minimum or maximum:
+        return f"{currency} {minimum or maximum}".strip()
+    return ""
+
+
+def remote_location(location: str, remote) -> str:
+    """location, marked remote when the ATS flags the posting remote but the text doesn't say so."""
+    location = (location or "").strip()
+    if remote and "remote" not in location.lower():
+        return f"{location} (Remote)" if location else "Remote"
+    return location
+
+
+def _content_version(data: dict) -> str:
+    """Hash of a listing entry, for board APIs that give no update timestamp."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# 1. Greenhouse API
+# ---------------------------------------------------------------------------
+
+GREENHOUSE_HOSTS = {
+    "boards.greenhouse.io",
+    "boards.eu.greenhouse.io",
+    "job-boards.greenhouse.io",
+    "job-boards.eu.greenhouse.io",
+}
+
+
+@register_api("greenhouse", GREENHOUSE_HOSTS, r"/(?P<company>[^/]+)/jobs/(?P<job_id>[^/]+)")
+async def scrape_greenhouse(scraper: AsyncScraper, url: str, m=None):
+    m = m or _match_for(url, "greenhouse")
+    if m is None:
+        return None
+
+    company, job_id = m["company"], m["job_id"]
+    api_base = greenhouse_api_base(urlparse(url).netloc)
+
+    # The board (company display name) and the job are independent requests;
+    # fetch the board alongside the job.
+    board = asyncio.create_task(greenhouse_board_name(scraper, api_base, company))
+    try:
+        jr = await scraper.get(f"{api_base}/{company}/jobs/{job_id}", kind="api")
+        jr.raise_for_status()
+        data = jr.json()
+    except Exception as e:
+        print(f"Greenhouse API error: {e}", file=sys.stderr)
+        board.cancel()
+        return None
+
+    return await scraper.parse(parse_greenhouse_job, data, await board, url)
+
+
+def greenhouse_api_base(host: str) -> str:
+    return (
+        "https://boards-api.eu.greenhouse.io/v1/boards"
+        if "eu" in host
+        else "https://boards-api.greenhouse.io/v1/boards"
+    )
+
+
+async def greenhouse_board_name(scraper: AsyncScraper, api_base: str, company: str) -> str:
+    """Company display name for a board, falling back to the title-cased slug."""
+    org_name = company.replace("-", " ").title()
+    try:
+        cr = await scraper.get(f"{api_base}/{company}", kind="api", ttl=BOARD_TTL)
+        if cr.ok:
+            org_name = cr.json().get("name", org_name)
+    except Exception as e:
+        print(f"Greenhouse board lookup error: {e}", file=sys.stderr)
+    return org_name
+
+
+def parse_greenhouse_job(data: dict, org_name: str, url: str) -> tuple[dict, str]:
+    title = (data.get("title") or "Job Listing").strip()
+    loc_obj = data.get("location") or {}
+    location = (loc_obj.get("name") or "").strip()
+    # Greenhouse returns HTML-entity-escaped HTML — unescape before parsing
+    description = html_to_text(unescape(data.get("content") or ""))
+
+    print(f"[Greenhouse API] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": "full-time",
+        "salary_range": "",
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 2. Lever API
+# ---------------------------------------------------------------------------
+
+@register_api("lever", {"jobs.lever.co"}, r"/(?P<company>[^/]+)/(?P<posting_id>[^/]+)")
+async def scrape_lever(scraper: AsyncScraper, url: str, m=None):
+    m = m or _match_for(url, "lever")
+    if m is None:
+        return None
+
+    company, posting_id = m["company"], m["posting_id"]
+
+    try:
+        r = await scraper.get(f"https://api.lever.co/v0/postings/{company}/{posting_id}", kind="api")
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        print(f"Lever API error: {e}", file=sys.stderr)
+        return None
+
+    return await scraper.parse(parse_lever_posting, data, company, url)
+
+
+def parse_lever_posting(data: dict, company: str, url: str) -> tuple[dict, str]:
+    title = (data.get("text") or "Job Listing").strip()
+    org_name = company.replace("-", " ").title()
+    cats = data.get("categories") or {}
+    location = (cats.get("location") or "").strip()
+    job_type = job_facets.job_type(cats.get("commitment"))
+
+    # Build description from multiple HTML fields Lever provides
+    html_parts = [data.get("description") or ""]
+    for lst in data.get("lists") or []:
+        html_parts.append(f"<h3>{lst.get('text', '')}</h3>")
+        html_parts.append(lst.get("content") or "")
+    html_parts.append(data.get("additional") or "")
+    description = html_to_text("\n".join(html_parts))
+
+    print(f"[Lever API] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": job_type,
+        "salary_range": "",
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 3. Ashby posting API
+# ---------------------------------------------------------------------------
+
+ASHBY_BOARD_API = "https://api.ashbyhq.com/posting-api/job-board"
+
+
+@register_api("ashby", {"jobs.ashbyhq.com"}, r"/(?P<company>[^/]+)/(?P<job_id>[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})")
+async def scrape_ashby(scraper: AsyncScraper, url: str, m=None):
+    m = m or _match_for(url, "ashby")
+    if m is None:
+        return None
+
+    company, job_id = m["company"], m["job_id"].lower()
+    # Ashby's public API serves whole boards only. Postings of one company
+    # scraped together share the board fetch (and its cache entry).
+    try:
+        jobs = await ashby_board(scraper, company)
+    except Exception as e:
+        print(f"Ashby API error: {e}", file=sys.stderr)
+        return None
+    job = next((j for j in jobs if str(j.get("id", "")).lower() == job_id), None)
+    if job is None:
+        print(f"Ashby API error: {job_id} is not on the {company} board", file=sys.stderr)
+        return None
+
+    return await scraper.parse(parse_ashby_job, job, company, url)
+
+
+async def ashby_board(scraper: AsyncScraper, company: str) -> list:
+    r = await scraper.get(f"{ASHBY_BOARD_API}/{company}?includeCompensation=true", kind="api")
+    r.raise_for_status()
+    return (await scraper.parse(r.json)).get("jobs") or []
+
+
+def parse_ashby_job(job: dict, company: str, url: str) -> tuple[dict, str]:
+    title = (job.get("title") or "Job Listing").strip()
+    org_name = unquote(company).replace("-", " ").title()
+    location = remote_location(job.get("location"), job.get("isRemote") or job.get("workplaceType") == "Remote")
+    comp = job.get("compensation") or {}
+    salary = comp.get("scrapeableCompensationSalarySummary") or comp.get("compensationTierSummary") or ""
+    description = html_to_text(job.get("descriptionHtml") or "") or (job.get("descriptionPlain") or "").strip()
+
+    print(f"[Ashby API] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": job_facets.job_type(job.get("employmentType")),
+        "salary_range": salary,
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 4. Workable API
+# ---------------------------------------------------------------------------
+
+WORKABLE_API = "https://apply.workable.com/api"
+
+
+@register_api("workable", {"apply.workable.com"}, r"/(?P<company>[^/]+)/j/(?P<job_id>[0-9A-Za-z]+)")
+async def scrape_workable(scraper: AsyncScraper, url: str, m=None):
+    m = m or _match_for(url, "workable")
+    if m is None:
+        return None
+
+    company, shortcode = m["company"], m["job_id"]
+    account = asyncio.create_task(workable_account_name(scraper, company))
+    try:
+        r = await scraper.get(f"{WORKABLE_API}/v3/accounts/{company}/jobs/{shortcode}", kind="api")
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        print(f"Workable API error: {e}", file=sys.stderr)
+        account.cancel()
+        return None
+
+    return await scraper.parse(parse_workable_job, data, await account, url)
+
+
+async def workable_account_name(scraper: AsyncScraper, company: str) -> str:
+    """Company display name for a Workable account, falling back to the title-cased slug."""
+    org_name = company.replace("-", " ").title()
+    try:
+        r = await scraper.get(f"{WORKABLE_API}/v1/widget/accounts/{company}", kind="api", ttl=BOARD_TTL)
+        if r.ok:
+            org_name = r.json().get("name") or org_name
+    except Exception as e:
+        print(f"Workable account lookup error: {e}", file=sys.stderr)
+    return org_name
+
+
+def parse_workable_job(data: dict, org_name: str, url: str) -> tuple[dict, str]:
+    """A job from the v3 jobs API or the v1 widget listing (the two name a few fields differently)."""
+    title = (data.get("title") or "Job Listing").strip()
+    loc = data.get("location") or {}
+    parts = [loc.get("city") or data.get("city"), loc.get("region") or data.get("state"),
+             loc.get("country") or data.get("country")]
+    location = remote_location(", ".join(p.strip() for p in parts if p and p.strip()),
+                               data.get("remote") or data.get("telecommuting") or data.get("workplace") == "remote")
+
+    html_parts = [data.get("description") or ""]
+    for field, heading in (("requirements", "Requirements"), ("benefits", "Benefits")):
+        if data.get(field):
+            html_parts.append(f"<h3>{heading}</h3>")
+            html_parts.append(data[field])
+    description = html_to_text("\n".join(html_parts))
+
+    print(f"[Workable API] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": job_facets.job_type(data.get("type") or data.get("employment_type")),
+        "salary_range": "",
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 5. SmartRecruiters API
+# ---------------------------------------------------------------------------
+
+SMARTRECRUITERS_API = "https://api.smartrecruiters.com/v1/companies"
+
+
+@register_api("smartrecruiters", {"jobs.smartrecruiters.com", "careers.smartrecruiters.com"},
+              r"/(?P<company>[^/]+)/(?P<job_id>\d+)")
+async def scrape_smartrecruiters(scraper: AsyncScraper, url: str, m=None):
+    m = m or _match_for(url, "smartrecruiters")
+    if m is None:
+        return None
+
+    try:
+        return await smartrecruiters_posting(scraper, m["company"], m["job_id"], url)
+    except Exception as e:
+        print(f"SmartRecruiters API error: {e}", file=sys.stderr)
+        return None
+
+
+async def smartrecruiters_posting(scraper: AsyncScraper, company: str, posting_id: str, url: str):
+    """Fetch and parse one posting (the board listing doesn't carry the job ad)."""
+    r = await scraper.get(f"{SMARTRECRUITERS_API}/{company}/postings/{posting_id}", kind="api")
+    r.raise_for_status()
+    return await scraper.parse(parse_smartrecruiters_posting, r.json(), company, url)
+
+
+def parse_smartrecruiters_posting(data: dict, company: str, url: str) -> tuple[dict, str]:
+    title = (data.get("name") or "Job Listing").strip()
+    org_name = ((data.get("company") or {}).get("name") or company.replace("-", " ").title()).strip()
+    loc = data.get("location") or {}
+    location = loc.get("fullLocation") or ", ".join(
+        p for p in (loc.get("city"), loc.get("region"), (loc.get("country") or "").upper()) if p)
+    location = remote_location(location, loc.get("remote"))
+
+    # The job ad comes in named sections, each with its own heading.
+    sections = (data.get("jobAd") or {}).get("sections") or {}
+    html_parts = []
+    for name in ("companyDescription", "jobDescription", "qualifications", "additionalInformation"):
+        section = sections.get(name) or {}
+        if section.get("text"):
+            if section.get("title"):
+                html_parts.append(f"<h3>{section['title']}</h3>")
+            html_parts.append(section["text"])
+    description = html_to_text("\n".join(html_parts))
+
+    print(f"[SmartRecruiters API] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": job_facets.job_type((data.get("typeOfEmployment") or {}).get("label")),
+        "salary_range": "",
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 6. Recruitee API
+# ---------------------------------------------------------------------------
+
+@register_api("recruitee", {"*.recruitee.com"}, r"/o/(?P<slug>[^/]+)")
+async def scrape_recruitee(scraper: AsyncScraper, url: str, m=None):
+    m = m or _match_for(url, "recruitee")
+    if m is None:
+        return None
+
+    company = urlparse(url).netloc.split(".")[0]
+    try:
+        r = await scraper.get(f"https://{company}.recruitee.com/api/offers/{m['slug']}", kind="api")
+        r.raise_for_status()
+        offer = r.json().get("offer") or {}
+    except Exception as e:
+        print(f"Recruitee API error: {e}", file=sys.stderr)
+        return None
+
+    return await scraper.parse(parse_recruitee_offer, offer, company, url)
+
+
+def parse_recruitee_offer(offer: dict, company: str, url: str) -> tuple[dict, str]:
+    title = (offer.get("title") or "Job Listing").strip()
+    org_name = (offer.get("company_name") or company.replace("-", " ").title()).strip()
+    location = offer.get("location") or ", ".join(
+        p for p in (offer.get("city"), offer.get("state_name"), offer.get("country")) if p)
+    location = remote_location(location, offer.get("remote"))
+    salary = offer.get("salary") or {}
+
+    html_parts = [offer.get("description") or ""]
+    if offer.get("requirements"):
+        html_parts.append("<h3>Requirements</h3>")
+        html_parts.append(offer["requirements"])
+    description = html_to_text("\n".join(html_parts))
+
+    print(f"[Recruitee API] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": job_facets.job_type(offer.get("employment_type_code")),
+        "salary_range": salary_range(salary.get("currency"), salary.get("min"), salary.get("max")),
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 7. LinkedIn guest job posting
+# ---------------------------------------------------------------------------
+
+LINKEDIN_HOSTS = {"www.linkedin.com", "linkedin.com"}
+LINKEDIN_GUEST_API = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting"
+# LinkedIn answers unknown user agents with HTTP 999.
+LINKEDIN_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+# The only parts of the fragment that are parsed: the top card, the description
+# and the criteria list (plus the individual top-card fields, for layouts that
+# don't wrap them in entity-info).
+LINKEDIN_BLOCKS = (
+    "top-card-layout__entity-info",
+    "top-card-layout__title",
+    "topcard__title",
+    "topcard__org-name-link",
+    "topcard__flavor",
+    "compensation__salary",
+    "show-more-less-html__markup",
+    "description__text",
+    "description__job-criteria-list",
+)
+
+
+@register_api("linkedin", LINKEDIN_HOSTS, r"/(?:comm/)?jobs/")
+async def scrape_linkedin(scraper: AsyncScraper, url: str, m=None):
+    """The posting from LinkedIn's guest job-posting fragment, found by job ID.
+
+    /jobs/view/<id> and search or collection URLs with ?currentJobId=<id> are
+    understood. The fragment is a few tens of KB against a few hundred for
+    the full page, and only its top card and description are parsed.
+    """
+    job_id = linkedin_job_id(url)
+    if job_id is None:
+        return None
+
+    try:
+        r = await scraper.get(f"{LINKEDIN_GUEST_API}/{job_id}", kind="api", headers=LINKEDIN_HEADERS)
+        r.raise_for_status()
+    except Exception as e:
+        print(f"LinkedIn guest API error: {e}", file=sys.stderr)
+        return None
+
+    return await scraper.parse(parse_linkedin_posting, r.text, url)
+
+
+def linkedin_job_id(url: str) -> str | None:
+    key = posting_key(url)
+    return key.removeprefix("linkedin:") if key.startswith("linkedin:") else None
+
+
+def _linkedin_text(el) -> str:
+    return " ".join(el.get_text(" ", strip=True).split()) if el is not None else ""
+
+
+def parse_linkedin_posting(html: str, url: str) -> tuple[dict, str] | None:
+    with timed("parse"):
+        soup = make_soup(html, only_classes=LINKEDIN_BLOCKS)
+    title = _linkedin_text(soup.find(class_=["top-card-layout__title", "topcard__title"]))
+    if not title:
+        return None
+
+    org_name = _linkedin_text(soup.find("a", class_="topcard__org-name-link")
+                              or soup.find("span", class_="topcard__flavor")) or "LinkedIn"
+    location = _linkedin_text(soup.find("span", class_="topcard__flavor--bullet"))
+
+    criteria = {}
+    for item in soup.find_all("li", class_="description__job-criteria-item"):
+        criteria[_linkedin_text(item.find("h3")).lower()] = _linkedin_text(
+            item.find(class_="description__job-criteria-text"))
+
+    markup = soup.find(class_="show-more-less-html__markup") or soup.find(class_="description__text")
+    description = bounded_text(markup) if markup is not None else ""
+
+    print(f"[LinkedIn] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": job_facets.job_type(criteria.get("employment type")),
+        "salary_range": _linkedin_text(soup.find(class_="compensation__salary")),
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 8 & 9. Generic: JSON-LD + static HTML heuristics
+# ---------------------------------------------------------------------------
+
+def extract_json_ld(soup) -> dict | None:
+    """Return the first JobPosting JSON-LD block found, or None."""
+    return job_posting_from_ld_blocks(
+        script.string or "" for script in soup.find_all("script", type="application/ld+json")
+    )
+
+
+@timed("parse")
+def job_posting_from_ld_blocks(blocks) -> dict | None:
+    """Return the first JobPosting in an iterable of raw JSON-LD strings, or None."""
+    for block in blocks:
+        try:
+            raw = json.loads(block)
+            items = raw if isinstance(raw, list) else [raw]
+            if isinstance(raw, dict) and "@graph" in raw:
+                items = raw["@graph"]
+            for item in items:
+                if str(item.get("@type", "")).lower() in ("jobposting",):
+                    return item
+        except (json.JSONDecodeError, AttributeError):
+            continue
+    return None
+
+
+def parse_json_ld(ld: dict, url: str) -> tuple[dict, str]:
+    title = (ld.get("title") or ld.get("name") or "Job Listing").strip()
+
+    org_obj = ld.get("hiringOrganization") or {}
+    org_name = (org_obj.get("name") if isinstance(org_obj, dict) else str(org_obj)).strip() or org_from_host(url)
+
+    # Location
+    loc_obj = ld.get("jobLocation") or {}
+    if isinstance(loc_obj, list):
+        loc_obj = loc_obj[0] if loc_obj else {}
+    addr = (loc_obj.get("address") or {}) if isinstance(loc_obj, dict) else {}
+    if isinstance(addr, str):
+        location = addr
+    else:
+        parts = [
+            addr.get("addressLocality", ""),
+            addr.get("addressRegion", ""),
+            addr.get("addressCountry", ""),
+        ]
+        location = ", ".join(p for p in parts if p).strip(", ")
+    if not location and isinstance(loc_obj, dict):
+        location = loc_obj.get("name") or ""
+
+    # Employment type (a string or a list of schema.org values such as FULL_TIME)
+    emp = job_facets.job_type(ld.get("employmentType"))
+
+    # Salary
+    salary_obj = ld.get("baseSalary") or {}
+    salary = ""
+    if isinstance(salary_obj, dict):
+        val = salary_obj.get("value") or {}
+        if isinstance(val, dict):
+            salary = salary_range(salary_obj.get("currency", ""), val.get("minValue", ""), val.get("maxValue", ""))
+
+    description = html_to_text(ld.get("description") or "")
+
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": location,
+        "job_type": emp,
+        "salary_range": salary,
+        "application_url": url,
+    }, description
+
+
+async def stream_page(scraper: AsyncScraper, url: str, on_ld=None, max_bytes: int = MAX_PAGE_BYTES,
+                      timeout: float | None = None, ttl: float | None = None) -> tuple[str, object]:
+    """Stream a page, decoding incrementally, up to max_bytes.
+
+    on_ld(block) is awaited for each complete JSON-LD block as it arrives; if
+    it returns a result, reading stops and ("early", result) is returned.
+    Otherwise returns ("text", html) with whatever was read. Raises on fetch
+    errors. Only bodies read to the end are cached; ttl is passed to get().
+    """
+    r = await scraper.get(url, kind="page", stream=True, timeout=timeout, ttl=ttl)
+    try:
+        r.raise_for_status()
+        scanner = LdScanner()
+        raw = bytearray()
+        decoder = None
+        truncated = False
+        async for chunk in iter_body(r, STREAM_CHUNK):
+            if decoder is None:
+                # text/* without a charset defaults to ISO-8859-1 in requests;
+                # prefer what the page declares, then UTF-8.
+                declared = "charset" in r.headers.get("content-type", "").lower()
+                encoding = r.encoding if declared else sniff_encoding(chunk[:4096])
+                try:
+                    decoder = codecs.getincrementaldecoder(encoding)("replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+            if len(raw) + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - len(raw)]
+                truncated = True
+            raw += chunk
+            for block in scanner.feed(decoder.decode(chunk)):
+                result = await on_ld(block) if on_ld else None
+                if result is not None:
+                    return "early", result
+            if truncated:
+                print(f"Page exceeds {max_bytes} bytes; parsing the first part only", file=sys.stderr)
+                break
+        if decoder is not None:
+            scanner.feed(decoder.decode(b"", final=True))
+        if not truncated:
+            await scraper.store(url, r, bytes(raw))
+        return "text", scanner.text
+    finally:
+        r.close()
+
+
+def _result_from_ld(url: str, ld: dict | None):
+    if ld:
+        fm, description = parse_json_ld(ld, url)
+        if description or fm["title"] != "Job Listing":
+            print(f"[JSON-LD] {fm['organization_name']} — {fm['title']}", file=sys.stderr)
+            return fm, description
+    return None
+
+
+def _result_from_ld_block(url: str, block: str):
+    return _result_from_ld(url, job_posting_from_ld_blocks([block]))
+
+
+def json_ld_posting(url: str, html: str):
+    """(frontmatter, description) from a page's JSON-LD JobPosting, without parsing the HTML; or None."""
+    return _result_from_ld(url, job_posting_from_ld_blocks(LdScanner().feed(html)))
+
+
+def run_page_extractors(url: str, html: str):
+    """Parse html once and run every page extractor on it. Returns (name, result) or None."""
+    with timed("parse"):
+        page = scan_page(make_soup(html))
+    for name, extract in PAGE_EXTRACTORS:
+        result = extract(url, page)
+        if result is not None:
+            return name, result
+    return None
+
+
+async def scrape_page(scraper: AsyncScraper, url: str, timeout: float | None = None):
+    """Run every page extractor off a single fetch. Returns (name, result) or None.
+
+    A JSON-LD JobPosting that arrives while the page is still streaming ends
+    the fetch right there; the full parse only happens when it doesn't.
+    """
+    try:
+        kind, found = await stream_page(
+            scraper, url, on_ld=lambda block: scraper.parse(_result_from_ld_block, url, block),
+            timeout=timeout,
+        )
+    except Exception as e:
+        print(f"Static fetch error: {e}", file=sys.stderr)
+        return None
+    if kind == "early":
+        return "json-ld", found
+    return await scraper.parse(run_page_extractors, url, found)
+
+
+@register_page("json-ld")
+def extract_from_json_ld(url: str, page: Page):
+    """JSON-LD JobPosting (best quality)."""
+    return _result_from_ld(url, job_posting_from_ld_blocks(page.ld_json))
+
+
+@register_page("static")
+def extract_from_html(url: str, page: Page):
+    """Heuristic HTML extraction. None when the page looks JS-rendered."""
+    if not page.has_enough_text:
+        # Too little content — likely JS-rendered, signal caller to use fallback
+        return None
+
+    title = page.og_title or page.title
+    if not title:
+        title = page.h1.get_text(strip=True) if page.h1 else "Job Listing"
+
+    org_name = page.og_site_name or org_from_host(url)
+
+    description = main_text(page)
+    print(f"[Static HTML] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": "",
+        "job_type": "full-time",
+        "salary_range": "",
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# 10. Jina Reader fallback
+# ---------------------------------------------------------------------------
+
+def jina_placeholder(url: str) -> tuple[dict, str]:
+    """Minimal listing for a page nothing could extract: a link to the original."""
+    return {
+        "title": "Job Listing",
+        "organization_name": org_from_host(url),
+        "location": "", "job_type": "full-time", "salary_range": "",
+        "application_url": url,
+    }, f"See full listing at: {url}"
+
+
+JINA_HOST = "r.jina.ai"
+
+
+async def fetch_jina(scraper: AsyncScraper, url: str, timeout: float | None = None):
+    """Render and extract a page with r.jina.ai. Returns (frontmatter, description) or None."""
+    print("Trying Jina Reader API…", file=sys.stderr)
+    try:
+        r = await scraper.get(
+            f"https://{JINA_HOST}/{url}",
+            kind="render",
+            headers={"Accept": "text/plain", "X-Return-Format": "markdown"},
+            timeout=timeout,
+        )
+        r.raise_for_status()
+        content = r.text.strip()
+    except Exception as e:
+        print(f"Jina Reader error: {e}", file=sys.stderr)
+        return None
+    return parse_jina_markdown(content, url)
+
+
+def parse_jina_markdown(content: str, url: str) -> tuple[dict, str]:
+    lines = [l.strip() for l in content.splitlines() if l.strip()]
+
+    # Jina prepends "Title: ..." and "URL Source: ..." metadata lines
+    title = "Job Listing"
+    body_start = 0
+    for i, line in enumerate(lines):
+        if line.startswith("Title:"):
+            title = line[6:].strip()
+        elif line.startswith("URL Source:") or line.startswith("Markdown Content:"):
+            body_start = i + 1
+            break
+
+    description = "\n".join(lines[body_start:]) if body_start else "\n".join(lines[1:])
+    org_name = org_from_host(url)
+
+    print(f"[Jina Reader] {org_name} — {title}", file=sys.stderr)
+    return {
+        "title": title,
+        "organization_name": org_name,
+        "location": "", "job_type": "full-time", "salary_range": "",
+        "application_url": url,
+    }, description
+
+
+# ---------------------------------------------------------------------------
+# Board listing
+# ---------------------------------------------------------------------------
+
+async def list_greenhouse_board(scraper: AsyncScraper, company: str, host: str) -> list:
+    """(posting_id, version, url, parse) for every job on a board.
+
+    parse() returns (fm_partial, description). It is a plain function, to run
+    with scraper.parse() off the event loop, or a coroutine function when the
+    posting still has to be fetched (SmartRecruiters). It is only called for
+    postings that need writing.
+    """
+    api_base = greenhouse_api_base(host)
+    board = asyncio.create_task(greenhouse_board_name(scraper, api_base, company))
+    try:
+        r = await scraper.get(f"{api_base}/{company}/jobs?content=true", kind="api")
+        r.raise_for_status()
+    except BaseException:
+        board.cancel()
+        raise
+    org_name = await board
+    postings = []
+    for job in r.json().get("jobs") or []:
+        url = job.get("absolute_url") or f"https://{host}/{company}/jobs/{job['id']}"
+        postings.append((str(job["id"]), job.get("updated_at") or "", url,
+                         partial(parse_greenhouse_job, job, org_name, url)))
+    return postings
+
+
+async def list_lever_board(scraper: AsyncScraper, company: str, host: str) -> list:
+    """Like list_greenhouse_board, for a Lever company, fetched page by page."""
+    postings = []
+    skip = 0
+    while True:
+        r = await scraper.get(
+            f"https://api.lever.co/v0/postings/{company}?mode=json&skip={skip}&limit={LEVER_PAGE_SIZE}",
+            kind="api",
+        )
+        r.raise_for_status()
+        page = r.json() or []
+        for posting in page:
+            url = posting.get("hostedUrl") or f"https://{host}/{company}/{posting['id']}"
+            # The public postings API has no update timestamp; fall back to a content hash.
+            version = str(posting.get("updatedAt") or _content_version(posting))
+            postings.append((posting["id"], version, url, partial(parse_lever_posting, posting, company, url)))
+        if len(page) < LEVER_PAGE_SIZE:
+            return postings
+        skip += LEVER_PAGE_SIZE
+
+
+async def list_ashby_board(scraper: AsyncScraper, company: str, host: str) -> list:
+    """Like list_greenhouse_board, for an Ashby job board (one request)."""
+    postings = []
+    for job in await ashby_board(scraper, company):
+        url = job.get("jobUrl") or f"https://{host}/{company}/{job['id']}"
+        postings.append((job["id"], _content_version(job), url, partial(parse_ashby_job, job, company, url)))
+    return postings
+
+
+async def list_workable_board(scraper: AsyncScraper, company: str, host: str) -> list:
+    """Like list_greenhouse_board, for a Workable account (one request, descriptions included)."""
+    r = await scraper.get(f"{WORKABLE_API}/v1/widget/accounts/{company}?details=true", kind="api")
+    r.raise_for_status()
+    data = r.json()
+    org_name = data.get("name") or company.replace("-", " ").title()
+    postings = []
+    for job in data.get("jobs") or []:
+        url = f"https://{host}/{company}/j/{job['shortcode']}/"
+        postings.append((job["shortcode"], _content_version(job), url,
+                         partial(parse_workable_job, job, org_name, url)))
+    return postings
+
+
+async def list_smartrecruiters_board(scraper: AsyncScraper, company: str, host: str) -> list:
+    """Like list_greenhouse_board, for a SmartRecruiters company, fetched page by page.
+
+    The listing has no job ads, so parse fetches the posting itself.
+    """
+    postings = []
+    offset = 0
+    while True:
+        r = await scraper.get(
+            f"{SMARTRECRUITERS_API}/{company}/postings?limit={SMARTRECRUITERS_PAGE_SIZE}&offset={offset}",
+            kind="api",
+        )
+        r.raise_for_status()
+        data = r.json()
+        page = data.get("content") or []
+        for posting in page:
+            posting_id = str(posting["id"])
+            url = f"https://{host}/{company}/{posting_id}"
+            postings.append((posting_id, _content_version(posting), url,
+                             partial(smartrecruiters_posting, scraper, company, posting_id, url)))
+        offset += len(page)
+        if not page or offset >= (data.get("totalFound") or 0):
+            return postings
+
+
+async def list_recruitee_board(scraper: AsyncScraper, company: str, host: str) -> list:
+    """Like list_greenhouse_board, for a Recruitee careers site (one request)."""
+    r = await scraper.get(f"https://{company}.recruitee.com/api/offers/", kind="api")
+    r.raise_for_status()
+    postings = []
+    for offer in r.json().get("offers") or []:
+        url = offer.get("careers_url") or f"https://{host}/o/{offer['slug']}"
+        postings.append((str(offer["id"]), str(offer.get("updated_at") or _content_version(offer)), url,
+                         partial(parse_recruitee_offer, offer, company, url)))
+    return postings
+
+
+BOARD_LISTERS = {
+    "greenhouse": list_greenhouse_board,
+    "lever": list_lever_board,
+    "ashby": list_ashby_board,
+    "workable": list_workable_board,
+    "smartrecruiters": list_smartrecruiters_board,
+    "recruitee": list_recruitee_board,
+}
+# Board host per ATS, for a bare company slug ({company} is filled in).
+BOARD_HOSTS = {
+    "greenhouse": "boards.greenhouse.io",
+    "lever": "jobs.lever.co",
+    "ashby": "jobs.ashbyhq.com",
+    "workable": "apply.workable.com",
+    "smartrecruiters": "jobs.smartrecruiters.com",
+    "recruitee": "{company}.recruitee.com",
+}
@@ -0,0 +1,507 @@
+"""
+Instrumentation for the scraping engine: where the time goes, per URL.
+
+AsyncScraper(metrics=Metrics(...)) traces every scrape():
+  - each strategy attempt (ATS API, page fetch, Jina): how long it took, its
+    outcome (ok, failed, or cancelled when it lost the race or ran out of
+    deadline) and, when it failed, the reason the scraper fell back (the HTTP
+    status or error of its last request, or what was missing);
+  - each HTTP request an attempt made: time queued for a connection slot, DNS,
+    connect, time to first byte, download time, bytes received, status, and
+    whether the response cache answered it (from aiohttp's TraceConfig hooks);
+  - time spent parsing (BeautifulSoup, JSON-LD), extracting text (HTML to
+    text, main-content selection) and matching skills, on whichever thread ran it.
+
+A finished trace is written as one JSON line (Metrics(jsonl=...)) and folded
+into Prometheus-style counters and histograms (Metrics.prometheus(), or
+write_prometheus() for a node-exporter textfile collector). Hosts appear only
+in the JSON lines and in summary(), which lists the hosts and strategies that
+used the most time; metric labels stay a small fixed set.
+
+With profile_slow set, the parsing work of every URL (what AsyncScraper.parse
+runs) is run under cProfile, and URLs that took longer than profile_slow
+seconds have their profile saved to profile_dir as <host>-<hash>.prof; read
+them with pstats or snakeviz. Network waits are not in the profile; they are
+in the request timings. (From Python 3.12 only one cProfile can be active at a
+time, so concurrent parses may go unprofiled.)
+
+The current trace and attempt live in context variables. The tasks and executor
+calls a scrape starts are attributed to it without passing anything around,
+and outside a traced scrape every hook is a no-op.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import hashlib
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+PROFILE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "profiles"
+
+# Histogram bucket upper bounds, in seconds.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+REQUEST_PHASES = ("queued", "dns", "connect", "ttfb", "download")
+TOP = 10  # hosts and strategies listed by summary()
+
+# name -> (type, help)
+METRICS = {
+    "scrape_urls_total": ("counter", "URLs scraped, by winning strategy and outcome."),
+    "scrape_url_seconds": ("histogram", "Wall time per URL, by winning strategy."),
+    "scrape_attempts_total": ("counter", "Strategy attempts, by strategy and outcome."),
+    "scrape_attempt_seconds": ("histogram", "Wall time per strategy attempt."),
+    "scrape_requests_total": ("counter", "HTTP requests, by kind and result (cached, 2xx..5xx, error)."),
+    "scrape_response_bytes_total": ("counter", "Response bytes received from the network, by kind."),
+    "scrape_request_seconds": ("histogram", "HTTP request phases (queued, dns, connect, ttfb, download)."),
+    "scrape_work_seconds": ("histogram", "Parse, text extraction and skills time, by phase and strategy."),
+}
+
+_trace: contextvars.ContextVar = contextvars.ContextVar("scrape_trace", default=None)
+_attempt: contextvars.ContextVar = contextvars.ContextVar("scrape_attempt", default=None)
+
+
+def _since(mark: float) -> float:
+    return time.perf_counter() - mark
+
+
+# ---------------------------------------------------------------------------
+# Records
+# ---------------------------------------------------------------------------
+
+class Request:
+    """One logical GET. With retries, the timings are those of the last try."""
+
+    def __init__(self, url: str, kind: str):
+        self.url = url
+        self.kind = kind
+        self.cached = True   # until a try goes to the network
+        self.tries = 0
+        self.status = None
+        self.error = None
+        self.reused = False
+        self.bytes = 0
+        self.queued = self.dns = self.connect = self.ttfb = self.download = 0.0
+        self._begun = self._sent = self._headers = 0.0
+
+    def begin(self) -> None:
+        """A try starts (before waiting for the host's slot)."""
+        self.tries += 1
+        self.cached = False
+        self.status = self.error = None
+        self.reused = False
+        self.bytes = 0
+        self.queued = self.dns = self.connect = self.ttfb = self.download = 0.0
+        self._begun = time.perf_counter()
+
+    def sent(self) -> None:
+        now = time.perf_counter()
+        self.queued += now - self._begun
+        self._sent = now
+
+    def headers(self, status: int) -> None:
+        now = time.perf_counter()
+        self.status = status
+        self.ttfb = now - self._sent
+        self._headers = now
+
+    def received(self, size: int) -> None:
+        self.bytes += size
+        self.download = _since(self._headers)
+
+    def hit(self, size: int) -> None:
+        """Answered from the response cache."""
+        self.bytes = size
+
+    def failed(self, error: BaseException) -> None:
+        self.error = str(error) or error.__class__.__name__
+
+    def as_dict(self) -> dict:
+        data = {"url": self.url, "kind": self.kind, "cached": self.cached, "status": self.status,
+                "bytes": self.bytes}
+        if not self.cached:
+            data.update({"tries": self.tries, "reused": self.reused})
+            data.update({phase: round(getattr(self, phase), 4) for phase in REQUEST_PHASES})
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class Attempt:
+    """One strategy's go at a URL."""
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.outcome = "failed"
+        self.reason = None
+        self.elapsed = 0.0
+        self.requests: list[Request] = []
+        self.work: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def finish(self, ok: bool, reason: str = "") -> None:
+        """Record the outcome. A failure is put down to its last failed request if
+        there was one, else to reason."""
+        self.outcome = "ok" if ok else "failed"
+        self.reason = None if ok else (self._request_failure() or reason or "no result")
+
+    def _request_failure(self) -> str | None:
+        for request in reversed(self.requests):
+            if request.error:
+                return request.error
+            if request.status is not None and request.status >= 400:
+                return f"HTTP {request.status}"
+        return None
+
+    def as_dict(self) -> dict:
+        data = {"strategy": self.strategy, "outcome": self.outcome, "elapsed": round(self.elapsed, 4)}
+        if self.reason:
+            data["reason"] = self.reason
+        data["work"] = {phase: round(s, 4) for phase, s in self.work.items()}
+        data["requests"] = [r.as_dict() for r in self.requests]
+        return data
+
+
+class Trace:
+    """Everything recorded while scraping one URL."""
+
+    def __init__(self, url: str, profile: bool = False):
+        self.url = url
+        self.host = urlparse(url).netloc.lower()
+        self.strategy = None
+        self.outcome = "ok"
+        self.reason = None
+        self.elapsed = 0.0
+        self.attempts: list[Attempt] = []
+        self.requests: list[Request] = []    # made outside any attempt
+        self.work: dict[str, float] = {}      # outside any attempt (skills)
+        self.profile = profile
+        self.stats: pstats.Stats | None = None
+        self.profile_path = None
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def add_work(self, phase: str, seconds: float, attempt: Attempt | None) -> None:
+        with self._lock:
+            work = attempt.work if attempt is not None else self.work
+            work[phase] = work.get(phase, 0.0) + seconds
+
+    def add_profile(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if self.stats is None:
+                self.stats = pstats.Stats(profile)
+            else:
+                self.stats.add(profile)
+
+    def all_requests(self):
+        yield from self.requests
+        for attempt in self.attempts:
+            yield from attempt.requests
+
+    def as_dict(self) -> dict:
+        work: dict[str, float] = dict(self.work)
+        for attempt in self.attempts:
+            for phase, seconds in attempt.work.items():
+                work[phase] = work.get(phase, 0.0) + seconds
+        data = {
+            "url": self.url, "host": self.host, "strategy": self.strategy, "outcome": self.outcome,
+            "elapsed": round(self.elapsed, 4),
+            "bytes": sum(r.bytes for r in self.all_requests() if not r.cached),
+            "work": {phase: round(s, 4) for phase, s in work.items()},
+        }
+        if self.reason:
+            data["reason"] = self.reason
+        if self.profile_path:
+            data["profile"] = str(self.profile_path)
+        data["attempts"] = [a.as_dict() for a in self.attempts]
+        if self.requests:
+            data["requests"] = [r.as_dict() for r in self.requests]
+        return data
+
+
+# ---------------------------------------------------------------------------
+# Hooks (no-ops outside a traced scrape)
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def trace(metrics: "Metrics | None", url: str):
+    """Trace the scrape of url into metrics; yields the Trace, or None when metrics is None."""
+    if metrics is None:
+        yield None
+        return
+    record = Trace(url, profile=metrics.profile_slow is not None)
+    token = _trace.set(record)
+    try:
+        yield record
+    except asyncio.CancelledError:
+        record.outcome, record.reason = "cancelled", "cancelled"
+        raise
+    except Exception as e:
+        record.outcome, record.reason = "error", str(e) or e.__class__.__name__
+        raise
+    finally:
+        _trace.reset(token)
+        record.elapsed = _since(record._started)
+        try:
+            metrics.record(record)
+        except Exception as e:  # instrumentation must never fail a scrape
+            print(f"[metrics] could not record {url}: {e}", file=sys.stderr)
+
+
+@contextmanager
+def attempt(strategy: str):
+    """Attribute what happens inside to one strategy attempt; yields the Attempt to finish()."""
+    record = Attempt(strategy)
+    current = _trace.get()
+    if current is None:
+        yield record
+        return
+    with current._lock:
+        current.attempts.append(record)
+    token = _attempt.set(record)
+    try:
+        yield record
+    except asyncio.CancelledError:
+        record.outcome, record.reason = "cancelled", "cancelled (lost the race or out of time)"
+        raise
+    except Exception as e:
+        record.finish(False, str(e) or e.__class__.__name__)
+        raise
+    finally:
+        _attempt.reset(token)
+        record.elapsed = _since(record._started)
+
+
+def note(outcome: str, reason: str) -> None:
+    """Set the current trace's outcome (e.g. "placeholder" when every strategy failed)."""
+    current = _trace.get()
+    if current is not None:
+        current.outcome, current.reason = outcome, reason
+
+
+def request(url: str, kind: str) -> Request | None:
+    """A Request record in the current attempt (or trace), or None outside a traced scrape."""
+    current = _trace.get()
+    if current is None:
+        return None
+    record = Request(url, kind)
+    owner = _attempt.get()
+    with current._lock:
+        (owner.requests if owner is not None else current.requests).append(record)
+    return record
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the time spent inside to the current attempt's phase ("parse", "text", "skills").
+
+    Also works as a decorator: @timed("parse").
+    """
+    current = _trace.get()
+    if current is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        current.add_work(phase, _since(started), _attempt.get())
+
+
+def call(fn, *args):
+    """fn(*args), under cProfile when the current trace is being profiled."""
+    current = _trace.get()
+    if current is None or not current.profile:
+        return fn(*args)
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:  # another profiler is active in this process (Python 3.12+)
+        return fn(*args)
+    try:
+        return fn(*args)
+    finally:
+        profile.disable()
+        current.add_profile(profile)
+
+
+def trace_config():
+    """aiohttp TraceConfig feeding the Request passed as a request's trace_request_ctx."""
+    import aiohttp
+
+    def hook(fn):
+        async def on_event(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                fn(ctx, ctx.trace_request_ctx, params)
+        return on_event
+
+    def mark(name):
+        return hook(lambda ctx, r, params: setattr(ctx, name, time.perf_counter()))
+
+    def dns_end(ctx, r, params):
+        r.dns += _since(getattr(ctx, "dns_start", time.perf_counter()))
+
+    def connect_end(ctx, r, params):
+        r.connect += _since(getattr(ctx, "connect_start", time.perf_counter())) - r.dns
+
+    def queued_end(ctx, r, params):
+        r.queued += _since(getattr(ctx, "queued_start", time.perf_counter()))
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(hook(lambda ctx, r, params: r.sent()))
+    config.on_connection_queued_start.append(mark("queued_start"))
+    config.on_connection_queued_end.append(hook(queued_end))
+    config.on_connection_create_start.append(mark("connect_start"))
+    config.on_connection_create_end.append(hook(connect_end))
+    config.on_dns_resolvehost_start.append(mark("dns_start"))
+    config.on_dns_resolvehost_end.append(hook(dns_end))
+    config.on_connection_reuseconn.append(hook(lambda ctx, r, params: setattr(r, "reused", True)))
+    config.on_request_end.append(hook(lambda ctx, r, params: r.headers(params.response.status)))
+    # Fired for bodies read whole; streamed bodies are counted by StreamedResponse.
+    config.on_response_chunk_received.append(hook(lambda ctx, r, params: r.received(len(params.chunk))))
+    config.on_request_exception.append(hook(lambda ctx, r, params: r.failed(params.exception)))
+    return config
+
+
+# ---------------------------------------------------------------------------
+# Aggregation and output
+# ---------------------------------------------------------------------------
+
+def _status_class(request: Request) -> str:
+    if request.cached:
+        return "cached"
+    if request.status is None:
+        return "error"
+    return f"{request.status // 100}xx"
+
+
+class Metrics:
+    """Collects finished traces: JSON lines, counters, histograms and per-host totals.
+
+    jsonl is a path to append one JSON line per URL to ("-" for stderr).
+    profile_slow (seconds) turns on profiling; see the module docstring.
+    """
+
+    def __init__(self, jsonl: str | None = None, profile_slow: float | None = None,
+                 profile_dir: Path = PROFILE_DIR):
+        self.profile_slow = profile_slow
+        self.profile_dir = Path(profile_dir)
+        self._lock = threading.Lock()
+        self._out = None
+        if jsonl == "-":
+            self._out = sys.stderr
+        elif jsonl:
+            self._out = open(jsonl, "a", encoding="utf-8", buffering=1)
+        self._counters: dict[tuple, float] = {}
+        self._histograms: dict[tuple, list] = {}   # key -> [count per bucket..., sum, count]
+        self._hosts: dict[str, list] = {}           # host -> [urls, seconds, bytes]
+        self._strategies: dict[str, list] = {}      # strategy -> [attempts, seconds, failures]
+
+    def close(self) -> None:
+        if self._out is not None and self._out is not sys.stderr:
+            self._out.close()
+        self._out = None
+
+    def _count(self, name: str, labels: dict, value: float = 1) -> None:
+        key = (name, tuple(labels.items()))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name: str, labels: dict, value: float) -> None:
+        key = (name, tuple(labels.items()))
+        hist = self._histograms.get(key)
+        if hist is None:
+            hist = self._histograms[key] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                hist[i] += 1
+        hist[-2] += value
+        hist[-1] += 1
+
+    def record(self, trace: Trace) -> None:
+        if (trace.stats is not None and self.profile_slow is not None
+                and trace.elapsed >= self.profile_slow):
+            digest = hashlib.sha1(trace.url.encode("utf-8")).hexdigest()[:10]
+            path = self.profile_dir / f"{trace.host.replace(':', '_')}-{digest}.prof"
+            try:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                trace.stats.dump_stats(path)
+                trace.profile_path = path
+            except OSError as e:
+                print(f"[metrics] could not save profile {path}: {e}", file=sys.stderr)
+        data = trace.as_dict()
+        strategy = trace.strategy or "none"
+        with self._lock:
+            if self._out is not None:
+                self._out.write(json.dumps(data) + "\n")
+            self._count("scrape_urls_total", {"strategy": strategy, "outcome": trace.outcome})
+            self._observe("scrape_url_seconds", {"strategy": strategy}, trace.elapsed)
+            for phase, seconds in trace.work.items():
+                self._observe("scrape_work_seconds", {"phase": phase, "strategy": strategy}, seconds)
+            for a in trace.attempts:
+                self._count("scrape_attempts_total", {"strategy": a.strategy, "outcome": a.outcome})
+                self._observe("scrape_attempt_seconds", {"strategy": a.strategy}, a.elapsed)
+                for phase, seconds in a.work.items():
+                    self._observe("scrape_work_seconds", {"phase": phase, "strategy": a.strategy}, seconds)
+                totals = self._strategies.setdefault(a.strategy, [0, 0.0, 0])
+                totals[0] += 1
+                totals[1] += a.elapsed
+                totals[2] += a.outcome == "failed"
+            for r in trace.all_requests():
+                self._count("scrape_requests_total", {"kind": r.kind, "result": _status_class(r)})
+                if not r.cached:
+                    self._count("scrape_response_bytes_total", {"kind": r.kind}, r.bytes)
+                    for phase in REQUEST_PHASES:
+                        self._observe("scrape_request_seconds", {"kind": r.kind, "phase": phase},
+                                      getattr(r, phase))
+            host = self._hosts.setdefault(trace.host, [0, 0.0, 0])
+            host[0] += 1
+            host[1] += trace.elapsed
+            host[2] += data["bytes"]
+
+    def prometheus(self) -> str:
+        """Everything recorded so far in the Prometheus text exposition format."""
+        def fmt(labels) -> str:
+            return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                if kind == "counter":
+                    for (n, labels), value in sorted(self._counters.items()):
+                        if n == name:
+                            lines.append(f"{name}{fmt(labels)} {value:g}")
+                    continue
+                for (n, labels), hist in sorted(self._histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, count in zip(BUCKETS, hist):
+                        lines.append(f"{name}_bucket{fmt(labels + (('le', f'{bound:g}'),))} {count}")
+                    lines.append(f"{name}_bucket{fmt(labels + (('le', '+Inf'),))} {hist[-1]}")
+                    lines.append(f"{name}_sum{fmt(labels)} {hist[-2]:.6f}")
+                    lines.append(f"{name}_count{fmt(labels)} {hist[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path) -> None:
+        """Write prometheus() to path atomically (for a node-exporter textfile collector)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.prometheus(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def summary(self, top: int = TOP) -> list[str]:
+        """The hosts and strategies that took the most time, one line each."""
+        with self._lock:
+            hosts = sorted(self._hosts.items(), key=lambda item: -item[1][1])[:top]
+            strategies = sorted(self._strategies.items(), key=lambda item: -item[1][1])[:top]
+        lines = [f"[metrics] host {host}: {n} URLs, {s:.2f}s, {b / 1024:.0f} KiB" for host, (n, s, b) in hosts]
+        lines += [f"[metrics] strategy {name}: {n} attempts, {s:.2f}s, {failed} failed"
+                  for name, (n, s, failed) in strategies]
+        return lines
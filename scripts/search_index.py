@@ -0,0 +1,210 @@
+"""
+Inverted index and facet tables for the job listing, published as static files
+under data/jobs/ by job_artifacts.publish():
+
+  search.<hash>.json                 term-prefix -> shard file name, plus the
+                                     stopword list queries are filtered with
+  search/terms-<prefix>.<hash>.json  {"terms": {term: [doc gaps]}} for every
+                                     term starting with that two-character prefix
+  facets.<hash>.json                 {"counts": {facet: {value: n}},
+                                      "docs": {facet: {value: [doc gaps]}}}
+
+Terms come from the title, organization, location, description and
+requirements of each job. Postings are lists of stable document numbers (the
+"doc" field of every summary row), stored as gaps so that long lists stay short.
+A query term loads exactly one shard and matches every term it is a prefix of,
+so search-as-you-type never scans descriptions.
+
+update() is incremental: changes are worked out against the published summary
+(the committed files, never a local cache), the terms a changed job used to
+have are read back from its previous detail file, and only the shards holding terms that were
+added or removed are rewritten. Facet tables are rebuilt from the summary rows,
+which already carry the normalized values (see job_facets.py).
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from job_artifacts import compact_json, content_name, write_once
+
+SEARCH_DIR = "search"
+PREFIX_LEN = 2
+MAX_TERM_LEN = 32
+TEXT_FIELDS = ("title", "organization_name", "location", "description", "requirements")
+FACET_FIELDS = {
+    "job_type": "job_type",
+    "workplace": "workplace",
+    "country": "country",
+    "organization": "organization_name",
+}
+
+STOPWORDS = frozenset("""
+    an and are as at be but by can do for from has have if in into is it its of on or our so that the their
+    them there these they this to was we were will with you your who what when where which while not all any
+    us also more most other some such than then very just about over under out up own same both each few
+""".split())
+
+_TERM = re.compile(r"[^\W_]+")
+_COMBINING = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+_SAFE_PREFIX = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase with diacritics removed; mirrors the query folding in jobs.html."""
+    text = text or ""
+    if text.isascii():
+        return text.lower()
+    return _COMBINING.sub("", unicodedata.normalize("NFKD", text)).lower()
+
+
+def terms(text: str) -> set[str]:
+    return {
+        t for t in set(_TERM.findall(fold(text)))
+        if 2 <= len(t) <= MAX_TERM_LEN and t not in STOPWORDS and not (t.isdigit() and len(t) > 4)
+    }
+
+
+def record_terms(record: dict) -> set[str]:
+    return terms("\n".join(str(record.get(field) or "") for field in TEXT_FIELDS))
+
+
+def _gaps(docs) -> list[int]:
+    out, last = [], 0
+    for d in sorted(docs):
+        out.append(d - last)
+        last = d
+    return out
+
+
+def _ungap(gaps) -> set[int]:
+    docs, total = set(), 0
+    for g in gaps:
+        total += g
+        docs.add(total)
+    return docs
+
+
+def _shard_file(prefix: str, data: bytes) -> str:
+    safe = prefix if _SAFE_PREFIX.fullmatch(prefix) else "u" + prefix.encode("utf-8").hex()
+    return f"{SEARCH_DIR}/{content_name(f'terms-{safe}', data)}"
+
+
+def _load_json(path: Path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Inverted index
+# ---------------------------------------------------------------------------
+
+def _full_postings(out_dir: Path, rows: list[dict]) -> dict[str, dict[str, list]]:
+    """prefix -> term -> docs, from every current detail file."""
+    postings: dict[str, list] = {}
+    for row in rows:
+        doc = row["doc"]
+        for term in record_terms(_load_json(out_dir / row["detail"]) or {}):
+            docs = postings.get(term)
+            if docs is None:
+                postings[term] = [doc]
+            else:
+                docs.append(doc)
+    shards: dict[str, dict[str, list]] = {}
+    for term, docs in postings.items():
+        shards.setdefault(term[:PREFIX_LEN], {})[term] = docs
+    return shards
+
+
+def _changed_postings(out_dir: Path, shard_files: dict, changes) -> dict[str, dict[str, set]] | None:
+    """Load and patch only the shards the changes touch; None if a full rebuild is needed."""
+    delta: dict[str, tuple[set, set]] = {}  # term -> (docs to remove, docs to add)
+    for old, new in changes:
+        if old and new and old.get("detail") == new.get("detail") and old.get("doc") == new.get("doc"):
+            continue
+        old_terms = set()
+        if old and old.get("doc") is not None:
+            record = _load_json(out_dir / old["detail"])
+            if record is None:
+                return None  # previous detail file is gone; its terms are unknown
+            old_terms = record_terms(record)
+        new_terms = record_terms(_load_json(out_dir / new["detail"]) or {}) if new else set()
+        same_doc = old and new and old.get("doc") == new.get("doc")
+        for term in (old_terms - new_terms) if same_doc else old_terms:
+            delta.setdefault(term, (set(), set()))[0].add(old["doc"])
+        for term in (new_terms - old_terms) if same_doc else new_terms:
+            delta.setdefault(term, (set(), set()))[1].add(new["doc"])
+
+    shards: dict[str, dict[str, set]] = {}
+    for term, (removed, added) in delta.items():
+        prefix = term[:PREFIX_LEN]
+        if prefix not in shards:
+            shards[prefix] = {}
+            if prefix in shard_files:
+                data = _load_json(out_dir / shard_files[prefix])
+                if data is None:
+                    return None
+                shards[prefix] = {t: _ungap(g) for t, g in data["terms"].items()}
+        docs = shards[prefix].setdefault(term, set())
+        docs -= removed
+        docs |= added
+    return shards
+
+
+def update(out_dir: Path, rows: list[dict], changes, previous: str | None) -> tuple[str, set[str]]:
+    """Bring the published index up to date; returns (search manifest name, files it uses).
+
+    changes are (published row, new row) pairs against the summary the
+    previous index was built with; None rebuilds the index from every row.
+    """
+    manifest = _load_json(out_dir / previous) if previous else None
+    shard_files = dict(manifest["shards"]) if manifest else {}
+    shards = _changed_postings(out_dir, shard_files, changes) if manifest and changes is not None else None
+    if shards is None:
+        shards, shard_files = _full_postings(out_dir, rows), {}
+
+    for prefix, postings in shards.items():
+        postings = {t: _gaps(d) for t, d in sorted(postings.items()) if d}
+        if not postings:
+            shard_files.pop(prefix, None)
+            continue
+        data = compact_json({"terms": postings})
+        shard_files[prefix] = _shard_file(prefix, data)
+        write_once(out_dir / shard_files[prefix], data)
+
+    data = compact_json({
+        "prefix_len": PREFIX_LEN,
+        "stopwords": sorted(STOPWORDS),
+        "shards": dict(sorted(shard_files.items())),
+    })
+    name = content_name("search", data)
+    write_once(out_dir / name, data)
+    return name, {name, *shard_files.values()}
+
+
+# ---------------------------------------------------------------------------
+# Facets
+# ---------------------------------------------------------------------------
+
+def facet_tables(rows: list[dict]) -> dict:
+    docs: dict[str, dict[str, list]] = {facet: {} for facet in FACET_FIELDS}
+    for row in rows:
+        for facet, field in FACET_FIELDS.items():
+            value = row.get(field)
+            if value:
+                docs[facet].setdefault(value, []).append(row["doc"])
+    return {
+        "counts": {f: dict(sorted(((v, len(d)) for v, d in values.items()), key=lambda x: (-x[1], x[0])))
+                   for f, values in docs.items()},
+        "docs": {f: {v: _gaps(d) for v, d in sorted(values.items())} for f, values in docs.items()},
+    }
+
+
+def publish_facets(out_dir: Path, rows: list[dict]) -> str:
+    data = compact_json(facet_tables(rows))
+    name = content_name("facets", data)
+    write_once(out_dir / name, data)
+    return name
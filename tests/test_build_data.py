@@ -0,0 +1,95 @@
+"""Incremental rebuilds in build_data (run with python -m pytest tests)."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import build_data  # noqa: E402
+
+SEEKER = """---
+name: "{name}"
+headline: "{headline}"
+skills: "Python"
+created_at: "2026-01-02T03:04:05Z"
+---
+
+About {name}.
+"""
+
+
+class BuildCollectionTest(unittest.TestCase):
+    """Seekers have no published artifacts, so only seekers.json is involved."""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.src = self.dir / "seekers"
+        self.src.mkdir()
+        self.out = self.dir / "seekers.json"
+        collection = (self.src, self.out, "seekers", build_data.md_to_seeker)
+        patcher = mock.patch.dict(build_data.COLLECTIONS, {"seekers": collection})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manifest = {}
+        for name in ("ada", "bob", "cy"):
+            self._write(name, "Engineer")
+
+    def _write(self, name: str, headline: str) -> None:
+        (self.src / f"{name}.md").write_text(SEEKER.format(name=name, headline=headline), encoding="utf-8")
+
+    def _build(self, full: bool = False) -> dict:
+        return build_data.build_collection("seekers", self.manifest, full)
+
+    def _records(self, path: Path | None = None) -> list[dict]:
+        return json.loads((path or self.out).read_text(encoding="utf-8"))["seekers"]
+
+    def _full_records(self) -> list[dict]:
+        """What a build without the manifest produces from the same sources."""
+        before = self.out.read_bytes()
+        try:
+            build_data.build_collection("seekers", {}, full=True)
+            return self._records()
+        finally:
+            self.out.write_bytes(before)
+
+    def test_rebuilds(self):
+        steps = [
+            # description, change to the sources, expected parsed, reused, written
+            ("first build", lambda: None, 3, 0, True),
+            ("nothing changed", lambda: None, 0, 3, False),
+            ("mtimes touched", lambda: [os.utime(p, ns=(1, 1)) for p in self.src.glob("*.md")], 0, 3, False),
+            ("one file edited", lambda: self._write("bob", "Manager"), 1, 2, True),
+            ("one file added", lambda: self._write("dee", "Analyst"), 1, 3, True),
+            ("one file removed", lambda: (self.src / "ada.md").unlink(), 0, 3, True),
+        ]
+        for description, change, parsed, reused, written in steps:
+            with self.subTest(step=description):
+                change()
+                stats = self._build()
+                self.assertEqual(stats, {"parsed": parsed, "reused": reused, "written": written})
+                self.assertEqual(self._records(), self._full_records())
+
+        self.assertEqual([r["name"] for r in self._records()], ["bob", "cy", "dee"])
+        self.assertEqual(self._records()[0]["headline"], "Manager")
+
+    def test_output_rewritten_elsewhere_is_not_reused(self):
+        self._build()
+        self.out.write_text(self.out.read_text(encoding="utf-8").replace("Engineer", "Engineer "), encoding="utf-8")
+        self.assertEqual(self._build(), {"parsed": 3, "reused": 0, "written": True})
+        self.assertEqual(self._records(), self._full_records())
+
+    def test_stale_record_version_reparses(self):
+        self._build()
+        self.manifest["seekers"]["record_version"] = build_data.RECORD_VERSION - 1
+        self.assertEqual(self._build()["parsed"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
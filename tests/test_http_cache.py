@@ -0,0 +1,78 @@
+"""Keys and expiry of http_cache.HttpCache (run with python -m pytest tests)."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import requests  # noqa: E402
+
+import http_cache  # noqa: E402
+from http_cache import HttpCache  # noqa: E402
+
+
+def _response(body: bytes = b"<html></html>") -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    return resp
+
+
+class CanonicalUrlTest(unittest.TestCase):
+    def test_click_trackers_are_dropped(self):
+        self.assertEqual(
+            http_cache.canonical_url("HTTPS://Boards.Greenhouse.io/acme/jobs/1?gh_src=x&utm_source=li#apply"),
+            "https://boards.greenhouse.io/acme/jobs/1",
+        )
+        self.assertEqual(
+            http_cache.canonical_url("https://www.linkedin.com/jobs/view/9?trk=feed&refId=abc&b=2&a=1"),
+            "https://www.linkedin.com/jobs/view/9?a=1&b=2",
+        )
+
+    def test_generic_parameters_keep_separate_entries(self):
+        cache = HttpCache(tempfile.mkdtemp())
+        for param in ("source", "src", "ref", "referrer"):
+            with self.subTest(param=param):
+                self.assertNotEqual(cache.key(f"https://careers.example/jobs?{param}=eng"),
+                                    cache.key(f"https://careers.example/jobs?{param}=sales"))
+
+
+class ExpiryTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+
+    def _age(self, cache: HttpCache, url: str, seconds: float) -> None:
+        meta_path = cache._paths(cache.key(url))[0]
+        meta = json.loads(meta_path.read_text())
+        meta["stored_at"] -= seconds
+        meta_path.write_text(json.dumps(meta))
+
+    def test_sweep_drops_entries_past_their_max_age(self):
+        cache = HttpCache(self.dir, default_ttl=3600)
+        cache.put("https://example.com/old", _response(), b"old")
+        cache.put("https://example.com/stale", _response(), b"stale")
+        self._age(cache, "https://example.com/old", http_cache.MIN_MAX_AGE + 1)
+        self._age(cache, "https://example.com/stale", 2 * 3600)  # past its ttl, within the max age
+
+        cache._next_sweep = 0.0
+        cache.put("https://example.com/new", _response(), b"new")
+
+        self.assertEqual(cache._load(cache.key("https://example.com/old")), (None, None))
+        self.assertEqual(cache._load(cache.key("https://example.com/stale"))[1], b"stale")
+        self.assertEqual(cache._load(cache.key("https://example.com/new"))[1], b"new")
+
+    def test_offline_mode_keeps_everything(self):
+        cache = HttpCache(self.dir)
+        cache.put("https://example.com/old", _response(), b"old")
+        self._age(cache, "https://example.com/old", 10 * http_cache.MIN_MAX_AGE)
+
+        offline = HttpCache(self.dir, mode="offline")
+        offline._evict()
+        self.assertEqual(offline.get("https://example.com/old", None).content, b"old")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Facet normalisation in job_facets (run with python -m pytest tests)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import job_facets  # noqa: E402
+
+
+class LocationTest(unittest.TestCase):
+    CASES = [
+        # raw, location(), country()
+        ("San Francisco, CA", "San Francisco, CA", "United States"),
+        ("Chicago, IL", "Chicago, IL", "United States"),
+        ("Indianapolis, IN", "Indianapolis, IN", "United States"),
+        ("Wilmington, DE", "Wilmington, DE", "United States"),
+        ("Hybrid - Austin, TX", "Hybrid (Austin, TX)", "United States"),
+        ("Remote (US)", "Remote (United States)", "United States"),
+        ("London, UK", "London, United Kingdom", "United Kingdom"),
+        ("Pune, Maharashtra, India", "Pune, Maharashtra, India", "India"),
+        ("Toronto, Ontario, Canada", "Toronto, Ontario, Canada", "Canada"),
+        ("Tel Aviv, Israel", "Tel Aviv, Israel", "Israel"),
+        ("Munich,  germany", "Munich, Germany", "Germany"),
+        ("Berlin, Berlin", "Berlin", ""),
+        ("Remote", "Remote", ""),
+        ("", "", ""),
+    ]
+
+    def test_location_and_country(self):
+        for raw, shown, country in self.CASES:
+            with self.subTest(raw=raw):
+                self.assertEqual(job_facets.location(raw), shown)
+                self.assertEqual(job_facets.country(raw), country)
+
+    def test_state_code_is_never_spelled_out_as_a_country(self):
+        for code in ("CA", "IL", "IN", "DE"):
+            with self.subTest(code=code):
+                self.assertTrue(job_facets.location(f"Springfield, {code}").endswith(f", {code}"))
+
+
+class JobTypeTest(unittest.TestCase):
+    CASES = [
+        ("Full-time", "full-time"),
+        ("FULL_TIME", "full-time"),
+        (["PART_TIME", "CONTRACTOR"], "part-time"),
+        ("Contract to hire", "contract"),
+        ("Summer Intern", "internship"),
+        ("", "full-time"),
+        ("whatever", "full-time"),
+    ]
+
+    def test_job_type(self):
+        for raw, expected in self.CASES:
+            with self.subTest(raw=raw):
+                self.assertEqual(job_facets.job_type(raw), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""URL keys and text fingerprints in job_index (run with python -m pytest tests)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import job_index  # noqa: E402
+
+LEVER_ID = "0b4c7e2a-1f3d-4c5e-9a8b-7d6c5b4a3f21"
+
+
+class PostingKeyTest(unittest.TestCase):
+    CASES = [
+        ("https://boards.greenhouse.io/acme/jobs/4012345?gh_src=li&utm_source=x", "greenhouse:4012345"),
+        ("https://job-boards.greenhouse.io/acme/jobs/4012345", "greenhouse:4012345"),
+        ("https://boards.greenhouse.io/embed/job_app?for=acme&token=4012345", "greenhouse:4012345"),
+        ("https://www.acme.com/careers/?gh_jid=4012345", "greenhouse:4012345"),
+        (f"https://jobs.lever.co/acme/{LEVER_ID.upper()}/apply?lever-source=LinkedIn", f"lever:{LEVER_ID}"),
+        ("https://www.linkedin.com/jobs/view/3912345678/?trk=feed&refId=abc", "linkedin:3912345678"),
+        ("https://linkedin.com/jobs/view/senior-engineer-at-acme-3912345678", "linkedin:3912345678"),
+        ("https://www.linkedin.com/comm/jobs/view/3912345678", "linkedin:3912345678"),
+        ("https://www.linkedin.com/jobs/search/?currentJobId=3912345678&keywords=x", "linkedin:3912345678"),
+        ("https://www.indeed.com/viewjob?jk=abc123&from=serp", "indeed:abc123"),
+        ("https://apply.workable.com/acme/j/A1B2C3D4E5/", "workable:A1B2C3D4E5"),
+        ("HTTP://WWW.Careers.Example/jobs/42/?utm_campaign=x", "https://careers.example/jobs/42"),
+        ("https://careers.example/jobs?team=eng&id=7", "https://careers.example/jobs?id=7&team=eng"),
+    ]
+
+    def test_posting_key(self):
+        for url, expected in self.CASES:
+            with self.subTest(url=url):
+                self.assertEqual(job_index.posting_key(url), expected)
+
+
+class SimhashTest(unittest.TestCase):
+    TEXT = (
+        "We are looking for a senior application security engineer to join our product security team. "
+        "You will partner with engineering groups to review designs, run threat modeling sessions and "
+        "build tooling that finds vulnerabilities before they reach production. Day to day you will triage "
+        "reports from our bug bounty program, write secure coding guidance, tune static analysis rules in "
+        "continuous integration and help teams fix findings quickly. We value clear writing, curiosity and "
+        "a pragmatic approach to risk. Experience with Python or Go, cloud infrastructure on AWS and common "
+        "web vulnerability classes is expected. This is a remote role with occasional travel to our offices."
+    )
+
+    def test_short_text_is_not_fingerprinted(self):
+        for text in ("", "See full listing at: https://example.com/jobs/1", "word " * 39):
+            with self.subTest(text=text[:20]):
+                self.assertIsNone(job_index.simhash(text))
+
+    def test_near_duplicates_are_close(self):
+        fp = job_index.simhash(self.TEXT)
+        self.assertIsNotNone(fp)
+        self.assertEqual(job_index.simhash(self.TEXT.upper()), fp)
+        variants = {
+            "markdown": "- " + self.TEXT.replace(". ", ".\n- "),
+            "punctuation": self.TEXT.replace(",", "").replace(".", " ;"),
+            "trailer": self.TEXT + " Apply now.",
+        }
+        for name, text in variants.items():
+            with self.subTest(variant=name):
+                distance = bin(fp ^ job_index.simhash(text)).count("1")
+                self.assertLessEqual(distance, job_index.NEAR_DUPLICATE_DISTANCE)
+
+    def test_different_texts_are_far(self):
+        other = " ".join(reversed(self.TEXT.split()))
+        distance = bin(job_index.simhash(self.TEXT) ^ job_index.simhash(other)).count("1")
+        self.assertGreater(distance, job_index.NEAR_DUPLICATE_DISTANCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
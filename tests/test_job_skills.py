@@ -0,0 +1,58 @@
+"""Skill extraction in job_skills (run with python -m pytest tests)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import job_skills  # noqa: E402
+
+
+def _names(text: str) -> list[str]:
+    return [name for _, name in job_skills.get_matcher().extract(text)]
+
+
+class ExtractTest(unittest.TestCase):
+    CASES = [
+        # text, expected skills (in order), skills that must not appear
+        ("Proficiency in NetSuite, Oracle Cloud, BlackLine and Excel. CPA preferred.",
+         ["Excel", "CPA"], ["Oracle Cloud"]),
+        ("We are building a faster, privacy-centric public DNS resolver.", [], ["DNS"]),
+        ("Run our AWS and Oracle Cloud tenants with Terraform.",
+         ["AWS", "Oracle Cloud", "Terraform"], []),
+        ("Troubleshoot DNS, DHCP and TCP/IP issues on the VPN.", ["DNS"], []),
+        ("Knows the OWASP Top 10. OWASP project contributor.", ["OWASP Top 10"], ["OWASP"]),
+        ("Contributor to OWASP and to OWASP ZAP.", ["OWASP ZAP"], ["OWASP"]),
+        ("Spring Boot services; we also use Spring.", ["Spring Boot"], ["Spring"]),
+        ("OWASP chapter lead.", ["OWASP"], []),
+    ]
+
+    def test_extract(self):
+        for text, expected, absent in self.CASES:
+            with self.subTest(text=text):
+                names = _names(text)
+                for name in expected:
+                    self.assertIn(name, names)
+                for name in absent:
+                    self.assertNotIn(name, names)
+
+    def test_most_mentioned_first(self):
+        self.assertEqual(_names("Python, Go. More Go. Go everywhere.")[:2], ["Go", "Python"])
+
+
+class AnnotateTest(unittest.TestCase):
+    def test_organization_is_not_a_skill(self):
+        fm = {"title": "Accountant", "organization_name": "Cloudflare"}
+        job_skills.annotate(fm, "At Cloudflare we close the books in NetSuite, Oracle Cloud and Excel.")
+        self.assertEqual(fm["skills"], "Excel")
+        self.assertEqual(fm["requirements"], "Data & AI: Excel")
+
+    def test_existing_requirements_are_kept(self):
+        fm = {"title": "Engineer", "requirements": "5 years of Rust"}
+        job_skills.annotate(fm, "Python and AWS")
+        self.assertEqual(fm["requirements"], "5 years of Rust")
+
+
+if __name__ == "__main__":
+    unittest.main()
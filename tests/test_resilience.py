@@ -0,0 +1,84 @@
+"""Circuit breaker and hedging behaviour of resilience.Guard (run with python -m pytest tests)."""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from resilience import CircuitBreaker, CircuitOpen, Guard  # noqa: E402
+
+
+class _Response:
+    status_code = 200
+
+    def close(self):
+        pass
+
+
+def _open_guard() -> tuple[Guard, tuple]:
+    """A guard whose breaker for example.com/page is open and past its cooldown."""
+    guard = Guard(rates={}, breaker=CircuitBreaker(threshold=1, cooldown=0.0), retries=0)
+    key = ("example.com", "page")
+    guard.breaker.failure(key)
+    time.sleep(0.001)
+    return guard, key
+
+
+class HalfOpenTrialTest(unittest.TestCase):
+    def test_cancelled_trial_frees_the_slot(self):
+        guard, key = _open_guard()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        async def run():
+            trial = asyncio.create_task(guard.call_async(*key, hang))
+            await started.wait()
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+
+            async def ok():
+                return _Response()
+
+            return await guard.call_async(*key, ok)
+
+        self.assertEqual(asyncio.run(run()).status_code, 200)
+        self.assertTrue(guard.breaker.allow(key))
+
+    def test_unexpected_error_in_trial_reopens(self):
+        guard, key = _open_guard()
+        guard.breaker.cooldown = 60.0
+        guard.breaker._state[key][1] -= 61.0  # cooldown over
+
+        def boom():
+            raise ValueError("not transient")
+
+        with self.assertRaises(ValueError):
+            guard.call(*key, boom)
+        with self.assertRaises(CircuitOpen):
+            guard.call(*key, _Response)
+
+
+class CanSpareTest(unittest.TestCase):
+    def test_needs_saved_up_tokens(self):
+        guard = Guard(rates={"r.jina.ai": (1 / 60, 4)})
+        self.assertTrue(guard.can_spare("r.jina.ai", "render"))
+        for _ in range(3):
+            guard.bucket("r.jina.ai").reserve()
+        self.assertFalse(guard.can_spare("r.jina.ai", "render"))
+
+    def test_not_while_half_open(self):
+        guard, key = _open_guard()
+        self.assertFalse(guard.can_spare(*key))
+        guard.breaker.success(key)
+        self.assertTrue(guard.can_spare(*key))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Term folding and shard encoding in search_index (run with python -m pytest tests)."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import search_index  # noqa: E402
+from job_artifacts import compact_json  # noqa: E402
+
+
+class TermsTest(unittest.TestCase):
+    CASES = [
+        ("Senior Security Engineer", {"senior", "security", "engineer"}),
+        ("Café in São Paulo", {"cafe", "sao", "paulo"}),
+        ("C++ and the OWASP Top 10", {"owasp", "top", "10"}),
+        ("Zip 94107, year 2026", {"zip", "year", "2026"}),
+        ("a I x", set()),
+    ]
+
+    def test_terms(self):
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(search_index.terms(text), expected)
+
+
+class GapsTest(unittest.TestCase):
+    CASES = [
+        ([], []),
+        ([5], [5]),
+        ([0, 3, 4, 10], [0, 3, 1, 6]),
+        ([10, 4, 0, 3], [0, 3, 1, 6]),
+    ]
+
+    def test_round_trip(self):
+        for docs, gaps in self.CASES:
+            with self.subTest(docs=docs):
+                self.assertEqual(search_index._gaps(docs), gaps)
+                self.assertEqual(search_index._ungap(gaps), set(docs))
+
+    def test_shard_file_names(self):
+        for prefix, stem in (("se", "terms-se"), ("10", "terms-10"), ("日本", "terms-u" + "日本".encode().hex())):
+            with self.subTest(prefix=prefix):
+                name = search_index._shard_file(prefix, b"{}")
+                self.assertTrue(name.startswith(f"{search_index.SEARCH_DIR}/{stem}."), name)
+
+
+class UpdateTest(unittest.TestCase):
+    JOBS = {
+        0: {"title": "Security Engineer", "organization_name": "Acme", "description": "Threat modeling"},
+        1: {"title": "Accountant", "organization_name": "Acme", "description": "Month-end close"},
+        2: {"title": "Sécurité réseau", "organization_name": "Globex", "location": "Paris"},
+    }
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _rows(self, out_dir: Path, jobs: dict) -> list[dict]:
+        rows = []
+        for doc, record in jobs.items():
+            detail = f"detail/job-{doc}-{len(json.dumps(record))}.json"
+            (out_dir / detail).parent.mkdir(parents=True, exist_ok=True)
+            (out_dir / detail).write_bytes(compact_json(record))
+            rows.append({"doc": doc, "detail": detail})
+        return rows
+
+    def _decode(self, out_dir: Path, name: str) -> dict[str, set[int]]:
+        manifest = json.loads((out_dir / name).read_text())
+        index = {}
+        for prefix, shard in manifest["shards"].items():
+            for term, gaps in json.loads((out_dir / shard).read_text())["terms"].items():
+                self.assertEqual(term[:search_index.PREFIX_LEN], prefix)
+                index[term] = search_index._ungap(gaps)
+        return index
+
+    def _expected(self, jobs: dict) -> dict[str, set[int]]:
+        index = {}
+        for doc, record in jobs.items():
+            for term in search_index.record_terms(record):
+                index.setdefault(term, set()).add(doc)
+        return index
+
+    def test_full_build_decodes_to_every_term(self):
+        name, _ = search_index.update(self.dir, self._rows(self.dir, self.JOBS), None, None)
+        self.assertEqual(self._decode(self.dir, name), self._expected(self.JOBS))
+
+    def test_incremental_update_matches_a_full_build(self):
+        old_rows = self._rows(self.dir, self.JOBS)
+        previous, _ = search_index.update(self.dir, old_rows, None, None)
+
+        jobs = dict(self.JOBS)
+        jobs[1] = {"title": "Senior Accountant", "organization_name": "Acme", "description": "Audit"}
+        del jobs[2]
+        jobs[3] = {"title": "Platform Engineer", "organization_name": "Initech"}
+        rows = self._rows(self.dir, jobs)
+        by_doc = {r["doc"]: r for r in old_rows}
+        changes = [(by_doc[1], rows[1]), (by_doc[2], None), (None, rows[2])]
+        name, used = search_index.update(self.dir, rows, changes, previous)
+
+        self.assertEqual(self._decode(self.dir, name), self._expected(jobs))
+        full_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, full_dir)
+        full_name, full_used = search_index.update(full_dir, self._rows(full_dir, jobs), None, None)
+        self.assertEqual(name, full_name)
+        self.assertEqual(used, full_used)
+
+
+if __name__ == "__main__":
+    unittest.main()